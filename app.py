@@ -54,6 +54,7 @@ from routes.medicationAPI import (
     MedicationsAPI,
 )
 from routes.MedicineAPI import MedicineAPI
+from routes.metricsAPI import PoolMetricsAPI, SlowQueriesAPI, SQLMetricsAPI
 from routes.parentsAPI import parentsAPI
 from routes.paymentAPI import PaymentAPI
 from routes.PrescriptionAPI import (
@@ -75,6 +76,7 @@ from routes.previouspregnancyAPI import (
 from routes.providersAPI import providersAPI
 from routes.recordsAPI import (
     RecordsApi,
+    RecordsBulkAPI,
     VaccinationRecordsForParent,
     VaccinationRecordsForProvider,
 )
@@ -83,7 +85,14 @@ from routes.RoomAPI import AvailableRooms, RoomAPI
 from routes.usersAPI import UserAPI
 from routes.MesseagesAPI import MessageAPI
 from routes.vaccinesAPI import vaccinesAPI
+from utils.catalog_import import catalog_cli
 from utils.customs import update_appointment_statuses
+from utils.filters import compile_specs
+from utils.outbox import outbox_cli
+from utils.reminders import reminders_cli
+from utils.serializers import compile_all
+from utils.settings import setting
+import utils.versions  # noqa: F401  (tracks writes for conditional GETs)
 
 api.add_resource(Home, "/")
 api.add_resource(UserAPI, "/users", "/users/<int:id>")
@@ -101,6 +110,7 @@ api.add_resource(BirthForParent, "/births/parent/<int:id>")
 api.add_resource(BirthForProvider, "/births/provider/<int:id>")
 
 api.add_resource(RecordsApi, "/records", "/records/<int:id>")
+api.add_resource(RecordsBulkAPI, "/records/bulk")
 api.add_resource(VaccinationRecordsForProvider, "/records/provider/<int:id>")
 api.add_resource(VaccinationRecordsForParent, "/records/parent/<int:id>")
 
@@ -176,15 +186,31 @@ api.add_resource(MessageAPI, "/messages", "/messages/<int:id>")
 
 api.add_resource(Login, "/login")
 api.add_resource(Logout, "/logout")
+
+api.add_resource(PoolMetricsAPI, "/metrics/pool")
+api.add_resource(SQLMetricsAPI, "/metrics/sql")
+api.add_resource(SlowQueriesAPI, "/metrics/slow-queries")
+
+compile_all()
+compile_specs()
+
+app.cli.add_command(catalog_cli)
+app.cli.add_command(outbox_cli)
+app.cli.add_command(reminders_cli)
+
+# One job under a fixed id: the hourly run already covers 8:00 and 17:00,
+# and a run still going when the next is due is skipped, not doubled.
+# Across processes update_appointment_statuses takes an advisory lock.
+# `flask reminders run` marks appointments missed as they fall due; this
+# sweep is the backstop for when it is not running.
 scheduler.add_job(
     update_appointment_statuses,
     "interval",
-    hours=1,
-)
-scheduler.add_job(
-    update_appointment_statuses,
-    "cron",
-    hour="8,17",
+    minutes=setting("MISSED_SWEEP_INTERVAL_MINUTES"),
+    id="missed_appointment_sweep",
+    replace_existing=True,
+    max_instances=1,
+    coalesce=True,
 )
 
 if __name__ == "__main__":
@@ -0,0 +1,164 @@
+"""Admits patients from many threads at once through POST /admissions and
+checks that no bed is given to two admissions and that room counters
+match the admissions actually created.
+
+Run from the project root:
+
+    python -m benchmarks.admission_concurrency [--threads 16] [--rooms 10]
+
+Every room gets --beds-per-room free beds and the threads ask for more
+admissions than there are beds, half of them for a specific bed, so
+requests race for the last beds. Exits non-zero on any double allocation,
+counter mismatch or server error. Uses the same database setup as
+benchmarks.endpoints (BENCH_DATABASE_URI, dropped and reseeded).
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+os.environ["DATABASE_URI"] = os.environ.get(
+    "BENCH_DATABASE_URI",
+    "sqlite:///" + os.path.join(tempfile.gettempdir(), "happyhearts_bench.db"),
+)
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from flask_jwt_extended import create_access_token  # noqa: E402
+from sqlalchemy import func  # noqa: E402
+
+import app as _routes  # noqa: E402,F401
+from benchmarks.seed import seed  # noqa: E402
+from config import app, db  # noqa: E402
+from models import Admission, Bed, Room  # noqa: E402
+
+
+def create_ward(rooms, beds_per_room):
+    ward = []
+    for r in range(rooms):
+        room = Room(
+            room_number=f"Bench-{r}",
+            capacity=beds_per_room,
+            current_bed_occupancy=beds_per_room,
+            room_type="Ward",
+        )
+        db.session.add(room)
+        db.session.flush()
+        beds = [
+            Bed(bed_number=f"Bench-{r}-{b}", bed_type="Standard", room_id=room.room_id)
+            for b in range(beds_per_room)
+        ]
+        db.session.add_all(beds)
+        db.session.flush()
+        ward.append((room.room_id, [bed.bed_id for bed in beds]))
+    db.session.commit()
+    return ward
+
+
+def worker(headers, ward, attempts, seed_value, statuses, latencies):
+    rng = random.Random(seed_value)
+    client = app.test_client()
+    for _ in range(attempts):
+        room_id, bed_ids = rng.choice(ward)
+        body = {
+            "parent_id": 1,
+            "provider_id": 1,
+            "room_id": room_id,
+            "admission_date": "2024-01-01T10:00",
+            "reason_for_admission": "Observation",
+        }
+        if rng.random() < 0.5:
+            body["bed_id"] = rng.choice(bed_ids)
+        start = time.perf_counter()
+        response = client.post("/admissions", json=body, headers=headers)
+        latencies.append(time.perf_counter() - start)
+        statuses.append(response.status_code)
+
+
+def check(ward):
+    room_ids = [room_id for room_id, _ in ward]
+    admitted = Counter(
+        bed_id
+        for (bed_id,) in db.session.query(Admission.bed_id).filter(
+            Admission.room_id.in_(room_ids)
+        )
+    )
+    double = {bed_id: n for bed_id, n in admitted.items() if n > 1}
+
+    per_room = dict(
+        db.session.query(Admission.room_id, func.count())
+        .filter(Admission.room_id.in_(room_ids))
+        .group_by(Admission.room_id)
+    )
+    occupied = dict(
+        db.session.query(Bed.room_id, func.count())
+        .filter(Bed.room_id.in_(room_ids), Bed.is_occupied.is_(True))
+        .group_by(Bed.room_id)
+    )
+    mismatched = [
+        room.room_id
+        for room in db.session.query(Room).filter(Room.room_id.in_(room_ids))
+        if not (
+            room.current_occupancy
+            == per_room.get(room.room_id, 0)
+            == occupied.get(room.room_id, 0)
+        )
+    ]
+    return sum(admitted.values()), double, mismatched
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--rooms", type=int, default=10)
+    parser.add_argument("--beds-per-room", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    beds = args.rooms * args.beds_per_room
+    attempts = max(1, beds * 3 // 2 // args.threads)
+    with app.app_context():
+        print("Seeding database...", file=sys.stderr)
+        seed(0.05)
+        ward = create_ward(args.rooms, args.beds_per_room)
+        token = create_access_token(
+            identity="benchmark", additional_claims={"role": "admin"}
+        )
+        db.session.remove()
+    headers = {"Authorization": f"Bearer {token}"}
+
+    statuses = []
+    latencies = []
+    threads = [
+        threading.Thread(
+            target=worker, args=(headers, ward, attempts, i, statuses, latencies)
+        )
+        for i in range(args.threads)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    with app.app_context():
+        admitted, double, mismatched = check(ward)
+
+    print(
+        f"{len(statuses)} requests from {args.threads} threads in {elapsed:.2f}s "
+        f"({len(statuses) / elapsed:.1f} req/s), statuses {dict(Counter(statuses))}"
+    )
+    print(
+        f"{admitted} of {beds} beds admitted, {len(double)} beds double-allocated, "
+        f"{len(mismatched)} rooms with counters out of step"
+    )
+    failed = double or mismatched or any(status >= 500 for status in statuses)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
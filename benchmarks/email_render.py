@@ -0,0 +1,123 @@
+"""Measures what it costs to render notification emails, per 10,000
+messages: the f-string each route used to build (reading MAIL_USERNAME from
+the environment every time), a Jinja template compiled for every message,
+and utils.email_templates' render() and render_many().
+
+Run from the project root:
+
+    python -m benchmarks.email_render [--messages 10000] [--repeat 3]
+
+Renders the missed-appointment email with a different date and reason per
+message, and checks that render() and render_many() produce the same
+HTML. Needs no database.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault(
+    "DATABASE_URI",
+    "sqlite:///" + os.path.join(tempfile.gettempdir(), "happyhearts_bench.db"),
+)
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("MAIL_USERNAME", "benchmark@example.com")
+
+from utils.email_templates import (  # noqa: E402
+    TEMPLATES,
+    env,
+    render,
+    render_many,
+)
+
+
+def legacy(appointment_date, reason):
+    # As utils.customs built it before the template registry
+    appointment_date_str = appointment_date.strftime("%Y-%m-%d %H:%M")
+    return f"""
+    <div style="width: 100%;background: #ebf2fa;padding: 20px 0 0 0;font-family: system-ui, sans-serif; text-align: center;">
+        <div style="border-top: 6px solid #007BFF; background-color: #fff; display: block; padding: 8px 20px; text-align: center; max-width: 500px; border-bottom-left-radius: .4rem; border-bottom-right-radius: .4rem; letter-spacing: .037rem; line-height: 26px; margin: auto; font-size: 14px;">
+            <img src="https://res.cloudinary.com/droynil1n/image/upload/v1728204000/e50iplialg1fawi16enn.png"
+                alt="Happy Hearts Logo" style="width: 70%; height: auto; margin:auto">
+            <div style="text-align: left; padding-top: 10px;">
+                <p> You have missed an appointment that was scheduled for {appointment_date_str}.Reason for Appointment: {reason}.</p>
+            </div>
+            <div style="text-align: center; padding-top: 2px;">
+                <p>For assistance, reach us at
+                <a href='mailto:{os.getenv('MAIL_USERNAME')}'
+                    style='color: #007BFF; text-decoration: underline;'>{os.getenv('MAIL_USERNAME')}</a>.
+                </p>
+            </div>
+        </div>
+        <p style="padding: 20px 0 5px 0; text-align: center;color: rgb(150, 150, 150);font-size: 12px;">Happy Hearts
+        Community
+        </p>
+    </div>"""  # noqa: E501
+
+
+def best_of(repeat, fn):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    start = datetime(2026, 1, 1, 8, 0)
+    rows = [
+        {
+            "appointment_date": start + timedelta(minutes=15 * i),
+            "reason": f"Antenatal check {i}",
+        }
+        for i in range(args.messages)
+    ]
+    template = TEMPLATES["appointment_missed"]
+    # Every message compiles the body from source: no registry
+    source = env.loader.get_source(env, "email/appointment_missed.html")[0]
+
+    rendered = [render("appointment_missed", **row)[1] for row in rows]
+    if rendered != render_many("appointment_missed", rows)[1]:
+        print("FAIL: render_many differs from render", file=sys.stderr)
+        return 1
+
+    # Compiling per message is slow, so time a slice of it
+    compile_rows = rows[: max(args.messages // 20, 1)]
+    cases = [
+        ("f-string + os.getenv", rows, lambda: [legacy(**row) for row in rows]),
+        (
+            "compile per message",
+            compile_rows,
+            lambda: [
+                template.head + env.from_string(source).render(row) + template.tail
+                for row in compile_rows
+            ],
+        ),
+        (
+            "render()",
+            rows,
+            lambda: [render("appointment_missed", **row) for row in rows],
+        ),
+        ("render_many()", rows, lambda: render_many("appointment_missed", rows)),
+    ]
+    for label, sample, fn in cases:
+        seconds = best_of(args.repeat, fn)
+        per_10k = seconds / len(sample) * 10000
+        print(
+            f"{label:<22} {per_10k * 1000:9.1f}ms per 10k messages "
+            f"({seconds / len(sample) * 1e6:6.1f}us each)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+"""Latency, SQL statement count and peak memory for every GET route
+registered in app.py, measured against a freshly seeded database.
+
+Run from the project root:
+
+    python -m benchmarks.endpoints [--scale 1] [--requests 50] [--output out.json]
+
+The database defaults to a throwaway SQLite file; set BENCH_DATABASE_URI to
+run against a Postgres stand-in instead. Whatever it points at is dropped
+and recreated, so never point it at real data.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+os.environ["DATABASE_URI"] = os.environ.get(
+    "BENCH_DATABASE_URI",
+    "sqlite:///" + os.path.join(tempfile.gettempdir(), "happyhearts_bench.db"),
+)
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from flask_jwt_extended import create_access_token  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from werkzeug.routing import IntegerConverter  # noqa: E402
+
+import app as _routes  # noqa: E402,F401
+from benchmarks.seed import seed  # noqa: E402
+from config import app, db  # noqa: E402
+
+# seed() guarantees a row with id 1 in every table
+SAMPLE_ID = 1
+
+
+class StatementCounter:
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._count)
+
+    def _count(self, *args):
+        self.count += 1
+
+
+def get_routes():
+    """``(rule, url)`` for every GET route, skipping ones with arguments
+    other than integer ids (e.g. the email verification link)."""
+    routes = []
+    skipped = []
+    for rule in sorted(app.url_map.iter_rules(), key=lambda r: r.rule):
+        if "GET" not in rule.methods or rule.endpoint == "static":
+            continue
+        converters = rule._converters.values()
+        if not all(isinstance(c, IntegerConverter) for c in converters):
+            skipped.append(rule.rule)
+            continue
+        _, url = rule.build({name: SAMPLE_ID for name in rule.arguments})
+        routes.append((rule.rule, url))
+    return routes, skipped
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def measure(client, url, headers, requests, counter):
+    client.get(url, headers=headers)
+
+    latencies = []
+    statements = []
+    status = None
+    size = 0
+    for _ in range(requests):
+        counter.count = 0
+        start = time.perf_counter()
+        response = client.get(url, headers=headers)
+        latencies.append((time.perf_counter() - start) * 1000)
+        statements.append(counter.count)
+        status = response.status_code
+        size = len(response.data)
+
+    tracemalloc.start()
+    client.get(url, headers=headers)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "url": url,
+        "status": status,
+        "response_bytes": size,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "mean_ms": round(statistics.fmean(latencies), 3),
+        "sql_statements": max(statements),
+        "peak_memory_kib": round(peak / 1024, 1),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--output", help="write JSON results here instead of stdout")
+    parser.add_argument("--match", help="only run routes containing this string")
+    args = parser.parse_args(argv)
+
+    with app.app_context():
+        print("Seeding database...", file=sys.stderr)
+        rows = seed(args.scale)
+        token = create_access_token(
+            identity="benchmark", additional_claims={"role": "admin"}
+        )
+        counter = StatementCounter(db.engine)
+        dialect = db.engine.dialect.name
+
+    headers = {"Authorization": f"Bearer {token}"}
+    client = app.test_client()
+    routes, skipped = get_routes()
+    if args.match:
+        routes = [(rule, url) for rule, url in routes if args.match in rule]
+
+    results = {}
+    for rule, url in routes:
+        result = measure(client, url, headers, args.requests, counter)
+        results[rule] = result
+        print(
+            f"{rule:<48} {result['status']:>3} p50={result['p50_ms']:8.2f}ms "
+            f"p95={result['p95_ms']:8.2f}ms p99={result['p99_ms']:8.2f}ms "
+            f"sql={result['sql_statements']:<3} "
+            f"peak={result['peak_memory_kib']:8.1f}KiB",
+            file=sys.stderr,
+        )
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "database": dialect,
+            "python": platform.python_version(),
+            "scale": args.scale,
+            "requests_per_route": args.requests,
+            "rows": rows,
+            "skipped_routes": skipped,
+        },
+        "routes": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+    else:
+        json.dump(report, sys.stdout, indent=2, sort_keys=True)
+        print()
+
+
+if __name__ == "__main__":
+    main()
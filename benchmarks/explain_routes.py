@@ -0,0 +1,128 @@
+"""Fails if any GET route's queries fall back to a sequential scan.
+
+Seeds a database (see benchmarks.seed), records every statement each
+registered GET route issues through the test client and EXPLAINs it. On
+Postgres the plans are taken with ``enable_seqscan = off`` so a "Seq Scan"
+node only survives when no usable index exists; on SQLite a ``SCAN`` that
+isn't satisfied by an index is reported.
+
+Run from the project root:
+
+    python -m benchmarks.explain_routes [--scale 0.1]
+
+Exits with status 1 and lists the offending route, statement and table
+when a sequential scan is found. The same BENCH_DATABASE_URI rules as
+benchmarks.endpoints apply. tests/test_query_plans.py runs the same check
+under pytest when TEST_DATABASE_URI points at Postgres.
+"""
+
+import argparse
+import json
+import re
+import sys
+
+from benchmarks.endpoints import get_routes  # sets DATABASE_URI first
+from benchmarks.seed import seed
+from config import app, db
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event, text
+
+SQLITE_SCAN = re.compile(r"\bSCAN (\w+)\b(?! USING)")
+# A single ORDER BY term, table-qualified as SQLAlchemy renders it
+ORDER_BY = re.compile(r"\bORDER BY (\w+)\.(\w+)(?: ASC| DESC)?(?: LIMIT .*)?$", re.I)
+
+
+def record_statements(engine):
+    captured = []
+
+    def before(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and not executemany:
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before)
+    return captured
+
+
+def _is_primary_key_walk(statement):
+    # Reading a table from the start in primary key order (the first page
+    # of an unfiltered list) is an index walk, however SQLite labels it.
+    # Any other unfiltered ORDER BY still has to be backed by an index
+    statement = " ".join(statement.split())
+    if " WHERE " in statement.upper():
+        return False
+    match = ORDER_BY.search(statement)
+    if match is None:
+        return False
+    table = db.metadata.tables.get(match.group(1))
+    return table is not None and table.primary_key.columns.keys() == [match.group(2)]
+
+
+def seq_scans(connection, statement, parameters):
+    if connection.dialect.name == "postgresql":
+        plan = connection.exec_driver_sql(
+            "EXPLAIN (FORMAT JSON) " + statement, parameters
+        ).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        found = []
+        stack = [plan[0]["Plan"]]
+        while stack:
+            node = stack.pop()
+            if node["Node Type"] == "Seq Scan":
+                found.append(node["Relation Name"])
+            stack.extend(node.get("Plans", []))
+        return found
+
+    rows = connection.exec_driver_sql(
+        "EXPLAIN QUERY PLAN " + statement, parameters
+    ).all()
+    if _is_primary_key_walk(statement):
+        return []
+    return [m.group(1) for row in rows for m in SQLITE_SCAN.finditer(row[-1])]
+
+
+def find_seq_scans(scale):
+    """Seeds the database at ``scale``, requests every GET route and
+    returns the routes checked and a ``(rule, table, statement)`` for each
+    sequential scan found."""
+    with app.app_context():
+        seed(scale)
+        token = create_access_token(
+            identity="benchmark", additional_claims={"role": "admin"}
+        )
+        captured = record_statements(db.engine)
+
+    client = app.test_client()
+    headers = {"Authorization": f"Bearer {token}"}
+    failures = []
+    routes, _ = get_routes()
+    with app.app_context():
+        connection = db.engine.connect()
+        if connection.dialect.name == "postgresql":
+            connection.execute(text("SET enable_seqscan = off"))
+
+        for rule, url in routes:
+            captured.clear()
+            client.get(url, headers=headers)
+            statements = list(captured)
+            for statement, parameters in statements:
+                for table in seq_scans(connection, statement, parameters):
+                    failures.append((rule, table, statement))
+        connection.close()
+    return routes, failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    routes, failures = find_seq_scans(args.scale)
+    for rule, table, statement in failures:
+        print(f"{rule}: sequential scan on {table}\n    {' '.join(statement.split())}")
+    print(f"{len(routes)} routes checked, {len(failures)} sequential scans")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
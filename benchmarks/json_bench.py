@@ -0,0 +1,99 @@
+"""Measures list-endpoint throughput with Flask's default JSON provider
+(pretty-printed, as the app used to be configured) and with
+FastJSONProvider.
+
+Run from the project root:
+
+    python -m benchmarks.json_bench [rows] [requests]
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import pytz
+
+os.environ.setdefault("DATABASE_URI", "sqlite://")
+
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+
+import app as _routes  # noqa: E402,F401
+from config import app, db  # noqa: E402
+from models import Appointment, Parent, Provider  # noqa: E402
+from utils.json_provider import FastJSONProvider, orjson  # noqa: E402
+
+EAT = pytz.timezone("Africa/Nairobi")
+URL = "/appointments?limit=200"
+
+
+def seed(count):
+    db.create_all()
+    parent = Parent(
+        name="Jane Doe",
+        email="jane@example.com",
+        national_id=1234,
+        phone_number=700000001,
+        gender="Female",
+        password_hash="x",
+    )
+    provider = Provider(
+        name="Dr. Otieno",
+        email="otieno@example.com",
+        national_id=99,
+        phone_number=700000002,
+        gender="Male",
+        password_hash="x",
+    )
+    db.session.add_all([parent, provider])
+    db.session.flush()
+    now = datetime.now(EAT)
+    db.session.add_all(
+        Appointment(
+            parent_id=parent.parent_id,
+            provider_id=provider.provider_id,
+            reason="Antenatal visit",
+            appointment_date=now + timedelta(days=i % 90),
+            status="pending",
+        )
+        for i in range(count)
+    )
+    db.session.commit()
+
+
+def default_provider():
+    provider = DefaultJSONProvider(app)
+    provider.compact = False
+    return provider
+
+
+def run(client, requests):
+    start = time.perf_counter()
+    size = 0
+    for _ in range(requests):
+        response = client.get(URL)
+        assert response.status_code == 200, response.data
+        size = len(response.data)
+    elapsed = time.perf_counter() - start
+    return requests / elapsed, size
+
+
+def main(count=2000, requests=200):
+    with app.app_context():
+        seed(count)
+
+    client = app.test_client()
+    encoder = "orjson" if orjson is not None else "stdlib json"
+    for name, provider in (
+        ("default (pretty)", default_provider()),
+        (f"fast ({encoder})", FastJSONProvider(app)),
+    ):
+        app.json = provider
+        run(client, 10)
+        rate, size = run(client, requests)
+        print(f"{name:<20} {rate:8.1f} req/s  {size / 1024:7.1f} KiB/response")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*args)
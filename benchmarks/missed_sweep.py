@@ -0,0 +1,139 @@
+"""Times the missed-appointment sweep's emails against a local SMTP server:
+one connection per email, as the sweep used to send them, against batches
+over reused connections with 1..N of them in parallel.
+
+Run from the project root:
+
+    python -m benchmarks.missed_sweep [--scale 0.13] [--connections 1,3]
+
+benchmarks.smtp_sink stands in for the mail server, with --connect-latency
+for the TLS handshake and login. The one-connection-per-email figure is
+extrapolated from --baseline sends. Each sweep starts from the same
+pending, past appointments (about 0.37 per seeded appointment) and must
+mark them all missed and deliver every email exactly once, or the script
+exits non-zero. Uses the same database setup as benchmarks.endpoints
+(BENCH_DATABASE_URI, dropped and reseeded).
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+os.environ["DATABASE_URI"] = os.environ.get(
+    "BENCH_DATABASE_URI",
+    "sqlite:///" + os.path.join(tempfile.gettempdir(), "happyhearts_bench.db"),
+)
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("MAIL_USERNAME", "benchmark@example.com")
+os.environ.setdefault("MAIL_PASSWORD", "benchmark")
+os.environ["MAIL_USE_TLS"] = "False"
+os.environ["MAIL_USE_SSL"] = "False"
+# Only the sweep's own drain sends, so its timings cover every email
+os.environ["OUTBOX_WORKERS"] = "0"
+
+import pytz  # noqa: E402
+from flask_mail import Message  # noqa: E402
+from sqlalchemy import delete, update  # noqa: E402
+
+import app as _routes  # noqa: E402,F401
+from benchmarks.seed import seed  # noqa: E402
+from benchmarks.smtp_sink import SMTPSink  # noqa: E402
+from config import app, db, mail  # noqa: E402
+from models import Appointment, EmailOutbox  # noqa: E402
+from utils.customs import update_appointment_statuses  # noqa: E402
+
+HTML = "<p>" + "You have missed an appointment. " * 40 + "</p>"
+
+
+def due_appointments():
+    now = datetime.now(pytz.timezone("Africa/Nairobi"))
+    return [
+        appointment_id
+        for (appointment_id,) in db.session.query(Appointment.appointment_id).filter(
+            Appointment.appointment_date <= now, Appointment.status == "pending"
+        )
+    ]
+
+
+def reset(due):
+    db.session.execute(
+        update(Appointment)
+        .where(Appointment.appointment_id.in_(due))
+        .values(status="pending")
+    )
+    db.session.execute(delete(EmailOutbox))
+    db.session.commit()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=float, default=0.13)
+    parser.add_argument("--connections", default="1,3")
+    parser.add_argument("--baseline", type=int, default=10)
+    parser.add_argument("--connect-latency", type=float, default=0.3)
+    parser.add_argument("--message-latency", type=float, default=0.01)
+    parser.add_argument("--rate", type=int, default=0, help="OUTBOX_SEND_RATE")
+    parser.add_argument("--chunk-size", type=int, default=500)
+    args = parser.parse_args(argv)
+    os.environ["OUTBOX_SEND_RATE"] = str(args.rate)
+    os.environ["MISSED_SWEEP_CHUNK_SIZE"] = str(args.chunk_size)
+
+    sink = SMTPSink(
+        connect_latency=args.connect_latency, message_latency=args.message_latency
+    ).start()
+    app.config.update(MAIL_SERVER=sink.host, MAIL_PORT=sink.port)
+    mail.init_app(app)
+
+    failures = 0
+    with app.app_context():
+        print("Seeding...", file=sys.stderr)
+        seed(args.scale)
+        due = due_appointments()
+        db.session.commit()
+
+        start = time.perf_counter()
+        for _ in range(args.baseline):
+            mail.send(Message("Missed", recipients=["x@example.com"], html=HTML))
+        per_email = (time.perf_counter() - start) / args.baseline
+        print(
+            f"{len(due)} missed appointments; one connection per email: "
+            f"{per_email * 1000:.0f}ms each, ~{per_email * len(due):.1f}s in total"
+        )
+
+        for connections in (int(n) for n in args.connections.split(",")):
+            reset(due)
+            sink.reset()
+            os.environ["MISSED_SWEEP_CONNECTIONS"] = str(connections)
+            start = time.perf_counter()
+            response = update_appointment_statuses()
+            elapsed = time.perf_counter() - start
+            emails = response.json["emails"]
+            chunks = response.json["chunks"]
+
+            left = len(set(due) & set(due_appointments()))
+            db.session.commit()
+            duplicates = sum(1 for count in sink.ids.values() if count > 1)
+            ok = (
+                not left
+                and emails["sent"] == len(due)
+                and len(sink.ids) == len(due)
+                and not duplicates
+            )
+            print(
+                f"{connections} connections: {elapsed:6.2f}s, {chunks} chunks, "
+                f"{emails['batches']} batches over {sink.connections} connections, "
+                f"{emails['connect_ms'] / 1000:.1f}s connecting, slowest batch "
+                f"{emails['batch_ms_max']:.0f}ms, {duplicates} duplicates"
+                f"{'' if ok else '  FAIL'}"
+            )
+            if not ok:
+                failures += 1
+    sink.stop()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
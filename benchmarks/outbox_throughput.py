@@ -0,0 +1,186 @@
+"""Compares request latency with inline SMTP sends against the email
+outbox, then measures how fast the outbox workers drain a backlog.
+
+Run from the project root:
+
+    python -m benchmarks.outbox_throughput [--messages 400] [--threads 1,2,4,8]
+
+Mail goes to a local benchmarks.smtp_sink server whose --connect-latency
+stands in for the TLS handshake and login of a real SMTP server. The
+drain phase injects --failure-rate temporary rejections and
+--disconnect-rate dropped connections, so messages are retried with a one
+second backoff. Exits non-zero unless every message ends up sent and
+delivered exactly once. Uses the same database setup as benchmarks.endpoints
+(BENCH_DATABASE_URI, dropped and reseeded).
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+os.environ["DATABASE_URI"] = os.environ.get(
+    "BENCH_DATABASE_URI",
+    "sqlite:///" + os.path.join(tempfile.gettempdir(), "happyhearts_bench.db"),
+)
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("MAIL_USERNAME", "benchmark@example.com")
+os.environ.setdefault("MAIL_PASSWORD", "benchmark")
+os.environ["MAIL_USE_TLS"] = "False"
+os.environ["MAIL_USE_SSL"] = "False"
+# Workers are started explicitly below, not by the first queued message
+os.environ["OUTBOX_WORKERS"] = "0"
+os.environ["OUTBOX_POLL_SECONDS"] = "1"
+os.environ["OUTBOX_RETRY_BASE_SECONDS"] = "1"
+os.environ["OUTBOX_RETRY_MAX_SECONDS"] = "2"
+
+from flask_mail import Message  # noqa: E402
+from sqlalchemy import delete, func, select  # noqa: E402
+
+import app as _routes  # noqa: E402,F401
+from benchmarks.seed import seed  # noqa: E402
+from benchmarks.smtp_sink import SMTPSink  # noqa: E402
+from config import app, db, mail  # noqa: E402
+from models import EmailOutbox, Parent, Provider  # noqa: E402
+from utils.outbox import queue_email, workers  # noqa: E402
+
+HTML = "<p>" + "Your appointment is confirmed. " * 40 + "</p>"
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def report(label, samples):
+    print(
+        f"{label:<28} median {statistics.median(samples) * 1000:8.1f}ms"
+        f"  p95 {percentile(samples, 0.95) * 1000:8.1f}ms"
+    )
+
+
+def inline_sends(count):
+    # What every request paid before: one connection per message
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        message = Message("Reminder", recipients=["x@example.com"], html=HTML)
+        mail.send(message)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def api_posts(count, parent_id, provider_id):
+    client = app.test_client()
+    when = (datetime.now() + timedelta(days=7)).strftime("%Y-%m-%dT%H:%M")
+    latencies = []
+    for _ in range(count):
+        body = {
+            "parent_id": parent_id,
+            "provider_id": provider_id,
+            "reason": "Checkup",
+            "appointment_date": when,
+            "status": "pending",
+        }
+        start = time.perf_counter()
+        response = client.post("/appointments", json=body)
+        latencies.append(time.perf_counter() - start)
+        if response.status_code != 201:
+            raise RuntimeError(f"POST /appointments: {response.status_code}")
+    return latencies
+
+
+def status_counts():
+    return dict(
+        db.session.execute(
+            select(EmailOutbox.status, func.count()).group_by(EmailOutbox.status)
+        ).all()
+    )
+
+
+def drain(sink, messages, threads, timeout):
+    db.session.execute(delete(EmailOutbox))
+    for i in range(messages):
+        queue_email(f"parent{i}@example.com", "Appointment schedule", HTML)
+    db.session.commit()
+    sink.reset()
+
+    start = time.perf_counter()
+    workers.start(app, threads)
+    deadline = start + timeout
+    while time.perf_counter() < deadline:
+        counts = status_counts()
+        db.session.commit()
+        if not counts.get("pending") and not counts.get("sending"):
+            break
+        time.sleep(0.05)
+    elapsed = time.perf_counter() - start
+    workers.stop(timeout=10)
+
+    sent = set(
+        str(outbox_id)
+        for outbox_id in db.session.execute(
+            select(EmailOutbox.outbox_id).where(EmailOutbox.status == "sent")
+        ).scalars()
+    )
+    stats = sink.summary()
+    duplicates = sum(1 for count in sink.ids.values() if count > 1)
+    ok = len(sent) == messages and set(sink.ids) == sent and not duplicates
+    print(
+        f"{threads:>2} threads: {messages} messages in {elapsed:6.2f}s "
+        f"({messages / elapsed:7.1f}/s), {stats['connections']} connections, "
+        f"{stats['rejected'] + stats['dropped']} failed and retried, "
+        f"{duplicates} duplicates"
+        f"{'' if ok else '  FAIL ' + str(status_counts())}"
+    )
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=float, default=0.05)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--messages", type=int, default=400)
+    parser.add_argument("--threads", default="1,2,4,8")
+    parser.add_argument("--connect-latency", type=float, default=0.3)
+    parser.add_argument("--message-latency", type=float, default=0.01)
+    parser.add_argument("--failure-rate", type=float, default=0.05)
+    parser.add_argument("--disconnect-rate", type=float, default=0.01)
+    parser.add_argument("--timeout", type=float, default=120)
+    args = parser.parse_args(argv)
+
+    sink = SMTPSink(
+        connect_latency=args.connect_latency,
+        message_latency=args.message_latency,
+        seed_value=1,
+    ).start()
+    app.config.update(MAIL_SERVER=sink.host, MAIL_PORT=sink.port)
+    mail.init_app(app)
+
+    failures = 0
+    with app.app_context():
+        print("Seeding...", file=sys.stderr)
+        seed(args.scale)
+        parent_id = db.session.query(Parent.parent_id).limit(1).scalar()
+        provider_id = db.session.query(Provider.provider_id).limit(1).scalar()
+
+        report("inline mail.send", inline_sends(args.requests))
+        report(
+            "POST /appointments (queued)",
+            api_posts(args.requests, parent_id, provider_id),
+        )
+
+        sink.failure_rate = args.failure_rate
+        sink.disconnect_rate = args.disconnect_rate
+        for threads in (int(n) for n in args.threads.split(",")):
+            if not drain(sink, args.messages, threads, args.timeout):
+                failures += 1
+    sink.stop()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
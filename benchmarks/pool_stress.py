@@ -0,0 +1,117 @@
+"""Hammers list endpoints from many threads at once and reports connection
+pool checkouts, wait times and timeouts.
+
+Run from the project root:
+
+    python -m benchmarks.pool_stress [--threads 20] [--seconds 10]
+
+--threads defaults to DB_POOL_SIZE + DB_MAX_OVERFLOW, the most requests
+one gunicorn worker should ever have in flight. Exits non-zero if any
+checkout timed out or any request failed. Uses the same database setup as
+benchmarks.endpoints (BENCH_DATABASE_URI, dropped and reseeded).
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+os.environ["DATABASE_URI"] = os.environ.get(
+    "BENCH_DATABASE_URI",
+    "sqlite:///" + os.path.join(tempfile.gettempdir(), "happyhearts_bench.db"),
+)
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from flask_jwt_extended import create_access_token  # noqa: E402
+
+import app as _routes  # noqa: E402,F401
+from benchmarks.endpoints import percentile  # noqa: E402
+from benchmarks.seed import seed  # noqa: E402
+from config import app, db  # noqa: E402
+from utils.db_pool import pool_stats, setting  # noqa: E402
+
+URLS = [
+    "/appointments?limit=50",
+    "/prescriptions?limit=50",
+    "/records?limit=50",
+    "/admissions?limit=50",
+    "/parents/1",
+    "/medicines",
+]
+
+
+def worker(headers, deadline, latencies, failures):
+    client = app.test_client()
+    i = 0
+    while time.perf_counter() < deadline:
+        url = URLS[i % len(URLS)]
+        i += 1
+        start = time.perf_counter()
+        response = client.get(url, headers=headers)
+        latencies.append((time.perf_counter() - start) * 1000)
+        if response.status_code >= 500:
+            failures.append((url, response.status_code))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=setting("DB_POOL_SIZE") + setting("DB_MAX_OVERFLOW"),
+    )
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--scale", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    with app.app_context():
+        print("Seeding database...", file=sys.stderr)
+        seed(args.scale)
+        db.session.remove()
+        db.engine.dispose()
+        db.engine.pool.metrics.reset()
+        token = create_access_token(
+            identity="benchmark", additional_claims={"role": "admin"}
+        )
+    headers = {"Authorization": f"Bearer {token}"}
+
+    latencies = []
+    failures = []
+    deadline = time.perf_counter() + args.seconds
+    threads = [
+        threading.Thread(target=worker, args=(headers, deadline, latencies, failures))
+        for _ in range(args.threads)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    with app.app_context():
+        stats = pool_stats(db.engine)
+    report = {
+        "threads": args.threads,
+        "seconds": args.seconds,
+        "requests": len(latencies),
+        "requests_per_second": round(len(latencies) / args.seconds, 1),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "mean_ms": round(statistics.fmean(latencies), 3),
+        "failures": len(failures),
+        "pool": stats,
+    }
+    json.dump(report, sys.stdout, indent=2, sort_keys=True)
+    print()
+
+    if stats.get("timeouts") or failures:
+        print("FAIL: checkout timeouts or failed requests", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""Records one immunisation session through POST /records once per child and
+then through POST /records/bulk, and compares SQL round trips and time.
+
+Run from the project root:
+
+    python -m benchmarks.records_bulk [--children 50]
+
+Exits non-zero if the bulk path doesn't create every record or needs more
+than a tenth of the single-record path's statements. Uses the same
+database setup as benchmarks.endpoints (BENCH_DATABASE_URI, dropped and
+reseeded).
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+os.environ["DATABASE_URI"] = os.environ.get(
+    "BENCH_DATABASE_URI",
+    "sqlite:///" + os.path.join(tempfile.gettempdir(), "happyhearts_bench.db"),
+)
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from sqlalchemy import event  # noqa: E402
+
+import app as _routes  # noqa: E402,F401
+from benchmarks.seed import seed  # noqa: E402
+from config import app, db  # noqa: E402
+from models import Child, Provider, Vaccine  # noqa: E402
+
+
+def session_payloads(count):
+    children = db.session.query(Child).order_by(Child.child_id).limit(count).all()
+    provider_id = db.session.query(Provider.provider_id).limit(1).scalar()
+    vaccine_id = db.session.query(Vaccine.vaccine_id).limit(1).scalar()
+    items = [
+        {"child_certificate_no": child.certificate_No, "vaccine_id": vaccine_id}
+        for child in children
+    ]
+    singles = [
+        dict(item, parent_id=child.parent_id, provider_id=provider_id)
+        for item, child in zip(items, children)
+    ]
+    return singles, {"provider_id": provider_id, "records": items}
+
+
+def measure(engine, send):
+    statements = [0]
+
+    def count(*args):
+        statements[0] += 1
+
+    event.listen(engine, "before_cursor_execute", count)
+    start = time.perf_counter()
+    try:
+        created = send()
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    return created, statements[0], time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--children", type=int, default=50)
+    parser.add_argument("--scale", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    with app.app_context():
+        print("Seeding database...", file=sys.stderr)
+        seed(args.scale)
+        singles, bulk = session_payloads(args.children)
+        engine = db.engine
+        db.session.remove()
+
+    client = app.test_client()
+
+    def send_singles():
+        return sum(
+            client.post("/records", json=body).status_code == 201 for body in singles
+        )
+
+    def send_bulk():
+        response = client.post("/records/bulk", json=bulk)
+        return response.get_json().get("created", 0)
+
+    one_created, one_statements, one_seconds = measure(engine, send_singles)
+    bulk_created, bulk_statements, bulk_seconds = measure(engine, send_bulk)
+
+    for label, created, statements, seconds in (
+        ("per record", one_created, one_statements, one_seconds),
+        ("bulk", bulk_created, bulk_statements, bulk_seconds),
+    ):
+        print(
+            f"{label:>10}: {created}/{len(singles)} created, "
+            f"{statements} statements, {seconds * 1000:.1f}ms"
+        )
+    ratio = one_statements / max(bulk_statements, 1)
+    print(f"{ratio:.1f}x fewer statements")
+    return 0 if bulk_created == len(singles) and ratio >= 10 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
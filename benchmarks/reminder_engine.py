@@ -0,0 +1,203 @@
+"""Checks utils.reminders' engine: how much of a large appointment table it
+reads and holds, and that reminders and missed transitions fire on time and
+exactly once, across a restart.
+
+Run from the project root:
+
+    python -m benchmarks.reminder_engine [--scale 0.05] [--future 200000]
+
+Seeds the database as benchmarks.endpoints does (BENCH_DATABASE_URI, dropped
+and reseeded), adds --future appointments spread over the next 90 days, and
+times the engine's horizon load against reading every upcoming appointment,
+as a periodic full scan would. It then books --due appointments a few
+seconds ahead with REMINDER_LEADS_SECONDS=4,2, half before the engine starts
+and half while it runs, restarts the engine between the two reminders, and
+checks that each appointment got both reminders and one missed email, and
+nothing twice. Exits non-zero if any check fails.
+"""
+
+import argparse
+import os
+import re
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import timedelta
+
+os.environ["DATABASE_URI"] = os.environ.get(
+    "BENCH_DATABASE_URI",
+    "sqlite:///" + os.path.join(tempfile.gettempdir(), "happyhearts_bench.db"),
+)
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("MAIL_USERNAME", "benchmark@example.com")
+os.environ.setdefault("MAIL_PASSWORD", "benchmark")
+os.environ["MAIL_USE_TLS"] = "False"
+os.environ["MAIL_USE_SSL"] = "False"
+# Leave the engine's emails in the outbox to be counted
+os.environ["OUTBOX_WORKERS"] = "0"
+
+from sqlalchemy import insert, select  # noqa: E402
+
+import app as _routes  # noqa: E402,F401
+from benchmarks.seed import seed  # noqa: E402
+from benchmarks.smtp_sink import SMTPSink  # noqa: E402
+from config import app, db, mail  # noqa: E402
+from models import Appointment, EmailOutbox, Parent, Provider  # noqa: E402
+from utils.reminders import REMINDER_STATUSES, _now, engine  # noqa: E402
+
+MARKER = re.compile(r"reminder-check-(\d{5})")
+
+
+def add_future(count):
+    parent_ids = db.session.scalars(select(Parent.parent_id)).all()
+    provider_ids = db.session.scalars(select(Provider.provider_id)).all()
+    start = _now() + timedelta(hours=2)
+    step = timedelta(days=90) / count
+    for offset in range(0, count, 10000):
+        db.session.execute(
+            insert(Appointment),
+            [
+                {
+                    "parent_id": parent_ids[i % len(parent_ids)],
+                    "provider_id": provider_ids[i % len(provider_ids)],
+                    "reason": "Antenatal check",
+                    "appointment_date": start + step * i,
+                    "status": ("pending", "approved")[i % 2],
+                }
+                for i in range(offset, min(offset + 10000, count))
+            ],
+        )
+    db.session.commit()
+
+
+def book(numbers, first_due):
+    parent_id = db.session.scalar(select(Parent.parent_id).limit(1))
+    provider_id = db.session.scalar(select(Provider.provider_id).limit(1))
+    due = _now() + timedelta(seconds=first_due)
+    db.session.add_all(
+        Appointment(
+            parent_id=parent_id,
+            provider_id=provider_id,
+            reason=f"reminder-check-{n:05d}",
+            appointment_date=due + timedelta(milliseconds=40 * n),
+            status="pending",
+        )
+        for n in numbers
+    )
+    db.session.commit()
+    return due + timedelta(milliseconds=40 * max(numbers))
+
+
+def compare_loads():
+    now = _now()
+    start = time.perf_counter()
+    upcoming = db.session.execute(
+        select(Appointment.appointment_id, Appointment.appointment_date).where(
+            Appointment.status.in_(REMINDER_STATUSES),
+            Appointment.appointment_date > now,
+        )
+    ).all()
+    db.session.commit()
+    scan = time.perf_counter() - start
+
+    engine._reset()
+    start = time.perf_counter()
+    loaded = engine.load(now, now + timedelta(hours=25))
+    horizon = time.perf_counter() - start
+    events = len(engine)
+    start = time.perf_counter()
+    engine.load(now, now + timedelta(hours=25))
+    refresh = time.perf_counter() - start
+    engine._reset()
+    print(
+        f"full scan: {len(upcoming)} upcoming appointments in {scan * 1000:.0f}ms; "
+        f"engine: {loaded} in the 25h horizon ({events} events) in "
+        f"{horizon * 1000:.0f}ms, refresh {refresh * 1000:.0f}ms"
+    )
+
+
+def check_emails(count):
+    sent = Counter()
+    for subject, html in db.session.execute(
+        select(EmailOutbox.subject, EmailOutbox.html)
+    ):
+        match = MARKER.search(html)
+        if match:
+            sent[int(match.group(1)), subject] += 1
+    db.session.commit()
+    failures = 0
+    for n in range(count):
+        reminders = sent[n, "Appointment Reminder"]
+        missed = sent[n, "Missed Appointment"]
+        if (reminders, missed) != (2, 1):
+            failures += 1
+            print(
+                f"reminder-check-{n:05d}: {reminders} reminders, {missed} missed",
+                file=sys.stderr,
+            )
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=float, default=0.05)
+    parser.add_argument("--future", type=int, default=200000)
+    parser.add_argument("--due", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    sink = SMTPSink().start()
+    app.config.update(MAIL_SERVER=sink.host, MAIL_PORT=sink.port)
+    mail.init_app(app)
+
+    with app.app_context():
+        print("Seeding...", file=sys.stderr)
+        seed(args.scale)
+        add_future(args.future)
+        compare_loads()
+
+        os.environ["REMINDER_LEADS_SECONDS"] = "4,2"
+        half = args.due // 2
+        book(range(half), 6)
+        engine.start(app)
+        while not engine.running:
+            time.sleep(0.01)
+        last_due = book(range(half, args.due), 5)
+
+        # Restart once the first 4s reminders have gone out but before any
+        # 2s one is due
+        time.sleep(2.5)
+        engine.stop(timeout=30)
+        first_run = dict(engine.stats)
+        engine.start(app)
+        while not engine.running:
+            time.sleep(0.01)
+        time.sleep(max((last_due - _now()).total_seconds(), 0) + 1)
+        engine.stop(timeout=30)
+
+        failures = check_emails(args.due)
+        stale = db.session.scalar(
+            select(db.func.count()).where(
+                Appointment.reason.like("reminder-check-%"),
+                (Appointment.status != "missed")
+                | (Appointment.last_reminder_lead != 2),
+            )
+        )
+        db.session.commit()
+        stats = engine.stats
+        # After the restart the engine replays events that fell due while it
+        # was down, most of them already handled, so only the first run's
+        # lateness says how close to due time events fire
+        print(
+            f"{args.due} appointments: {stats['reminded']} reminders "
+            f"({first_run['reminded']} before the restart), {stats['missed']} "
+            f"missed, latest event {first_run['max_late_ms']:.0f}ms after its "
+            f"due time, {failures} with wrong emails, {stale} not marked"
+            f"{'' if not failures and not stale else '  FAIL'}"
+        )
+    sink.stop()
+    return 1 if failures or stale else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
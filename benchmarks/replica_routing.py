@@ -0,0 +1,150 @@
+"""Checks read-replica routing against two local databases: GETs read the
+replica, writes go to the primary, and a client that just wrote reads the
+primary until DB_READ_YOUR_WRITES_SECONDS have passed, whether it keeps
+the cookie or echoes the X-DB-Primary-Until header. A rejected write
+doesn't count.
+
+Run from the project root:
+
+    python -m benchmarks.replica_routing
+
+BENCH_DATABASE_URI and BENCH_REPLICA_URI pick the two databases (two
+SQLite files in the temp directory by default). A SQLite replica is made
+by copying the seeded primary, so it never sees later writes, like a
+replica that has fallen behind. Any other replica must already hold the
+schema. Exits non-zero if a request is routed to the wrong database.
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+os.environ["DATABASE_URI"] = os.environ.get(
+    "BENCH_DATABASE_URI",
+    "sqlite:///" + os.path.join(tempfile.gettempdir(), "happyhearts_bench.db"),
+)
+os.environ["DATABASE_REPLICA_URI"] = os.environ.get(
+    "BENCH_REPLICA_URI",
+    "sqlite:///" + os.path.join(tempfile.gettempdir(), "happyhearts_replica.db"),
+)
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("DB_READ_YOUR_WRITES_SECONDS", "2")
+
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.engine import make_url  # noqa: E402
+
+import app as _routes  # noqa: E402,F401
+from benchmarks.seed import seed  # noqa: E402
+from config import app, db  # noqa: E402
+from models import Child, Provider, Vaccine  # noqa: E402
+from utils.settings import setting  # noqa: E402
+from utils.db_routing import PRIMARY_HEADER, REPLICA  # noqa: E402
+
+
+class StatementCounter:
+    def __init__(self, engines):
+        self.counts = dict.fromkeys(engines, 0)
+        for name, engine in engines.items():
+            event.listen(engine, "before_cursor_execute", self._counter(name))
+
+    def _counter(self, name):
+        def count(*args):
+            self.counts[name] += 1
+
+        return count
+
+    def take(self):
+        counts = dict(self.counts)
+        self.counts = dict.fromkeys(self.counts, 0)
+        return counts
+
+
+def copy_sqlite(primary, replica):
+    primary, replica = make_url(primary), make_url(replica)
+    if replica.get_backend_name() != "sqlite" or primary.get_backend_name() != "sqlite":
+        return False
+    shutil.copyfile(primary.database, replica.database)
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=float, default=0.05)
+    args = parser.parse_args(argv)
+
+    window = setting("DB_READ_YOUR_WRITES_SECONDS")
+    with app.app_context():
+        print("Seeding primary...", file=sys.stderr)
+        seed(args.scale)
+        child = db.session.query(Child).first()
+        body = {
+            "provider_id": db.session.query(Provider.provider_id).limit(1).scalar(),
+            "records": [
+                {
+                    "child_id": child.child_id,
+                    "vaccine_id": db.session.query(Vaccine.vaccine_id)
+                    .limit(1)
+                    .scalar(),
+                }
+            ],
+        }
+        url = f"/records/parent/{child.parent_id}?limit=200"
+        db.session.remove()
+        db.engine.dispose()
+        lagging = copy_sqlite(
+            os.environ["DATABASE_URI"], os.environ["DATABASE_REPLICA_URI"]
+        )
+        counter = StatementCounter(
+            {"primary": db.engine, "replica": db.engines[REPLICA]}
+        )
+
+    client = app.test_client()
+    failures = []
+
+    def check(label, response, expect, rejected=False):
+        counts = counter.take()
+        wrong = "replica" if expect == "primary" else "primary"
+        if rejected:
+            ok = response.status_code >= 400 and not counts[wrong]
+        else:
+            ok = response.status_code < 400 and counts[expect] and not counts[wrong]
+        print(f"{label:<34} {response.status_code} statements {counts}")
+        if not ok:
+            failures.append(label)
+        return response
+
+    before = len(check("GET, no recent write", client.get(url), "replica").json["data"])
+    check("POST /records/bulk", client.post("/records/bulk", json=body), "primary")
+    after = len(check("GET within the window", client.get(url), "primary").json["data"])
+    time.sleep(window + 0.1)
+    stale = len(check("GET after the window", client.get(url), "replica").json["data"])
+
+    # A failed write doesn't keep the client on the primary
+    check("POST rejected", client.post("/records/bulk", json={}), "primary", True)
+    check("GET after a rejected write", client.get(url), "replica")
+
+    # A client that keeps no cookies, like a browser calling the API
+    # cross-origin, echoes the response header instead
+    bare = app.test_client(use_cookies=False)
+    response = check(
+        "POST without cookies", bare.post("/records/bulk", json=body), "primary"
+    )
+    echoed = {PRIMARY_HEADER: response.headers.get(PRIMARY_HEADER, "")}
+    check("GET echoing the header", bare.get(url, headers=echoed), "primary")
+    check("GET without it", bare.get(url), "replica")
+
+    if lagging:
+        print(f"rows seen: {before} before, {after} just after, {stale} on replica")
+        if not after == before + 1 == stale + 1:
+            failures.append("read-your-writes visibility")
+    if failures:
+        print(f"FAIL: {', '.join(failures)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
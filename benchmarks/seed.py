@@ -0,0 +1,409 @@
+"""Builds the schema from ``models`` and fills it with Faker data.
+
+Volumes are per ``scale`` unit; ``scale=1`` is roughly a small clinic's
+first year. Every table gets at least one row so every ``/<int:id>`` route
+has something to return for id 1.
+"""
+
+import random
+from datetime import datetime, timedelta
+
+import pytz
+from faker import Faker
+
+from config import db
+from utils.customs import allocate_serial_numbers
+from models import (
+    Admission,
+    Appointment,
+    Bed,
+    Birth,
+    Child,
+    Conversation,
+    Delivery,
+    Discharge_summary,
+    Document,
+    LabTest,
+    Medical_info_parent,
+    Medications,
+    Medicine,
+    Message,
+    Parent,
+    Payment,
+    Prescription,
+    Present_pregnancy,
+    Previous_pregnancy,
+    Provider,
+    Record,
+    Room,
+    User,
+    Vaccine,
+)
+
+EAT = pytz.timezone("Africa/Nairobi")
+
+VOLUMES = {
+    "providers": 50,
+    "users": 10,
+    "parents": 1000,
+    "children": 1500,
+    "medicines": 200,
+    "vaccines": 30,
+    "rooms": 20,
+    "beds_per_room": 5,
+    "appointments": 10000,
+    "prescriptions": 5000,
+    "records": 5000,
+    "lab_tests": 2000,
+    "admissions": 300,
+    "documents": 1000,
+    "messages": 1000,
+    "payments": 1000,
+    "medications": 1000,
+    "pregnancies": 500,
+    "deliveries": 300,
+}
+
+
+def _add(objects):
+    db.session.add_all(objects)
+    db.session.flush()
+    return objects
+
+
+def seed(scale=1.0, seed_value=1234):
+    """Drops and recreates every table, then seeds it. Returns the number of
+    rows created per table."""
+    fake = Faker()
+    Faker.seed(seed_value)
+    rng = random.Random(seed_value)
+    counts = {key: max(1, int(value * scale)) for key, value in VOLUMES.items()}
+    now = datetime.now(EAT)
+
+    def past(days=365):
+        return now - timedelta(days=rng.randint(0, days), minutes=rng.randint(0, 1439))
+
+    db.drop_all()
+    db.create_all()
+
+    providers = _add(
+        [
+            Provider(
+                name=fake.name()[:50],
+                email=f"provider{i}@example.com",
+                national_id=10_000_000 + i,
+                phone_number=700_000_000 + i,
+                gender=rng.choice(["Male", "Female"]),
+                password_hash="x",
+            )
+            for i in range(counts["providers"])
+        ]
+    )
+    _add(
+        [
+            User(
+                name=fake.name()[:50],
+                email=f"user{i}@example.com",
+                role="admin",
+                password_hash="x",
+            )
+            for i in range(counts["users"])
+        ]
+    )
+    parents = _add(
+        [
+            Parent(
+                name=fake.name_female()[:50],
+                email=f"parent{i}@example.com",
+                national_id=20_000_000 + i,
+                phone_number=710_000_000 + i,
+                gender="Female",
+                address=fake.city(),
+                occupation=fake.job()[:50],
+                password_hash="x",
+            )
+            for i in range(counts["parents"])
+        ]
+    )
+    children = _add(
+        [
+            Child(
+                fullname=fake.name(),
+                certificate_No=30_000_000 + i,
+                date_of_birth=past(5 * 365).replace(tzinfo=None),
+                gender=rng.choice(["Male", "Female"]),
+                parent_id=rng.choice(parents).parent_id,
+            )
+            for i in range(counts["children"])
+        ]
+    )
+    medicines = _add(
+        [
+            Medicine(
+                name=fake.unique.word().title(),
+                composition=fake.word(),
+                dosage=f"{rng.choice([250, 500, 1000])}mg",
+                indication=fake.sentence(),
+                side_effects=fake.words(3),
+            )
+            for _ in range(counts["medicines"])
+        ]
+    )
+    vaccines = _add(
+        [
+            Vaccine(
+                name=f"Vaccine {i}",
+                composition=fake.word(),
+                schedule=[f"{w} weeks" for w in (6, 10, 14)],
+                indication=fake.sentence(),
+                side_effects=fake.words(2),
+                info=fake.sentence(),
+            )
+            for i in range(counts["vaccines"])
+        ]
+    )
+    rooms = _add(
+        [
+            Room(
+                room_number=f"R{i}", capacity=counts["beds_per_room"], room_type="Ward"
+            )
+            for i in range(counts["rooms"])
+        ]
+    )
+    beds = _add(
+        [
+            Bed(
+                bed_number=f"{r.room_number}-B{i}",
+                bed_type="Standard",
+                room_id=r.room_id,
+            )
+            for r in rooms
+            for i in range(counts["beds_per_room"])
+        ]
+    )
+
+    _add(
+        [
+            Appointment(
+                parent_id=rng.choice(parents).parent_id,
+                provider_id=rng.choice(providers).provider_id,
+                reason=fake.sentence(nb_words=4),
+                appointment_date=now + timedelta(days=rng.randint(-180, 60)),
+                status=rng.choice(["pending", "pending", "approved", "missed"]),
+            )
+            for _ in range(counts["appointments"])
+        ]
+    )
+    prescriptions = _add(
+        [
+            Prescription(
+                parent_id=child.parent_id,
+                provider_id=rng.choice(providers).provider_id,
+                child_id=child.child_id,
+                medicine_id=rng.choice(medicines).medicine_id,
+                quantity=rng.randint(1, 30),
+                dosage="1x3",
+                duration=f"{rng.randint(3, 14)} days",
+                filled_date=past().replace(tzinfo=None),
+            )
+            for child in (rng.choice(children) for _ in range(counts["prescriptions"]))
+        ]
+    )
+    _add(
+        [
+            Record(
+                parent_id=child.parent_id,
+                child_id=child.child_id,
+                provider_id=rng.choice(providers).provider_id,
+                vaccine_id=rng.choice(vaccines).vaccine_id,
+            )
+            for child in (rng.choice(children) for _ in range(counts["records"]))
+        ]
+    )
+    _add(
+        [
+            LabTest(
+                test_name=fake.word(),
+                test_date=past().date(),
+                result=rng.choice(["Positive", "Negative"]),
+                remarks=fake.sentence(),
+                parent_id=child.parent_id,
+                child_id=child.child_id,
+                provider_id=rng.choice(providers).provider_id,
+            )
+            for child in (rng.choice(children) for _ in range(counts["lab_tests"]))
+        ]
+    )
+
+    admissions = []
+    for bed in beds[: counts["admissions"]]:
+        child = rng.choice(children)
+        bed.is_occupied = True
+        admissions.append(
+            Admission(
+                admission_date=past(30).replace(tzinfo=None),
+                parent_id=child.parent_id,
+                child_id=child.child_id,
+                provider_id=rng.choice(providers).provider_id,
+                reason_for_admission=fake.sentence(),
+                room_id=bed.room_id,
+                bed_id=bed.bed_id,
+            )
+        )
+    _add(admissions)
+    _add(
+        [
+            Discharge_summary(
+                admission_id=admission.admission_id,
+                admission_date=admission.admission_date,
+                discharge_date=admission.admission_date + timedelta(days=3),
+                discharge_diagnosis=fake.sentence(),
+                provider_id=admission.provider_id,
+                parent_id=admission.parent_id,
+                child_id=admission.child_id,
+            )
+            for admission in admissions[: max(1, len(admissions) // 2)]
+        ]
+    )
+
+    _add(
+        [
+            Document(
+                entityType="parent",
+                documentType=rng.choice(["Lab Report", "Scan", "Referral"]),
+                fileName=fake.file_name(extension="pdf"),
+                size=rng.randint(10_000, 2_000_000),
+                url=fake.url(),
+                parent_id=child.parent_id,
+                child_id=child.child_id,
+                provider_id=rng.choice(providers).provider_id,
+            )
+            for child in (rng.choice(children) for _ in range(counts["documents"]))
+        ]
+    )
+    conversations = _add(
+        [Conversation() for _ in range(max(1, counts["messages"] // 10))]
+    )
+    _add(
+        [
+            Message(
+                conversation_id=rng.choice(conversations).conversation_id,
+                message=fake.paragraph(),
+                parent_id=rng.choice(parents).parent_id,
+                provider_id=rng.choice(providers).provider_id,
+            )
+            for _ in range(counts["messages"])
+        ]
+    )
+    _add(
+        [
+            Payment(
+                parent_id=rng.choice(parents).parent_id,
+                amount=rng.randint(100, 10_000),
+                payment_method=rng.choice(["cash", "mpesa", "insurance"]),
+            )
+            for _ in range(counts["payments"])
+        ]
+    )
+    _add(
+        [
+            Medications(
+                name=rng.choice(medicines).name,
+                dose_in_mg=rng.choice([250, 500]),
+                provider_id=rng.choice(providers).provider_id,
+                parent_id=child.parent_id,
+                child_id=child.child_id,
+                medicine_id=rng.choice(medicines).medicine_id,
+                prescription_id=rng.choice(prescriptions).prescription_id,
+            )
+            for child in (rng.choice(children) for _ in range(counts["medications"]))
+        ]
+    )
+    _add(
+        [
+            Medical_info_parent(parent_id=parent.parent_id, twins="no", diabetes="no")
+            for parent in parents[: counts["pregnancies"]]
+        ]
+    )
+    _add(
+        [
+            Previous_pregnancy(
+                year=rng.randint(2010, 2023),
+                maturity="40 weeks",
+                duration_of_labour="8 hours",
+                type_of_delivery="SVD",
+                weight_in_kg=3,
+                gender=rng.choice(["Male", "Female"]),
+                fate="Alive",
+                puerperium="Normal",
+                parent_id=parent.parent_id,
+                provider_id=rng.choice(providers).provider_id,
+            )
+            for parent in parents[: counts["pregnancies"]]
+        ]
+    )
+    pregnancies = _add(
+        [
+            Present_pregnancy(
+                date=past(270).replace(tzinfo=None),
+                weight_in_kg=rng.randint(50, 90),
+                urinalysis="Normal",
+                blood_pressure="120/80",
+                pollar="Normal",
+                maturity_in_weeks=rng.randint(8, 40),
+                fundal_height=rng.randint(10, 40),
+                comments=fake.sentence(),
+                clinical_notes=fake.sentence(),
+                parent_id=parent.parent_id,
+                provider_id=rng.choice(providers).provider_id,
+            )
+            for parent in parents[: counts["pregnancies"]]
+        ]
+    )
+    deliveries = _add(
+        [
+            Delivery(
+                mode_of_delivery="SVD",
+                date=past(90).replace(tzinfo=None),
+                duration_of_labour="8 hours",
+                condition_of_mother="Stable",
+                condition_of_baby="Stable",
+                weight_at_birth="3.2",
+                gender=rng.choice(["Male", "Female"]),
+                fate="Alive",
+                type_of_birth=1,
+                parent_id=pregnancy.parent_id,
+                provider_id=pregnancy.provider_id,
+                present_pregnancy_id=pregnancy.pp_id,
+            )
+            for pregnancy in pregnancies[: counts["deliveries"]]
+        ]
+    )
+    serial_numbers = allocate_serial_numbers(len(deliveries))
+    _add(
+        [
+            Birth(
+                delivery_id=delivery.delivery_id,
+                baby_name=fake.first_name(),
+                date_of_birth=delivery.date,
+                place_of_birth="Happy Hearts",
+                sub_county=fake.city(),
+                serial_number=serial_numbers[i],
+                weight=delivery.weight_at_birth,
+                gender=delivery.gender,
+                fate=delivery.fate,
+                mother_full_name=fake.name_female(),
+                mother_national_id=str(20_000_000 + i),
+                type_of_birth="Single",
+                parent_id=delivery.parent_id,
+                provider_id=delivery.provider_id,
+            )
+            for i, delivery in enumerate(deliveries)
+        ]
+    )
+    db.session.commit()
+
+    return {
+        mapper.local_table.name: db.session.query(mapper.class_).count()
+        for mapper in db.Model.registry.mappers
+    }
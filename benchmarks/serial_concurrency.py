@@ -0,0 +1,124 @@
+"""Allocates birth serial numbers from many threads at once and checks that
+no number is handed out twice.
+
+Run from the project root:
+
+    python -m benchmarks.serial_concurrency [--threads 16] [--rounds 25]
+
+Each round allocates one to three numbers (a multiple birth), inserts the
+births and commits. --legacy uses the old max(serial_number) + 1 lookup
+instead, which is expected to fail. Exits non-zero on any duplicate or
+unique-constraint violation. Uses the same database setup as
+benchmarks.endpoints (BENCH_DATABASE_URI, dropped and reseeded).
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+from collections import Counter
+
+os.environ["DATABASE_URI"] = os.environ.get(
+    "BENCH_DATABASE_URI",
+    "sqlite:///" + os.path.join(tempfile.gettempdir(), "happyhearts_bench.db"),
+)
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from sqlalchemy.exc import IntegrityError  # noqa: E402
+
+import app as _routes  # noqa: E402,F401
+from benchmarks.seed import seed  # noqa: E402
+from config import app, db  # noqa: E402
+from models import Birth, Delivery  # noqa: E402
+from utils.customs import allocate_serial_numbers  # noqa: E402
+
+
+def legacy_serial_numbers(count):
+    # What DeliveryAPI.post used to do for each baby
+    serials = []
+    for _ in range(count):
+        latest = db.session.query(Birth).order_by(Birth.serial_number.desc()).first()
+        serials.append(latest.serial_number + 1 if latest else 4953636)
+    return serials
+
+
+def worker(allocate, delivery, rounds, seed_value, issued, errors):
+    rng = random.Random(seed_value)
+    with app.app_context():
+        for _ in range(rounds):
+            try:
+                serials = allocate(rng.randint(1, 3))
+                db.session.add_all(
+                    Birth(
+                        delivery_id=delivery["delivery_id"],
+                        baby_name="Baby",
+                        date_of_birth=delivery["date"],
+                        place_of_birth="Happy Hearts",
+                        sub_county="Nairobi",
+                        serial_number=serial,
+                        weight="3.2",
+                        gender="Female",
+                        fate="Alive",
+                        mother_full_name="Mother",
+                        mother_national_id="1",
+                        type_of_birth="Single",
+                        parent_id=delivery["parent_id"],
+                        provider_id=delivery["provider_id"],
+                    )
+                    for serial in serials
+                )
+                db.session.commit()
+                issued.extend(serials)
+            except IntegrityError as e:
+                db.session.rollback()
+                errors.append(str(e.orig))
+        db.session.remove()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--rounds", type=int, default=25)
+    parser.add_argument("--legacy", action="store_true")
+    args = parser.parse_args(argv)
+
+    with app.app_context():
+        print("Seeding database...", file=sys.stderr)
+        seed(0.05)
+        row = db.session.query(Delivery).first()
+        delivery = {
+            "delivery_id": row.delivery_id,
+            "date": row.date,
+            "parent_id": row.parent_id,
+            "provider_id": row.provider_id,
+        }
+        db.session.remove()
+
+    allocate = legacy_serial_numbers if args.legacy else allocate_serial_numbers
+    issued = []
+    errors = []
+    threads = [
+        threading.Thread(
+            target=worker, args=(allocate, delivery, args.rounds, i, issued, errors)
+        )
+        for i in range(args.threads)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    duplicates = {n: c for n, c in Counter(issued).items() if c > 1}
+    print(
+        f"{len(issued)} serial numbers committed by {args.threads} threads, "
+        f"{len(duplicates)} duplicated, {len(errors)} unique-constraint failures"
+    )
+    if errors:
+        print(f"first failure: {errors[0]}")
+    return 1 if duplicates or errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
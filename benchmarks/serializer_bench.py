@@ -0,0 +1,97 @@
+"""Compares SerializerMixin.to_dict() with the compiled serializers.
+
+Run from the project root:
+
+    python -m benchmarks.serializer_bench [rows]
+"""
+
+import os
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+os.environ.setdefault("DATABASE_URI", "sqlite://")
+
+from config import app  # noqa: E402
+from models import (  # noqa: E402
+    Appointment,
+    Child,
+    Medicine,
+    Parent,
+    Prescription,
+    Provider,
+)
+from utils.serializers import compile_all, serializer_for  # noqa: E402
+
+
+def build_rows(count):
+    parent = Parent(
+        parent_id=1, name="Jane Doe", email="jane@example.com", national_id=1234
+    )
+    provider = Provider(
+        provider_id=1, name="Dr. Otieno", email="otieno@example.com", national_id=99
+    )
+    child = Child(child_id=1, fullname="Baby Doe", certificate_No=4321)
+    medicine = Medicine(medicine_id=1, name="Paracetamol")
+    now = datetime.now()
+
+    appointments = [
+        Appointment(
+            appointment_id=i,
+            parent_id=1,
+            provider_id=1,
+            parent=parent,
+            provider=provider,
+            reason="Antenatal visit",
+            appointment_date=now + timedelta(days=i),
+            timestamp=now,
+            status="pending",
+        )
+        for i in range(count)
+    ]
+    prescriptions = [
+        Prescription(
+            prescription_id=i,
+            parent=parent,
+            provider=provider,
+            child=child,
+            medicine=medicine,
+            quantity=10,
+            dosage="500mg",
+            duration="5 days",
+            refill_count=0,
+            filled_date=now,
+            expiry_date=now,
+            timestamp=now,
+        )
+        for i in range(count)
+    ]
+    return {"Appointment": appointments, "Prescription": prescriptions}
+
+
+def main(count=5000, repeat=5):
+    with app.app_context():
+        compile_all()
+        for name, rows in build_rows(count).items():
+            serialize = serializer_for(type(rows[0]))
+            sample = rows[:10]
+            assert [r.to_dict() for r in sample] == [serialize(r) for r in sample]
+
+            to_dict = min(
+                timeit.repeat(
+                    lambda: [r.to_dict() for r in rows], number=1, repeat=repeat
+                )
+            )
+            compiled = min(
+                timeit.repeat(
+                    lambda: [serialize(r) for r in rows], number=1, repeat=repeat
+                )
+            )
+            print(
+                f"{name:<14} rows={count:<7} to_dict={to_dict * 1000:8.1f}ms "
+                f"compiled={compiled * 1000:8.1f}ms speedup={to_dict / compiled:5.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
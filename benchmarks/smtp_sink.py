@@ -0,0 +1,190 @@
+"""A local SMTP server that accepts and counts mail instead of delivering
+it, standing in for smtp.googlemail.com in benchmarks and manual tests.
+
+    python -m benchmarks.smtp_sink [--port 2525] [--connect-latency 0.5]
+
+then point the app at it with MAIL_SERVER=127.0.0.1 MAIL_PORT=2525
+MAIL_USE_TLS=False. It speaks just enough ESMTP for smtplib (EHLO, AUTH
+PLAIN, MAIL, RCPT, DATA, RSET, NOOP, QUIT) and can be made slow or flaky:
+--connect-latency delays the greeting like a TLS handshake and login,
+--message-latency delays each DATA reply, --failure-rate answers DATA with
+a temporary 451 error and --disconnect-rate drops the connection instead of
+answering. A message counts as delivered only once it got its 250.
+"""
+
+import argparse
+import random
+import socketserver
+import sys
+import threading
+import time
+from collections import Counter
+
+
+class SMTPSink:
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=0,
+        connect_latency=0.0,
+        message_latency=0.0,
+        failure_rate=0.0,
+        disconnect_rate=0.0,
+        header="X-Outbox-Id",
+        seed_value=None,
+    ):
+        self.connect_latency = connect_latency
+        self.message_latency = message_latency
+        self.failure_rate = failure_rate
+        self.disconnect_rate = disconnect_rate
+        self.header = header.lower()
+        self._random = random.Random(seed_value)
+        self._lock = threading.Lock()
+        self.reset()
+
+        sink = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                sink._session(self.rfile, self.wfile)
+
+        self.server = socketserver.ThreadingTCPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.host, self.port = self.server.server_address[:2]
+        self._thread = None
+
+    def reset(self):
+        with self._lock:
+            self.connections = 0
+            self.delivered = 0
+            self.rejected = 0
+            self.dropped = 0
+            # Header value (e.g. outbox id) -> times delivered
+            self.ids = Counter()
+            self.recipients = Counter()
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self.server.serve_forever, name="smtp-sink", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _roll(self, rate):
+        with self._lock:
+            return rate and self._random.random() < rate
+
+    def _session(self, rfile, wfile):
+        def reply(line):
+            wfile.write(line.encode() + b"\r\n")
+            wfile.flush()
+
+        with self._lock:
+            self.connections += 1
+        time.sleep(self.connect_latency)
+        reply("220 smtp-sink ESMTP ready")
+        recipients = []
+        while True:
+            line = rfile.readline()
+            if not line:
+                return
+            command = line.decode("utf-8", "replace").strip()
+            verb = command.split(" ", 1)[0].upper()
+            if verb == "EHLO":
+                reply("250-smtp-sink")
+                reply("250-AUTH PLAIN")
+                reply("250 8BITMIME")
+            elif verb == "HELO":
+                reply("250 smtp-sink")
+            elif verb == "AUTH":
+                reply("235 2.7.0 Authentication successful")
+            elif verb == "MAIL":
+                recipients = []
+                reply("250 2.1.0 OK")
+            elif verb == "RCPT":
+                recipients.append(command.split(":", 1)[-1].strip(" <>"))
+                reply("250 2.1.5 OK")
+            elif verb == "DATA":
+                reply("354 End data with <CR><LF>.<CR><LF>")
+                message_id = None
+                while True:
+                    data = rfile.readline()
+                    if not data or data == b".\r\n":
+                        break
+                    name, _, value = data.decode("utf-8", "replace").partition(":")
+                    if message_id is None and name.strip().lower() == self.header:
+                        message_id = value.strip()
+                time.sleep(self.message_latency)
+                if self._roll(self.disconnect_rate):
+                    with self._lock:
+                        self.dropped += 1
+                    return
+                if self._roll(self.failure_rate):
+                    with self._lock:
+                        self.rejected += 1
+                    reply("451 4.3.0 Temporary failure, try again later")
+                    continue
+                with self._lock:
+                    self.delivered += 1
+                    if message_id is not None:
+                        self.ids[message_id] += 1
+                    self.recipients.update(recipients)
+                reply("250 2.0.0 Queued")
+            elif verb in ("RSET", "NOOP"):
+                reply("250 2.0.0 OK")
+            elif verb == "QUIT":
+                reply("221 2.0.0 Bye")
+                return
+            else:
+                reply("502 5.5.2 Command not implemented")
+
+    def summary(self):
+        with self._lock:
+            return {
+                "connections": self.connections,
+                "delivered": self.delivered,
+                "rejected": self.rejected,
+                "dropped": self.dropped,
+            }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=2525)
+    parser.add_argument("--connect-latency", type=float, default=0.0)
+    parser.add_argument("--message-latency", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--disconnect-rate", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    sink = SMTPSink(
+        args.host,
+        args.port,
+        connect_latency=args.connect_latency,
+        message_latency=args.message_latency,
+        failure_rate=args.failure_rate,
+        disconnect_rate=args.disconnect_rate,
+    ).start()
+    print(f"Accepting mail on {sink.host}:{sink.port}, Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(10)
+            print(sink.summary(), file=sys.stderr)
+    except KeyboardInterrupt:
+        sink.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -14,6 +14,10 @@ from datetime import timedelta
 
 import cloudinary
 
+from utils import db_routing, slow_queries, sql_metrics
+from utils.db_pool import configure_engine, engine_options
+from utils.json_provider import FastJSONProvider, output_json
+
 load_dotenv()
 
 app = Flask(__name__)
@@ -21,15 +25,22 @@ app = Flask(__name__)
 app.secret_key = os.environ.get("SECRET_KEY")
 app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get("DATABASE_URI")
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options(
+    app.config["SQLALCHEMY_DATABASE_URI"]
+)
+app.config["SQLALCHEMY_BINDS"] = db_routing.replica_binds(
+    os.environ.get("DATABASE_REPLICA_URI")
+)
 app.config["JWT_ACCESS_TOKEN_EXPIRES"] = timedelta(weeks=5215)
 app.config["JWT_SECRET_KEY"] = os.environ.get("SECRET_KEY")
-app.config["MAIL_SERVER"] = "smtp.googlemail.com"
-app.config["MAIL_PORT"] = 587
+app.config["MAIL_SERVER"] = os.getenv("MAIL_SERVER", "smtp.googlemail.com")
+app.config["MAIL_PORT"] = int(os.getenv("MAIL_PORT", 587))
 app.config["MAIL_USERNAME"] = os.getenv("MAIL_USERNAME")
 app.config["MAIL_PASSWORD"] = os.getenv("MAIL_PASSWORD")
-app.config["MAIL_USE_TLS"] = True
-app.config["MAIL_USE_SSL"] = False
-app.json.compact = False
+app.config["MAIL_USE_TLS"] = os.getenv("MAIL_USE_TLS", "True").lower() == "true"
+app.config["MAIL_USE_SSL"] = os.getenv("MAIL_USE_SSL", "False").lower() == "true"
+app.config["MAIL_DEFAULT_SENDER"] = os.getenv("MAIL_USERNAME")
+app.json = FastJSONProvider(app)
 cloudinary.config(
     cloud_name=os.getenv("CLOUDINARY_CLOUD_NAME"),
     api_key=os.getenv("CLOUDINARY_API_KEY"),
@@ -39,18 +50,28 @@ cloudinary.config(
 metadata = MetaData(
     naming_convention={
         "fk": "fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s",
+        "ix": "ix_%(column_0_label)s",
     }
 )
 
-db = SQLAlchemy(metadata=metadata)
+db = SQLAlchemy(
+    metadata=metadata, session_options={"class_": db_routing.RoutingSession}
+)
 db.init_app(app)
+with app.app_context():
+    for engine in db.engines.values():
+        configure_engine(engine)
+db_routing.init_app(app)
+sql_metrics.init_app(app)
+slow_queries.init_app(app)
 
 jwt = JWTManager()
 jwt.init_app(app)
 
 api = Api(app)
+api.representation("application/json")(output_json)
 migrate = Migrate(app, db)
-CORS(app)
+CORS(app, expose_headers=[db_routing.PRIMARY_HEADER])
 
 mail = Mail(app)
 scheduler = BackgroundScheduler()
@@ -1,5 +1,5 @@
-from models import Medicine
-from config import db, app
+from config import app
+from utils.catalog_import import import_catalog
 
 data = [
     {
@@ -146,16 +146,8 @@ data = [
 
 
 def medicine_generator():
-    for data_item in data:
-        medicine = Medicine(
-            name=data_item["name"],
-            composition=data_item["composition"],
-            indication=data_item["indication"],
-            side_effects=", ".join(data_item["side_effects"]),
-            dosage=data_item["dosage"],
-        )
-        db.session.add(medicine)
-    db.session.commit()
+    # Upserts by name, so running this again only applies edits to data
+    print(import_catalog("medicines", data))
 
 
 with app.app_context():
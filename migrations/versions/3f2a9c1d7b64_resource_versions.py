@@ -0,0 +1,31 @@
+"""resource versions
+
+Revision ID: 3f2a9c1d7b64
+Revises: 649b7cec00f8
+Create Date: 2026-10-18 10:12:41.530184
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "3f2a9c1d7b64"
+down_revision = "649b7cec00f8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "resource_versions",
+        sa.Column("table_name", sa.String(), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("table_name"),
+    )
+
+
+def downgrade():
+    op.drop_table("resource_versions")
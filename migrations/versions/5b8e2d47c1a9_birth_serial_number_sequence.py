@@ -0,0 +1,47 @@
+"""birth serial number sequence
+
+Revision ID: 5b8e2d47c1a9
+Revises: c5e0b7d21f48
+Create Date: 2026-10-18 15:03:12.651840
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "5b8e2d47c1a9"
+down_revision = "c5e0b7d21f48"
+branch_labels = None
+depends_on = None
+
+FIRST_BIRTH_SERIAL_NUMBER = 4953636
+
+
+def upgrade():
+    counters = op.create_table(
+        "serial_counters",
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("next_value", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+
+    # Carry on after the births already issued by generate_serial_number
+    bind = op.get_bind()
+    latest = bind.execute(sa.text("SELECT MAX(serial_number) FROM births")).scalar()
+    start = max(FIRST_BIRTH_SERIAL_NUMBER, (latest or 0) + 1)
+    if bind.dialect.supports_sequences:
+        op.execute(
+            sa.schema.CreateSequence(
+                sa.Sequence("birth_serial_number_seq", start=start)
+            )
+        )
+    else:
+        op.bulk_insert(counters, [{"name": "births", "next_value": start}])
+
+
+def downgrade():
+    if op.get_bind().dialect.supports_sequences:
+        op.execute(sa.schema.DropSequence(sa.Sequence("birth_serial_number_seq")))
+    op.drop_table("serial_counters")
@@ -0,0 +1,52 @@
+"""unique medicine and vaccine names
+
+Revision ID: 9e4c1f7a2d36
+Revises: 5b8e2d47c1a9
+Create Date: 2026-10-18 16:12:40.318204
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "9e4c1f7a2d36"
+down_revision = "5b8e2d47c1a9"
+branch_labels = None
+depends_on = None
+
+# table: (primary key, [(referencing table, foreign key column)])
+CATALOGS = {
+    "medicines": (
+        "medicine_id",
+        [("prescriptions", "medicine_id"), ("discharge_medications", "medicine_id")],
+    ),
+    "vaccines": ("vaccine_id", [("vacination_records", "vaccine_id")]),
+}
+
+
+def upgrade():
+    # Running medicine_generator.py/vaccine_generator.py twice duplicated the
+    # catalog; keep the oldest row of each name and point references at it
+    for table, (pk, references) in CATALOGS.items():
+        keeper = (
+            f"SELECT MIN(k.{pk}) FROM {table} k WHERE k.name = "
+            f"(SELECT d.name FROM {table} d WHERE d.{pk} = {{ref}}.{{fk}})"
+        )
+        for ref, fk in references:
+            op.execute(
+                f"UPDATE {ref} SET {fk} = ({keeper.format(ref=ref, fk=fk)}) "
+                f"WHERE {fk} IS NOT NULL AND {fk} NOT IN "
+                f"(SELECT MIN({pk}) FROM {table} GROUP BY name)"
+            )
+        op.execute(
+            f"DELETE FROM {table} WHERE {pk} NOT IN "
+            f"(SELECT MIN({pk}) FROM {table} GROUP BY name)"
+        )
+        op.create_index(f"ix_{table}_name", table, ["name"], unique=True)
+
+
+def downgrade():
+    for table in CATALOGS:
+        op.drop_index(f"ix_{table}_name", table_name=table)
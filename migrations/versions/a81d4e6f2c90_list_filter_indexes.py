@@ -0,0 +1,49 @@
+"""indexes for list endpoint filters and sorts
+
+Revision ID: a81d4e6f2c90
+Revises: 3f2a9c1d7b64
+Create Date: 2026-10-18 11:02:17.384226
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "a81d4e6f2c90"
+down_revision = "3f2a9c1d7b64"
+branch_labels = None
+depends_on = None
+
+# Columns named in each model's filter_fields/date_field/sort_fields
+INDEXES = {
+    "appointments": ["status", "parent_id", "provider_id", "appointment_date"],
+    "admissions": [
+        "parent_id",
+        "provider_id",
+        "room_id",
+        "is_discharged",
+        "admission_date",
+    ],
+    "lab_tests": ["parent_id", "provider_id", "child_id", "test_date"],
+    "prescriptions": [
+        "parent_id",
+        "provider_id",
+        "child_id",
+        "medicine_id",
+        "filled_date",
+    ],
+}
+
+
+def upgrade():
+    for table, columns in INDEXES.items():
+        for column in columns:
+            op.create_index(f"ix_{table}_{column}", table, [column], unique=False)
+
+
+def downgrade():
+    for table, columns in INDEXES.items():
+        for column in reversed(columns):
+            op.drop_index(f"ix_{table}_{column}", table_name=table)
@@ -0,0 +1,96 @@
+"""indexes on foreign keys and hot predicates
+
+Revision ID: c5e0b7d21f48
+Revises: a81d4e6f2c90
+Create Date: 2026-10-18 14:21:43.902117
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "c5e0b7d21f48"
+down_revision = "a81d4e6f2c90"
+branch_labels = None
+depends_on = None
+
+# Every foreign key column that wasn't already indexed, so joins and
+# ON DELETE checks stop scanning the child table
+FOREIGN_KEYS = {
+    "children": ["parent_id"],
+    "messages": ["conversation_id", "parent_id", "provider_id", "user_id"],
+    "parents_medical_info": ["parent_id"],
+    "payments": ["parent_id"],
+    "present_pregnancies": ["parent_id", "provider_id"],
+    "resetokens": ["parent_id", "provider_id", "user_id"],
+    "admissions": ["bed_id", "child_id"],
+    "deliveries": ["parent_id", "present_pregnancy_id", "provider_id"],
+    "documents": ["child_id", "parent_id", "provider_id"],
+    "vacination_records": ["child_id", "parent_id", "provider_id", "vaccine_id"],
+    "births": ["delivery_id", "parent_id", "provider_id"],
+    "discharge_medications": [
+        "child_id",
+        "medicine_id",
+        "parent_id",
+        "prescription_id",
+        "provider_id",
+    ],
+    "discharge_summaries": ["admission_id", "child_id", "parent_id", "provider_id"],
+    "previous_pregnancies": ["delivery_id", "parent_id", "provider_id"],
+}
+
+# Multi-column indexes for the predicates the scheduler and the room/bed and
+# pregnancy endpoints filter on
+COMPOSITES = [
+    (
+        "ix_appointments_status_appointment_date",
+        "appointments",
+        ["status", "appointment_date"],
+    ),
+    ("ix_beds_room_id_is_occupied", "beds", ["room_id", "is_occupied"]),
+    ("ix_rooms_status_room_id", "rooms", ["status", "room_id"]),
+    (
+        "ix_present_pregnancies_is_delivered_pp_id",
+        "present_pregnancies",
+        ["is_delivered", "pp_id"],
+    ),
+]
+
+
+def _indexes():
+    for table, columns in FOREIGN_KEYS.items():
+        for column in columns:
+            yield f"ix_{table}_{column}", table, [column]
+    yield from COMPOSITES
+
+
+# CREATE/DROP INDEX CONCURRENTLY can't run inside a transaction, so on
+# Postgres each statement gets its own autocommit block and writers are
+# never locked out of the table. Other dialects ignore the flag.
+def upgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns in _indexes():
+            op.create_index(
+                name, table, columns, unique=False, postgresql_concurrently=True
+            )
+        # Superseded by ix_appointments_status_appointment_date
+        op.drop_index(
+            "ix_appointments_status",
+            table_name="appointments",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_appointments_status",
+            "appointments",
+            ["status"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        for name, table, _ in reversed(list(_indexes())):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
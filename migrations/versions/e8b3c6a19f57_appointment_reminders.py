@@ -0,0 +1,27 @@
+"""appointment reminders
+
+Revision ID: e8b3c6a19f57
+Revises: d2a7f3b85e14
+Create Date: 2026-10-18 19:08:44.902137
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "e8b3c6a19f57"
+down_revision = "d2a7f3b85e14"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("appointments", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("last_reminder_lead", sa.Integer(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table("appointments", schema=None) as batch_op:
+        batch_op.drop_column("last_reminder_lead")
@@ -31,22 +31,39 @@ class Appointment(db.Model, SerializerMixin):
         "-parent.appointments",
         "-provider.appointments",
     )
+    # Fields read by the `info` hybrid, so list queries can eager-load them
+    serialize_depends = {"info": ("parent.name", "provider.name")}
+    # Query parameters accepted by list endpoints, see utils.filters
+    filter_fields = ("status", "parent_id", "provider_id")
+    date_field = "appointment_date"
+    sort_fields = ("appointment_date",)
+    # Leads with status for update_appointment_statuses' pending-and-past scan
+    __table_args__ = (
+        db.Index(
+            "ix_appointments_status_appointment_date", "status", "appointment_date"
+        ),
+    )
 
     appointment_id = db.Column(db.Integer, primary_key=True)
     parent_id = db.Column(
-        db.Integer, db.ForeignKey("parents.parent_id"), nullable=False
+        db.Integer, db.ForeignKey("parents.parent_id"), nullable=False, index=True
     )
     provider_id = db.Column(
-        db.Integer, db.ForeignKey("providers.provider_id"), nullable=False
+        db.Integer, db.ForeignKey("providers.provider_id"), nullable=False, index=True
     )
     reason = db.Column(db.String, nullable=False)
 
-    appointment_date = db.Column(db.DateTime(timezone=True), nullable=False)
+    appointment_date = db.Column(
+        db.DateTime(timezone=True), nullable=False, index=True
+    )
     timestamp = db.Column(
         db.DateTime(timezone=True), nullable=False, default=current_eat_time
     )
 
     status = db.Column(db.String, nullable=True, default="pending")
+    # Lead in seconds of the last reminder utils.reminders sent, so each is
+    # sent once; cleared when the appointment is rescheduled
+    last_reminder_lead = db.Column(db.Integer, nullable=True)
 
     parent = db.relationship("Parent", back_populates="appointments")
     provider = db.relationship("Provider", back_populates="appointments")
@@ -43,7 +43,7 @@ class Child(db.Model, SerializerMixin):
     age = db.Column(db.String, nullable=True)
     gender = db.Column(db.String, nullable=False)
     parent_id = db.Column(
-        db.Integer, db.ForeignKey("parents.parent_id"), nullable=False
+        db.Integer, db.ForeignKey("parents.parent_id"), nullable=False, index=True
     )
 
     timestamp = db.Column(db.DateTime, nullable=False, default=current_eat_time)
@@ -86,15 +86,17 @@ class Record(db.Model, SerializerMixin):
     )
     record_id = db.Column(db.Integer, primary_key=True)
     parent_id = db.Column(
-        db.Integer, db.ForeignKey("parents.parent_id"), nullable=False
+        db.Integer, db.ForeignKey("parents.parent_id"), nullable=False, index=True
     )
     vaccine_id = db.Column(
-        db.Integer, db.ForeignKey("vaccines.vaccine_id"), nullable=False
+        db.Integer, db.ForeignKey("vaccines.vaccine_id"), nullable=False, index=True
     )
     provider_id = db.Column(
-        db.String, db.ForeignKey("providers.provider_id"), nullable=False
+        db.String, db.ForeignKey("providers.provider_id"), nullable=False, index=True
+    )
+    child_id = db.Column(
+        db.Integer, db.ForeignKey("children.child_id"), nullable=True, index=True
     )
-    child_id = db.Column(db.Integer, db.ForeignKey("children.child_id"), nullable=True)
     timestamp = db.Column(db.DateTime, nullable=False, default=current_eat_time)
 
     parent = db.relationship("Parent", back_populates="vaccination_records")
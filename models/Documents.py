@@ -31,12 +31,17 @@ class Document(db.Model, SerializerMixin):
     size = db.Column(db.Integer, nullable=False)
     url = db.Column(db.String, nullable=False)
     parent_id = db.Column(
-        db.Integer, db.ForeignKey("parents.parent_id"), nullable=True  # Nullable parent
+        db.Integer,
+        db.ForeignKey("parents.parent_id"),
+        nullable=True,  # Nullable parent
+        index=True,
     )
     provider_id = db.Column(
-        db.Integer, db.ForeignKey("providers.provider_id"), nullable=True
+        db.Integer, db.ForeignKey("providers.provider_id"), nullable=True, index=True
+    )
+    child_id = db.Column(
+        db.Integer, db.ForeignKey("children.child_id"), nullable=True, index=True
     )
-    child_id = db.Column(db.Integer, db.ForeignKey("children.child_id"), nullable=True)
     timestamp = db.Column(db.DateTime, nullable=False, default=current_eat_time)
     parent = db.relationship("Parent", back_populates="documents", lazy=True)
 
@@ -0,0 +1,26 @@
+from config import db
+from datetime import datetime
+
+
+class EmailOutbox(db.Model):
+    # Outgoing mail, written in the same transaction as the change it reports
+    # and sent later by utils.outbox's workers
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        # The workers' "due now" scan
+        db.Index("ix_email_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+    outbox_id = db.Column(db.Integer, primary_key=True)
+    recipient = db.Column(db.String, nullable=False)
+    subject = db.Column(db.String, nullable=False)
+    html = db.Column(db.Text, nullable=False)
+    # pending -> sending -> sent, or back to pending with a later
+    # next_attempt_at until attempts run out and it is failed
+    status = db.Column(db.String, nullable=False, default="pending")
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    # A worker that dies mid-send leaves its claim to expire at this time
+    locked_until = db.Column(db.DateTime, nullable=True)
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime, nullable=True)
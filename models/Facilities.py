@@ -27,6 +27,10 @@ class Bed(db.Model, SerializerMixin):
         "room.room_number",
     )
     serialize_rules = ("-room.beds", "-admission.bed")
+    # Also serves the room_id foreign key and AvailableBedsForRoom's lookup
+    __table_args__ = (
+        db.Index("ix_beds_room_id_is_occupied", "room_id", "is_occupied"),
+    )
 
     bed_id = db.Column(db.Integer, primary_key=True)
     bed_number = db.Column(db.String, nullable=False, unique=True)
@@ -52,6 +56,8 @@ class Room(db.Model, SerializerMixin):
         "notes",
     )
     serialize_rules = ("-admissions.room",)
+    # AvailableRooms filters on status and pages in room_id order
+    __table_args__ = (db.Index("ix_rooms_status_room_id", "status", "room_id"),)
 
     room_id = db.Column(db.Integer, primary_key=True)
     room_number = db.Column(db.String, unique=True, nullable=False)
@@ -27,18 +27,27 @@ class LabTest(db.Model, SerializerMixin):
         "child.certificate_No",
     )
     serialize_rules = ("-parent.lab_tests", "-child.lab_tests")
+    # Query parameters accepted by list endpoints, see utils.filters
+    filter_fields = ("parent_id", "provider_id", "child_id")
+    date_field = "test_date"
+    sort_fields = ("test_date",)
+
     lab_test_id = db.Column(db.Integer, primary_key=True)
     test_name = db.Column(db.String(255), nullable=False)
-    test_date = db.Column(db.Date, nullable=False)
+    test_date = db.Column(db.Date, nullable=False, index=True)
     result = db.Column(db.String(255), nullable=False)
     remarks = db.Column(db.String(255))
     timestamp = db.Column(db.DateTime, nullable=False, default=current_eat_time)
 
     # Foreign key to either parent or child
-    parent_id = db.Column(db.Integer, db.ForeignKey("parents.parent_id"), nullable=True)
-    child_id = db.Column(db.Integer, db.ForeignKey("children.child_id"), nullable=True)
+    parent_id = db.Column(
+        db.Integer, db.ForeignKey("parents.parent_id"), nullable=True, index=True
+    )
+    child_id = db.Column(
+        db.Integer, db.ForeignKey("children.child_id"), nullable=True, index=True
+    )
     provider_id = db.Column(
-        db.Integer, db.ForeignKey("providers.provider_id"), nullable=True
+        db.Integer, db.ForeignKey("providers.provider_id"), nullable=True, index=True
     )
 
     parent = db.relationship("Parent", back_populates="lab_tests", lazy=True)
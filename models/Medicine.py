@@ -42,7 +42,7 @@ class Medicine(db.Model, SerializerMixin):
     )  # Hide prescriptions from serialization if not needed
 
     medicine_id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String, nullable=False)
+    name = db.Column(db.String, nullable=False, unique=True, index=True)
     composition = db.Column(db.String, nullable=False)
     dosage = db.Column(db.String, nullable=False)
     indication = db.Column(db.String, nullable=False)
@@ -22,7 +22,6 @@ class Message(db.Model, SerializerMixin):
         "parent_id",
         "provider_id",
         "is_read",
-        "is_viwed",
         "is_replied",
         "conversation_id",
         "timestamp",
@@ -30,7 +29,10 @@ class Message(db.Model, SerializerMixin):
 
     message_id = db.Column(db.Integer, primary_key=True)
     conversation_id = db.Column(
-        db.Integer, db.ForeignKey("conversations.conversation_id"), nullable=False
+        db.Integer,
+        db.ForeignKey("conversations.conversation_id"),
+        nullable=False,
+        index=True,
     )
     name = db.Column(db.String, nullable=True)
     email = db.Column(db.String, nullable=True)
@@ -39,10 +41,14 @@ class Message(db.Model, SerializerMixin):
     is_replied = db.Column(db.Boolean, nullable=True, default=False)
     original_message_id = db.Column(db.Integer, nullable=True)
 
-    user_id = db.Column(db.Integer, db.ForeignKey("users.user_id"), nullable=True)
-    parent_id = db.Column(db.Integer, db.ForeignKey("parents.parent_id"), nullable=True)
+    user_id = db.Column(
+        db.Integer, db.ForeignKey("users.user_id"), nullable=True, index=True
+    )
+    parent_id = db.Column(
+        db.Integer, db.ForeignKey("parents.parent_id"), nullable=True, index=True
+    )
     provider_id = db.Column(
-        db.Integer, db.ForeignKey("providers.provider_id"), nullable=True
+        db.Integer, db.ForeignKey("providers.provider_id"), nullable=True, index=True
     )
 
     timestamp = db.Column(db.DateTime, nullable=False, default=current_eat_time)
@@ -179,10 +179,12 @@ class Delivery(db.Model, SerializerMixin):
     remarks = db.Column(db.String, nullable=True)
     type_of_birth = db.Column(db.Integer, nullable=False)
 
-    provider_id = db.Column(db.Integer, db.ForeignKey("providers.provider_id"))
-    parent_id = db.Column(db.Integer, db.ForeignKey("parents.parent_id"))
+    provider_id = db.Column(
+        db.Integer, db.ForeignKey("providers.provider_id"), index=True
+    )
+    parent_id = db.Column(db.Integer, db.ForeignKey("parents.parent_id"), index=True)
     present_pregnancy_id = db.Column(
-        db.Integer, db.ForeignKey("present_pregnancies.pp_id")
+        db.Integer, db.ForeignKey("present_pregnancies.pp_id"), index=True
     )
     timestamp = db.Column(db.DateTime, nullable=False, default=current_eat_time)
 
@@ -220,19 +222,31 @@ class Admission(db.Model, SerializerMixin):
         "-parent.admissions",
         "-child.admissions",
     )
+    # Query parameters accepted by list endpoints, see utils.filters
+    filter_fields = ("parent_id", "provider_id", "room_id", "is_discharged")
+    date_field = "admission_date"
+    sort_fields = ("admission_date",)
 
     admission_id = db.Column(db.Integer, primary_key=True)
-    admission_date = db.Column(db.DateTime, nullable=False)
-    parent_id = db.Column(db.Integer, db.ForeignKey("parents.parent_id"))
-    provider_id = db.Column(db.Integer, db.ForeignKey("providers.provider_id"))
-    child_id = db.Column(db.Integer, db.ForeignKey("children.child_id"), nullable=True)
+    admission_date = db.Column(db.DateTime, nullable=False, index=True)
+    parent_id = db.Column(db.Integer, db.ForeignKey("parents.parent_id"), index=True)
+    provider_id = db.Column(
+        db.Integer, db.ForeignKey("providers.provider_id"), index=True
+    )
+    child_id = db.Column(
+        db.Integer, db.ForeignKey("children.child_id"), nullable=True, index=True
+    )
     reason_for_admission = db.Column(db.String, nullable=False)
     general_assessment = db.Column(db.String, nullable=True)
     initial_treatment_plan = db.Column(db.String, nullable=True)
     insurance_details = db.Column(db.String, nullable=True)
-    room_id = db.Column(db.Integer, db.ForeignKey("rooms.room_id"), nullable=False)
-    bed_id = db.Column(db.Integer, db.ForeignKey("beds.bed_id"), nullable=False)
-    is_discharged = db.Column(db.Boolean, nullable=False, default=False)
+    room_id = db.Column(
+        db.Integer, db.ForeignKey("rooms.room_id"), nullable=False, index=True
+    )
+    bed_id = db.Column(
+        db.Integer, db.ForeignKey("beds.bed_id"), nullable=False, index=True
+    )
+    is_discharged = db.Column(db.Boolean, nullable=False, default=False, index=True)
     # Existing relationships...
 
     bed = db.relationship("Bed", back_populates="admission")
@@ -257,7 +271,8 @@ class Discharge_summary(db.Model, SerializerMixin):
         "parent_id",
         "child_id",
         "provider_id",
-        "provider.name" "timestamp",
+        "provider.name",
+        "timestamp",
     )
     serialize_rules = (
         "-provider.discharge_summaries",
@@ -267,21 +282,28 @@ class Discharge_summary(db.Model, SerializerMixin):
 
     discharge_id = db.Column(db.Integer, primary_key=True)
     admission_id = db.Column(
-        db.Integer, db.ForeignKey("admissions.admission_id"), nullable=False
-    )  # Link to Admission
+        db.Integer,
+        db.ForeignKey("admissions.admission_id"),
+        nullable=False,  # Link to Admission
+        index=True,
+    )
     admission_date = db.Column(db.DateTime, nullable=False)
     discharge_date = db.Column(db.DateTime, nullable=False)
     discharge_diagnosis = db.Column(db.String, nullable=False)
     procedure = db.Column(db.String, nullable=True)
     timestamp = db.Column(db.DateTime, nullable=False, default=current_eat_time)
 
-    provider_id = db.Column(db.Integer, db.ForeignKey("providers.provider_id"))
+    provider_id = db.Column(
+        db.Integer, db.ForeignKey("providers.provider_id"), index=True
+    )
     provider = db.relationship("Provider", back_populates="discharge_summaries")
 
-    parent_id = db.Column(db.Integer, db.ForeignKey("parents.parent_id"))
+    parent_id = db.Column(db.Integer, db.ForeignKey("parents.parent_id"), index=True)
     parent = db.relationship("Parent", back_populates="discharge_summaries")
 
-    child_id = db.Column(db.Integer, db.ForeignKey("children.child_id"), nullable=True)
+    child_id = db.Column(
+        db.Integer, db.ForeignKey("children.child_id"), nullable=True, index=True
+    )
     child = db.relationship("Child", back_populates="discharge_summaries")
 
 
@@ -306,7 +328,7 @@ class Medical_info_parent(db.Model, SerializerMixin):
     diabetes = db.Column(db.String, nullable=True)
     hypertension = db.Column(db.String, nullable=True)
 
-    parent_id = db.Column(db.Integer, db.ForeignKey("parents.parent_id"))
+    parent_id = db.Column(db.Integer, db.ForeignKey("parents.parent_id"), index=True)
 
     parent = db.relationship("Parent", back_populates="medical_info_parent")
 
@@ -339,13 +361,24 @@ class Medications(db.Model, SerializerMixin):
     route = db.Column(db.String, nullable=True)
     dose_per_day = db.Column(db.String, nullable=True)
     referral = db.Column(db.String, nullable=True)
-    provider_id = db.Column(db.Integer, db.ForeignKey("providers.provider_id"))
-    parent_id = db.Column(db.Integer, db.ForeignKey("parents.parent_id"), nullable=True)
-    child_id = db.Column(db.Integer, db.ForeignKey("children.child_id"), nullable=True)
-    medicine_id = db.Column(db.Integer, db.ForeignKey("medicines.medicine_id"))
+    provider_id = db.Column(
+        db.Integer, db.ForeignKey("providers.provider_id"), index=True
+    )
+    parent_id = db.Column(
+        db.Integer, db.ForeignKey("parents.parent_id"), nullable=True, index=True
+    )
+    child_id = db.Column(
+        db.Integer, db.ForeignKey("children.child_id"), nullable=True, index=True
+    )
+    medicine_id = db.Column(
+        db.Integer, db.ForeignKey("medicines.medicine_id"), index=True
+    )
     timestamp = db.Column(db.DateTime, nullable=False, default=current_eat_time)
     prescription_id = db.Column(
-        db.Integer, db.ForeignKey("prescriptions.prescription_id"), nullable=True
+        db.Integer,
+        db.ForeignKey("prescriptions.prescription_id"),
+        nullable=True,
+        index=True,
     )
 
     prescription = db.relationship(
@@ -383,6 +416,12 @@ class Present_pregnancy(db.Model, SerializerMixin):
         "-provider.present_pregnancies",
         "-delivery.present_pregnancies",
     )
+    # The list endpoints split on is_delivered and page in pp_id order
+    __table_args__ = (
+        db.Index(
+            "ix_present_pregnancies_is_delivered_pp_id", "is_delivered", "pp_id"
+        ),
+    )
 
     pp_id = db.Column(db.Integer, primary_key=True)
     date = db.Column(db.DateTime, nullable=False)
@@ -395,8 +434,10 @@ class Present_pregnancy(db.Model, SerializerMixin):
     comments = db.Column(db.String, nullable=False)
     clinical_notes = db.Column(db.String, nullable=False)
     is_delivered = db.Column(db.Boolean, nullable=False, default=False)
-    parent_id = db.Column(db.Integer, db.ForeignKey("parents.parent_id"))
-    provider_id = db.Column(db.Integer, db.ForeignKey("providers.provider_id"))
+    parent_id = db.Column(db.Integer, db.ForeignKey("parents.parent_id"), index=True)
+    provider_id = db.Column(
+        db.Integer, db.ForeignKey("providers.provider_id"), index=True
+    )
     timestamp = db.Column(db.DateTime, nullable=False, default=current_eat_time)
 
     parent = db.relationship("Parent", back_populates="present_pregnacy")
@@ -439,9 +480,13 @@ class Previous_pregnancy(db.Model, SerializerMixin):
     fate = db.Column(db.String, nullable=False)
     puerperium = db.Column(db.String, nullable=False)
 
-    parent_id = db.Column(db.Integer, db.ForeignKey("parents.parent_id"))
-    provider_id = db.Column(db.Integer, db.ForeignKey("providers.provider_id"))
-    delivery_id = db.Column(db.Integer, db.ForeignKey("deliveries.delivery_id"))
+    parent_id = db.Column(db.Integer, db.ForeignKey("parents.parent_id"), index=True)
+    provider_id = db.Column(
+        db.Integer, db.ForeignKey("providers.provider_id"), index=True
+    )
+    delivery_id = db.Column(
+        db.Integer, db.ForeignKey("deliveries.delivery_id"), index=True
+    )
     timestamp = db.Column(db.DateTime, nullable=False, default=current_eat_time)
 
     parent = db.relationship("Parent", back_populates="previous_pregnancy")
@@ -449,6 +494,17 @@ class Previous_pregnancy(db.Model, SerializerMixin):
     delivery = db.relationship("Delivery", back_populates="previous_pregnancy")
 
 
+# Birth serial numbers are drawn from here rather than max(serial_number) + 1,
+# which hands the same number to concurrent deliveries; see
+# utils.customs.allocate_serial_numbers
+FIRST_BIRTH_SERIAL_NUMBER = 4953636
+birth_serial_number_seq = db.Sequence(
+    "birth_serial_number_seq",
+    start=FIRST_BIRTH_SERIAL_NUMBER,
+    metadata=db.metadata,
+)
+
+
 class Birth(db.Model, SerializerMixin):
     __tablename__ = "births"
 
@@ -478,7 +534,7 @@ class Birth(db.Model, SerializerMixin):
 
     birth_id = db.Column(db.Integer, primary_key=True)
     delivery_id = db.Column(
-        db.Integer, db.ForeignKey("deliveries.delivery_id"), nullable=False
+        db.Integer, db.ForeignKey("deliveries.delivery_id"), nullable=False, index=True
     )
     baby_name = db.Column(db.String, nullable=False)
     date_of_birth = db.Column(db.DateTime, nullable=False)
@@ -499,8 +555,10 @@ class Birth(db.Model, SerializerMixin):
         db.DateTime, nullable=False, default=current_eat_time
     )
 
-    provider_id = db.Column(db.Integer, db.ForeignKey("providers.provider_id"))
-    parent_id = db.Column(db.Integer, db.ForeignKey("parents.parent_id"))
+    provider_id = db.Column(
+        db.Integer, db.ForeignKey("providers.provider_id"), index=True
+    )
+    parent_id = db.Column(db.Integer, db.ForeignKey("parents.parent_id"), index=True)
 
     # Relationships
     provider = db.relationship("Provider", back_populates="births")
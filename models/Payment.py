@@ -23,7 +23,9 @@ class Payment(db.Model, SerializerMixin):
 
     serialize_rules = ("-parent.payments",)
     payment_id = db.Column(db.Integer, primary_key=True)
-    parent_id = db.Column(db.String, db.ForeignKey("parents.parent_id"), nullable=False)
+    parent_id = db.Column(
+        db.String, db.ForeignKey("parents.parent_id"), nullable=False, index=True
+    )
     amount = db.Column(db.Integer, nullable=False)
     payment_method = db.Column(db.String, nullable=False)
     timestamp = db.Column(db.DateTime, nullable=False, default=current_eat_time)
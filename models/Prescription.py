@@ -54,24 +54,35 @@ class Prescription(db.Model, SerializerMixin):
         "-provider.prescriptions",
         "-child.prescriptions",
     )
+    # Query parameters accepted by list endpoints, see utils.filters
+    filter_fields = ("parent_id", "provider_id", "child_id", "medicine_id")
+    date_field = "filled_date"
+    sort_fields = ("filled_date",)
+
     prescription_id = db.Column(db.Integer, primary_key=True)
     parent_id = db.Column(
-        db.Integer, db.ForeignKey("parents.parent_id"), nullable=True  # Nullable parent
+        db.Integer,
+        db.ForeignKey("parents.parent_id"),
+        nullable=True,  # Nullable parent
+        index=True,
     )
     provider_id = db.Column(
-        db.Integer, db.ForeignKey("providers.provider_id"), nullable=False
+        db.Integer, db.ForeignKey("providers.provider_id"), nullable=False, index=True
     )
     child_id = db.Column(
-        db.Integer, db.ForeignKey("children.child_id"), nullable=True  # Added child_id
+        db.Integer,
+        db.ForeignKey("children.child_id"),
+        nullable=True,  # Added child_id
+        index=True,
     )
     medicine_id = db.Column(
-        db.Integer, db.ForeignKey("medicines.medicine_id"), nullable=False
+        db.Integer, db.ForeignKey("medicines.medicine_id"), nullable=False, index=True
     )
     quantity = db.Column(db.Integer, nullable=False)
     dosage = db.Column(db.String, nullable=False)
     duration = db.Column(db.String, nullable=False)
     refill_count = db.Column(db.Integer, nullable=False, default=0)
-    filled_date = db.Column(db.DateTime, nullable=True)
+    filled_date = db.Column(db.DateTime, nullable=True, index=True)
     expiry_date = db.Column(db.DateTime, nullable=True)
     timestamp = db.Column(db.DateTime, nullable=False, default=current_eat_time)
 
@@ -6,9 +6,15 @@ class ResetToken(db.Model):
     token_id= db.Column(db.Integer,primary_key=True)
     token = db.Column(db.String, nullable=False, unique=True)
     expires_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.utcnow() + timedelta(hours=1))
-    parent_id = db.Column(db.Integer, db.ForeignKey("parents.parent_id"), nullable=True)
-    provider_id = db.Column(db.Integer, db.ForeignKey("providers.provider_id"), nullable=True)
-    user_id = db.Column(db.Integer, db.ForeignKey("users.user_id"), nullable=True)
+    parent_id = db.Column(
+        db.Integer, db.ForeignKey("parents.parent_id"), nullable=True, index=True
+    )
+    provider_id = db.Column(
+        db.Integer, db.ForeignKey("providers.provider_id"), nullable=True, index=True
+    )
+    user_id = db.Column(
+        db.Integer, db.ForeignKey("users.user_id"), nullable=True, index=True
+    )
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, onupdate=datetime.utcnow)
 
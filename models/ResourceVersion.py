@@ -0,0 +1,12 @@
+from config import db
+from datetime import datetime
+
+
+class ResourceVersion(db.Model):
+    # Write counters, bumped by utils.versions as each write commits so cached
+    # responses can be validated without scanning the table itself: one row
+    # per table for any write, and "<table>:updates" for updates and deletes
+    __tablename__ = "resource_versions"
+    table_name = db.Column(db.String, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
@@ -0,0 +1,9 @@
+from config import db
+
+
+class SerialCounter(db.Model):
+    # Stands in for database sequences on backends without them (SQLite);
+    # see utils.customs.allocate_serial_numbers
+    __tablename__ = "serial_counters"
+    name = db.Column(db.String, primary_key=True)
+    next_value = db.Column(db.Integer, nullable=False)
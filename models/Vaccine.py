@@ -32,7 +32,7 @@ class Vaccine(db.Model, SerializerMixin):
     serialize_rules = ("-vaccination_records",)
 
     vaccine_id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String, nullable=False)
+    name = db.Column(db.String, nullable=False, unique=True, index=True)
     composition = db.Column(db.String, nullable=False)
     schedule = db.Column(JSONEncodedList, nullable=False)
     indication = db.Column(db.String, nullable=False)
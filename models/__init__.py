@@ -22,3 +22,6 @@ from .Prescription import Prescription
 from .Documents import Document
 from .Facilities import Bed, Room
 from .Messages import Message, Conversation
+from .ResourceVersion import ResourceVersion
+from .SerialCounter import SerialCounter
+from .EmailOutbox import EmailOutbox
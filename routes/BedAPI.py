@@ -1,17 +1,19 @@
 from flask import jsonify, make_response, request
 from flask_restful import Resource
-from models import Bed, Room
+from models import Bed
 from config import db
 from sqlalchemy.exc import IntegrityError
+from utils.loading import eager_query
+from utils.pagination import paginated_response
+from utils.resolver import NotFoundError, resolve
 
 
 class BedAPI(Resource):
     def get(self, id=None):
         if id is None:
-            beds = [b.to_dict() for b in Bed.query.all()]
-            return make_response(jsonify(beds), 200)
+            return paginated_response(Bed.query, Bed)
         else:
-            bed = Bed.query.filter_by(bed_id=id).first()
+            bed = eager_query(Bed).filter_by(bed_id=id).first()
             if not bed:
                 return make_response(jsonify({"msg": "Bed not found"}), 404)
             return make_response(jsonify(bed.to_dict()), 200)
@@ -21,10 +23,10 @@ class BedAPI(Resource):
         if not data:
             return make_response(jsonify({"msg": "No input provided"}), 400)
 
-        room_id = data.get("room_id")
-        room = Room.query.get(room_id)
-        if not room:
-            return make_response(jsonify({"msg": "Room not found"}), 404)
+        try:
+            room = resolve(data, "room")["room"]
+        except NotFoundError as e:
+            return make_response(jsonify({"msg": str(e)}), 404)
 
         current_bed_occupancy = int(room.current_bed_occupancy)
         capacity = int(room.capacity)
@@ -38,7 +40,7 @@ class BedAPI(Resource):
             bed = Bed(
                 bed_number=data["bed_number"],
                 bed_type=data["bed_type"],
-                room_id=room_id,
+                room_id=room.room_id,
             )
             db.session.add(bed)
             room.current_bed_occupancy += 1
@@ -96,10 +98,6 @@ class BedAPI(Resource):
 
 class AvailableBedsForRoom(Resource):
     def get(self, id):
-        beds = [
-            b.to_dict()
-            for b in Bed.query.filter_by(room_id=id, is_occupied=False).all()
-        ]
-        if not beds:
-            return make_response(jsonify({"msg": "Bed are not available"}), 404)
-        return make_response(jsonify(beds), 200)
+        return paginated_response(
+            Bed.query.filter_by(room_id=id, is_occupied=False), Bed
+        )
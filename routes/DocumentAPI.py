@@ -4,6 +4,9 @@ from sqlalchemy import and_
 from sqlalchemy.exc import IntegrityError
 from config import db
 from models import Document
+from utils.loading import eager_query
+from utils.pagination import paginated_response
+from utils.resolver import NotFoundError, resolve
 from datetime import datetime
 import cloudinary
 import cloudinary.uploader
@@ -25,11 +28,9 @@ def current_eat_time():
 class DocumentAPI(Resource):
     def get(self, id=None):
         if id is None:
-            documents = Document.query.all()
-            document_list = [document.to_dict() for document in documents]
-            return make_response(jsonify(document_list), 200)
+            return paginated_response(Document.query, Document, streamable=True)
         else:
-            document = Document.query.get(id)
+            document = eager_query(Document).get(id)
             if not document:
                 return make_response(jsonify({"msg": "Document not found"}), 404)
             return make_response(jsonify(document.to_dict()), 200)
@@ -45,6 +46,13 @@ class DocumentAPI(Resource):
                 jsonify({"msg": "No input data or file provided"}), 400
             )
 
+        # Check the owners exist before anything is uploaded
+        try:
+            found = resolve(data, optional=("parent", "provider"))
+        except NotFoundError as e:
+            return make_response(jsonify({"msg": str(e)}), 404)
+        parent, provider = found["parent"], found["provider"]
+
         try:
             # Upload to Cloudinary (happyhearts folder)
             upload_result = cloudinary.uploader.upload(file, folder="happyhearts")
@@ -56,8 +64,8 @@ class DocumentAPI(Resource):
                 fileName=upload_result["original_filename"],
                 size=upload_result["bytes"],
                 url=upload_result["secure_url"],
-                parent_id=data.get("parent_id"),
-                provider_id=data.get("provider_id"),
+                parent_id=parent.parent_id if parent else None,
+                provider_id=provider.provider_id if provider else None,
                 timestamp=current_eat_time(),
             )
 
@@ -131,15 +139,9 @@ class DocumentAPI(Resource):
 class DocumentByProvider(Resource):
     def get(self, id):
         # Fetch documents for the provider
-        documents = Document.query.filter((Document.provider_id == id)).all()
-
-        if not documents:
-            return make_response(
-                jsonify({"msg": "No documents found for this user"}), 404
-            )
-
-        document_list = [document.to_dict() for document in documents]
-        return make_response(jsonify(document_list), 200)
+        return paginated_response(
+            Document.query.filter(Document.provider_id == id), Document
+        )
 
 
 class DocumentName(Resource):
@@ -154,23 +156,17 @@ class DocumentName(Resource):
 
 class DocumentByParent(Resource):
     def get(self, id):
-        documents = Document.query.filter((Document.parent_id == id)).all()
-
-        if not documents:
-            return make_response(
-                jsonify({"msg": "No documents found for this user"}), 404
-            )
-
-        document_list = [document.to_dict() for document in documents]
-        return make_response(jsonify(document_list), 200)
+        return paginated_response(
+            Document.query.filter(Document.parent_id == id), Document
+        )
 
 
 class DocumentsByParentAndChild(Resource):
     def get(self, parent_id, child_id):
         documents = Document.query.filter(
             and_(Document.parent_id == parent_id, Document.child_id == child_id)
-        ).all()
-        return make_response(jsonify(documents.to_dict()), 200)
+        )
+        return paginated_response(documents, Document)
 
 
 class DocumentByParentOnly(Resource):
@@ -178,11 +174,7 @@ class DocumentByParentOnly(Resource):
         self,
         parent_id,
     ):
-        documents = (
-            Document.query.filter(Document.parent_id == parent_id)
-            .filter(Document.child_id is None)
-            .all()
+        documents = Document.query.filter(Document.parent_id == parent_id).filter(
+            Document.child_id.is_(None)
         )
-        document_list = [document.to_dict() for document in documents]
-
-        return make_response(jsonify(document_list), 200)
+        return paginated_response(documents, Document)
@@ -4,19 +4,18 @@ from sqlalchemy.exc import IntegrityError
 
 from config import db
 from models import Medicine
+from utils.catalog_cache import catalog_item, catalog_response, invalidate
 
 
 class MedicineAPI(Resource):
     def get(self, id=None):
         if id is None:
-            medicines = Medicine.query.all()
-            medicine_list = [medicine.to_dict() for medicine in medicines]
-            return make_response(jsonify(medicine_list), 200)
+            return catalog_response(Medicine)
         else:
-            medicine = Medicine.query.get(id)
+            medicine = catalog_item(Medicine, id)
             if not medicine:
                 return make_response(jsonify({"msg": "Medicine not found"}), 404)
-            return make_response(jsonify(medicine.to_dict()), 200)
+            return make_response(jsonify(medicine), 200)
 
     def post(self):
         data = request.json
@@ -33,6 +32,7 @@ class MedicineAPI(Resource):
             )
             db.session.add(medicine)
             db.session.commit()
+            invalidate(Medicine)
             return make_response(jsonify({"msg": "Medicine created successfully"}), 201)
 
         except IntegrityError as e:
@@ -55,6 +55,7 @@ class MedicineAPI(Resource):
                     setattr(medicine, key, value)
 
             db.session.commit()
+            invalidate(Medicine)
             return make_response(jsonify({"msg": "Medicine updated successfully"}), 200)
 
         except IntegrityError as e:
@@ -73,6 +74,7 @@ class MedicineAPI(Resource):
         try:
             db.session.delete(medicine)
             db.session.commit()
+            invalidate(Medicine)
             return make_response(jsonify({"msg": "Medicine deleted successfully"}), 200)
 
         except Exception as e:
@@ -1,17 +1,19 @@
 from flask import jsonify, make_response, request
 from flask_restful import Resource
-from models import Message, User, Parent, Provider
+from models import Message
 from config import db
 from sqlalchemy.exc import IntegrityError
+from utils.loading import eager_query
+from utils.pagination import paginated_response
+from utils.resolver import NotFoundError, resolve
 
 
 class MessageAPI(Resource):
     def get(self, id=None):
         if id is None:
-            messages = [m.to_dict() for m in Message.query.all()]
-            return make_response(jsonify(messages), 200)
+            return paginated_response(Message.query, Message, streamable=True)
         else:
-            message = Message.query.filter_by(message_id=id).first()
+            message = eager_query(Message).filter_by(message_id=id).first()
             if not message:
                 return make_response(jsonify({"msg": "Message not found"}), 404)
             return make_response(jsonify(message.to_dict()), 200)
@@ -21,22 +23,10 @@ class MessageAPI(Resource):
         if not data:
             return make_response(jsonify({"msg": "No input provided"}), 400)
 
-        # Handle optional fields for guest users
-        user_id = data.get("user_id")
-        parent_id = data.get("parent_id")
-        provider_id = data.get("provider_id")
-
-        parent = Parent.query.filter_by(parent_id=parent_id).first()
-        provider = Provider.query.filter_by(provider_id=provider_id).first()
-        user = User.query.filter_by(user_id=user_id).first()
-
-        if not parent:
-            return make_response(jsonify({"msg": "Parent not found"}), 404)
-
-        if not provider:
-            return make_response(jsonify({"msg": "Provider not found"}), 404)
-        if not user:
-            return make_response(jsonify({"msg": "user not found"}), 404)
+        try:
+            found = resolve(data, "parent", "provider", "user")
+        except NotFoundError as e:
+            return make_response(jsonify({"msg": str(e)}), 404)
 
         try:
             message = Message(
@@ -44,9 +34,9 @@ class MessageAPI(Resource):
                 last_name=data.get("last_name"),
                 email=data.get("email"),
                 message=data["message"],
-                user_id=user_id,
-                parent_id=parent_id,
-                provider_id=provider_id,
+                user_id=found["user"].user_id,
+                parent_id=found["parent"].parent_id,
+                provider_id=found["provider"].provider_id,
             )
             db.session.add(message)
             db.session.commit()
@@ -3,20 +3,19 @@ from flask_restful import Resource
 from sqlalchemy.exc import IntegrityError
 
 from config import db
-from models import Medicine, Prescription, Child, Parent, Provider
+from models import Prescription, Child, Parent
 from datetime import datetime
+from utils.loading import eager_query
+from utils.pagination import paginated_response
+from utils.resolver import NotFoundError, resolve
 
 
 class PrescriptionAPI(Resource):
     def get(self, id=None):
         if id is None:
-            prescriptions = Prescription.query.all()
-            prescription_list = [
-                prescription.to_dict() for prescription in prescriptions
-            ]
-            return make_response(jsonify(prescription_list), 200)
+            return paginated_response(Prescription.query, Prescription)
         else:
-            prescription = Prescription.query.get(id)
+            prescription = eager_query(Prescription).get(id)
             if not prescription:
                 return make_response(jsonify({"msg": "Prescription not found"}), 404)
             return make_response(jsonify(prescription.to_dict()), 200)
@@ -25,14 +24,6 @@ class PrescriptionAPI(Resource):
         data = request.json
         if not data:
             return make_json_response("No input data provided", 400)
-        parent = None
-        child = None
-
-        provider_id = data.get("provider_id")
-        provider = Provider.query.filter_by(provider_id=provider_id).first()
-
-        if not provider:
-            return make_response(jsonify({"msg": "Provider not found"}), 404)
 
         national_id = data.get("national_id")
         parent_id = data.get("parent_id")
@@ -43,21 +34,9 @@ class PrescriptionAPI(Resource):
             return make_response(
                 jsonify({"msg": "Prescription belongs to either parent or child"}), 400
             )
-        if national_id or parent_id:
-            parent = (
-                Parent.query.filter_by(national_id=national_id).first()
-                or Parent.query.filter_by(parent_id=parent_id).first()
-            )
-            if not parent:
-                return make_response(jsonify({"msg": "Parent not found"}), 404)
-        if child_id or certificate_No:
-            child = Child.query.filter_by(certificate_No=certificate_No).first()
-            if not child:
-                return make_response(jsonify({"msg": "Child not found"}), 404)
 
         # Ensure required fields are present
         medicine_id = data.get("medicine_id")
-        provider_id = data.get("provider_id")
         quantity = data.get("quantity")
         dosage = data.get("dosage")
         filled_date_str = data.get("filled_date")
@@ -82,13 +61,14 @@ class PrescriptionAPI(Resource):
         except ValueError:
             return make_json_response("Invalid date format. Use YYYY-MM-DD", 400)
 
-        provider = Provider.query.get(provider_id)
-        medicine = Medicine.query.get(medicine_id)
+        try:
+            found = resolve(
+                data, "provider", "medicine", optional=("parent", "child")
+            )
+        except NotFoundError as e:
+            return make_response(jsonify({"msg": str(e)}), 404)
+        parent, child, provider = found["parent"], found["child"], found["provider"]
 
-        if not provider:
-            return make_response(jsonify({"msg": "Provider not found"}), 404)
-        if not medicine:
-            return make_response(jsonify({"msg": "Medicine not found"}), 404)
         try:
             prescription = Prescription(
                 medicine_id=medicine_id,
@@ -193,32 +173,23 @@ class PrescriptionAPI(Resource):
 
 class PrescriptionForParent(Resource):
     def get(self, id):
-        prescription = [
-            p.to_dict() for p in Prescription.query.filter_by(parent_id=id).all()
-        ]
-        if prescription:
-            response = make_response(jsonify(prescription), 200)
-            return response
+        return paginated_response(
+            Prescription.query.filter_by(parent_id=id), Prescription
+        )
 
 
 class PrescriptionForProvider(Resource):
     def get(self, id):
-        prescription = [
-            p.to_dict() for p in Prescription.query.filter_by(provider_id=id).all()
-        ]
-        if prescription:
-            response = make_response(jsonify(prescription), 200)
-            return response
+        return paginated_response(
+            Prescription.query.filter_by(provider_id=id), Prescription
+        )
 
 
 class PrescriptionForChild(Resource):
     def get(self, id):
-        prescription = [
-            p.to_dict() for p in Prescription.query.filter_by(child_id=id).all()
-        ]
-        if prescription:
-            response = make_response(jsonify(prescription), 200)
-            return response
+        return paginated_response(
+            Prescription.query.filter_by(child_id=id), Prescription
+        )
 
 
 def make_json_response(message, status_code=200):
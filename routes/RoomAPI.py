@@ -3,15 +3,16 @@ from flask_restful import Resource
 from models import Room
 from config import db
 from sqlalchemy.exc import IntegrityError
+from utils.loading import eager_query
+from utils.pagination import paginated_response
 
 
 class RoomAPI(Resource):
     def get(self, id=None):
         if id is None:
-            rooms = [r.to_dict() for r in Room.query.all()]
-            return make_response(jsonify(rooms), 200)
+            return paginated_response(Room.query, Room)
         else:
-            room = Room.query.filter_by(room_id=id).first()
+            room = eager_query(Room).filter_by(room_id=id).first()
             if not room:
                 return make_response(jsonify({"msg": "Room not found"}), 404)
             return make_response(jsonify(room.to_dict()), 200)
@@ -80,9 +81,4 @@ class RoomAPI(Resource):
 
 class AvailableRooms(Resource):
     def get(self):
-        rooms = [
-            room.to_dict() for room in Room.query.filter_by(status="Available").all()
-        ]
-        if not rooms:
-            return make_response(jsonify({"msg": "Room not found"}), 404)
-        return make_response(jsonify(rooms), 200)
+        return paginated_response(Room.query.filter_by(status="Available"), Room)
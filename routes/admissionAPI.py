@@ -1,20 +1,23 @@
 from flask import jsonify, make_response, request
 from flask_restful import Resource
-from models import Admission, Parent, Child, Provider, Room, Bed
+from models import Admission, Parent, Child, Bed, Room
 from config import db
+from sqlalchemy import case, false, select, true, update
 from sqlalchemy.exc import IntegrityError
 from datetime import datetime
 from utils.customs import role_required
+from utils.loading import eager_query
+from utils.pagination import paginated_response
+from utils.resolver import NotFoundError, resolve
 from flask_jwt_extended import jwt_required
 
 
 class AdmissionAPI(Resource):
     def get(self, id=None):
         if id is None:
-            admissions = [a.to_dict() for a in Admission.query.all()]
-            return make_response(jsonify(admissions), 200)
+            return paginated_response(Admission.query, Admission)
         else:
-            admission = Admission.query.filter_by(admission_id=id).first()
+            admission = eager_query(Admission).filter_by(admission_id=id).first()
             if not admission:
                 return make_response(jsonify({"msg": "Admission not found"}), 404)
             return make_response(jsonify(admission.to_dict()), 200)
@@ -27,56 +30,54 @@ class AdmissionAPI(Resource):
         if not data:
             return make_response(jsonify({"msg": "No input provided"}), 400)
 
-        national_id = data.get("national_id")
-        parent_id = data.get("parent_id")
-        provider_id = data.get("provider_id")
-        child_id = data.get("child_id")
-        room_id = data.get("room_id")
-        certificate_No = data.get("certificate_No")
-        bed_id = data.get("bed_id")
-
-        parent = (
-            Parent.query.filter_by(national_id=national_id).first()
-            or Parent.query.filter_by(parent_id=parent_id).first()
-        )
-        provider = Provider.query.filter_by(provider_id=provider_id).first()
-        child = (
-            Child.query.filter_by(certificate_No=certificate_No).first()
-            or Child.query.filter_by(child_id=child_id).first()
-        )
-        print(child)
-        if child_id and not child:
-            return make_response(jsonify({"msg": "Child not found"}), 404)
-        if not parent:
-            return make_response(jsonify({"msg": "Parent not found"}), 404)
-        if not provider:
-            return make_response(jsonify({"msg": "Provider not found"}), 404)
-
-        # Check if the room exists and if it has available capacity
-        room = Room.query.get(room_id)
-        if not room:
-            return make_response(jsonify({"msg": "Room not found"}), 404)
+        try:
+            found = resolve(
+                data, "parent", "provider", "room", optional=("child", "bed")
+            )
+        except NotFoundError as e:
+            return make_response(jsonify({"msg": str(e)}), 404)
+        parent, child, room = found["parent"], found["child"], found["room"]
+        requested_bed = found["bed"]
 
+        # Cheap checks against the rows just read; claim_bed and
+        # occupy_room repeat them atomically
         if room.current_occupancy >= room.capacity:
             return make_response(jsonify({"msg": "Room is at full capacity"}), 400)
+        if requested_bed and requested_bed.room_id != room.room_id:
+            return make_response(
+                jsonify({"msg": "Bed does not belong to this room"}), 400
+            )
 
-        # Check if the bed exists
-        bed = Bed.query.get(bed_id)
-        if not bed:
-            return make_response(jsonify({"msg": "Bed not found"}), 404)
-
-        # Assuming you have logic to get the bed details
-        bed = Bed.query.filter_by(room_id=room.room_id, is_occupied=False).first()
-        if not bed:
+        try:
+            admission_date = datetime.strptime(
+                data["admission_date"], "%Y-%m-%dT%H:%M"
+            )
+        except (KeyError, TypeError, ValueError):
             return make_response(
-                jsonify({"msg": "No available beds in this room"}), 404
+                jsonify({"msg": "Invalid date format, use YYYY-MM-DDTHH:MM"}), 400
             )
 
         try:
+            bed_id = claim_bed(
+                room.room_id, requested_bed.bed_id if requested_bed else None
+            )
+            if bed_id is None:
+                db.session.rollback()
+                if requested_bed:
+                    return make_response(
+                        jsonify({"msg": "Bed is already occupied"}), 409
+                    )
+                return make_response(
+                    jsonify({"msg": "No available beds in this room"}), 404
+                )
+            if not occupy_room(room.room_id):
+                db.session.rollback()
+                return make_response(
+                    jsonify({"msg": "Room is at full capacity"}), 400
+                )
+
             admission = Admission(
-                admission_date=datetime.strptime(
-                    data["admission_date"], "%Y-%m-%dT%H:%M"
-                ),
+                admission_date=admission_date,
                 parent_id=parent.parent_id,
                 provider_id=data.get("provider_id"),
                 child_id=child.child_id if child else None,
@@ -85,20 +86,9 @@ class AdmissionAPI(Resource):
                 initial_treatment_plan=data.get("initial_treatment_plan"),
                 room_id=room.room_id,
                 insurance_details=data.get("insurance_details"),
-                bed_id=bed.bed_id,  # Assign the bed ID
+                bed_id=bed_id,
             )
             db.session.add(admission)
-
-            # Update room and bed status
-            room.current_occupancy += 1
-            room.is_occupied = room.current_occupancy > 0
-            bed.is_occupied = True
-            room.status = (
-                "Full"
-                if room.current_occupancy == room.current_bed_occupancy
-                else "Available"
-            )
-
             db.session.commit()
 
             return make_response(
@@ -111,6 +101,7 @@ class AdmissionAPI(Resource):
             return make_response(jsonify({"msg": f" {error_message}"}), 400)
 
         except Exception as e:
+            db.session.rollback()
             return make_response(jsonify({"msg": str(e)}), 500)
 
     def patch(self, id):
@@ -168,19 +159,57 @@ class AdmissionAPI(Resource):
 
 class AdmissionForParent(Resource):
     def get(self, id):
-        admissions = [
-            a.to_dict() for a in Admission.query.filter_by(parent_id=id).all()
-        ]
-        if admissions:
-            response = make_response(jsonify(admissions), 200)
-            return response
+        return paginated_response(Admission.query.filter_by(parent_id=id), Admission)
 
 
 class AdmissionForProvider(Resource):
     def get(self, id):
-        admissions = [
-            a.to_dict() for a in Admission.query.filter_by(provider_id=id).all()
-        ]
-        if admissions:
-            response = make_response(jsonify(admissions), 200)
-            return response
+        return paginated_response(Admission.query.filter_by(provider_id=id), Admission)
+
+
+def claim_bed(room_id, bed_id=None):
+    """Marks ``bed_id``, or else the first free bed in the room, occupied
+    with a single UPDATE ... RETURNING and returns its id, or ``None`` when
+    that bed is taken or the room has none left.
+
+    On Postgres the free-bed subquery skips beds other admissions have just
+    locked instead of queueing behind them; SQLite runs one writer at a
+    time, so the is_occupied guard alone keeps a bed from being handed out
+    twice there.
+    """
+    if bed_id is None:
+        bed_id = (
+            select(Bed.bed_id)
+            .where(Bed.room_id == room_id, Bed.is_occupied == false())
+            .order_by(Bed.bed_id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+    return db.session.execute(
+        update(Bed)
+        .where(
+            Bed.bed_id == bed_id, Bed.room_id == room_id, Bed.is_occupied == false()
+        )
+        .values(is_occupied=True)
+        .returning(Bed.bed_id)
+    ).scalar()
+
+
+def occupy_room(room_id):
+    """Counts one more patient in the room in SQL, so concurrent admissions
+    can't overwrite each other's count. Returns False when it is full."""
+    occupancy = Room.current_occupancy + 1
+    updated = db.session.execute(
+        update(Room)
+        .where(Room.room_id == room_id, Room.current_occupancy < Room.capacity)
+        .values(
+            current_occupancy=occupancy,
+            is_occupied=true(),
+            status=case(
+                (occupancy == Room.current_bed_occupancy, "Full"), else_="Available"
+            ),
+        )
+        .returning(Room.room_id)
+    )
+    return updated.scalar() is not None
@@ -1,12 +1,15 @@
-from config import db, mail
+from config import db
 from flask_restful import Resource
 from models import Appointment, Provider, Parent
 from flask import make_response, jsonify, request
 from sqlalchemy.exc import IntegrityError
 from datetime import datetime
-import os
-from flask_mail import Message
 from venv import logger
+from utils.email_templates import render
+from utils.loading import eager_query
+from utils.outbox import queue_email
+from utils.pagination import paginated_response
+from utils.resolver import NotFoundError, resolve
 import pytz
 
 EAT = pytz.timezone("Africa/Nairobi")
@@ -15,11 +18,9 @@ EAT = pytz.timezone("Africa/Nairobi")
 class appointmentsAPI(Resource):
     def get(self, id=None):
         if id is None:
-            appointments = [a.to_dict() for a in Appointment.query.all()]
-            response = make_response(jsonify(appointments), 200)
-            return response
+            return paginated_response(Appointment.query, Appointment, streamable=True)
         else:
-            appointment = Appointment.query.filter_by(appointment_id=id).first()
+            appointment = eager_query(Appointment).filter_by(appointment_id=id).first()
             response = make_response(jsonify(appointment.to_dict()), 200)
             return response
 
@@ -48,21 +49,12 @@ class appointmentsAPI(Resource):
                 jsonify({"msg": "Enter a date later than today or today"}), 400
             )
 
-        # Retrieve national ID, parent, and provider from input
-        national_id = data.get("national_id")
-        parent_id = data.get("parent_id")
-        provider_id = data.get("provider_id")
-
-        parent = (
-            Parent.query.filter_by(national_id=national_id).first()
-            or Parent.query.filter_by(parent_id=parent_id).first()
-        )
-        provider = Provider.query.filter_by(provider_id=provider_id).first()
-
-        if not parent:
-            return make_response(jsonify({"msg": "Parent not found"}), 404)
-        if not provider:
-            return make_response(jsonify({"msg": "Provider not found"}), 404)
+        # Resolve the parent (by national ID or id) and provider from input
+        try:
+            found = resolve(data, "parent", "provider")
+        except NotFoundError as e:
+            return make_response(jsonify({"msg": str(e)}), 404)
+        parent, provider = found["parent"], found["provider"]
 
         try:
             # Create the new appointment
@@ -74,61 +66,22 @@ class appointmentsAPI(Resource):
                 status=data.get("status"),
             )
             db.session.add(appointment)
+
+            # Sent by the outbox workers once the appointment is committed
+            queue_email(
+                parent.email,
+                *render(
+                    "appointment_scheduled",
+                    provider_name=provider.name,
+                    appointment_date=appointment_date,
+                ),
+            )
             db.session.commit()
 
-            # Send email after appointment creation
-            try:
-                appointment_date_str = appointment_date.strftime(
-                    "%Y-%m-%d %H:%M"
-                )  # Convert datetime to string
-
-                html_body = f"""
-                <div style="width: 100%;background: #ebf2fa;padding: 20px 0 0 0;font-family: system-ui, sans-serif; text-align: center;">
-                    <div style="border-top: 6px solid #007BFF; background-color: #fff; display: block; padding: 8px 20px; text-align: center; max-width: 500px; border-bottom-left-radius: .4rem; border-bottom-right-radius: .4rem; letter-spacing: .037rem; line-height: 26px; margin: auto; font-size: 14px;">
-                        <img src="https://res.cloudinary.com/droynil1n/image/upload/v1728204000/e50iplialg1fawi16enn.png"
-                            alt="Happy Hearts Logo" style="width: 70%; height: auto; margin:auto">
-                        <div style="text-align: left; padding-top: 10px;">
-                            <p>An appointment for you has been scheduled by {provider.name} set for {appointment_date_str}.</p>
-                        </div>
-                        <div style="text-align: center; padding-top: 2px;">
-                            <p>For assistance, reach us at
-                            <a href='mailto:{os.getenv('MAIL_USERNAME')}'
-                                style='color: #007BFF; text-decoration: underline;'>{os.getenv('MAIL_USERNAME')}</a>.
-                            </p>
-                        </div>
-                    </div>
-                    <p style="padding: 20px 0 5px 0; text-align: center;color: rgb(150, 150, 150);font-size: 12px;">Happy Hearts
-                    Community
-                    </p>
-                </div>"""
-
-                recipient_email = appointment.parent.email.strip()
-
-                # Send email message
-                msg = Message(
-                    subject="Appointment schedule",
-                    sender=os.getenv("MAIL_USERNAME"),
-                    recipients=[recipient_email],
-                    html=html_body,
-                )
-
-                mail.send(msg)
-
-                return make_response(
-                    jsonify({"msg": "Appointment created and email sent successfully"}),
-                    201,
-                )
-            except Exception as e:
-                logger.error(f"Error sending appointment email: {e}")
-                db.session.rollback()
-                return make_response(
-                    jsonify(
-                        {
-                            "error": "An error occurred while sending the email. Please try again later."
-                        }
-                    ),
-                    500,
-                )
+            return make_response(
+                jsonify({"msg": "Appointment created and email queued successfully"}),
+                201,
+            )
 
         except IntegrityError as e:
             db.session.rollback()
@@ -198,22 +151,16 @@ class appointmentsAPI(Resource):
 
 class AppointmentForParent(Resource):
     def get(self, id):
-        appointments = [
-            a.to_dict() for a in Appointment.query.filter_by(parent_id=id).all()
-        ]
-        if appointments:
-            response = make_response(jsonify(appointments), 200)
-            return response
+        return paginated_response(
+            Appointment.query.filter_by(parent_id=id), Appointment
+        )
 
 
 class AppointmentForProvider(Resource):
     def get(self, id):
-        appointments = [
-            a.to_dict() for a in Appointment.query.filter_by(provider_id=id).all()
-        ]
-        if appointments:
-            response = make_response(jsonify(appointments), 200)
-            return response
+        return paginated_response(
+            Appointment.query.filter_by(provider_id=id), Appointment
+        )
 
 
 class ApproveAppointment(Resource):
@@ -240,10 +187,9 @@ class ApproveAppointment(Resource):
 
             if new_status == "Approved":
                 appointment.status = "Approved"
-                db.session.commit()
-
-                # Send approval email
+                # Queue the approval email with the status change
                 self.send_approval_email(appointment)
+                db.session.commit()
 
                 return make_response(jsonify({"msg": "Appointment approved"}), 200)
 
@@ -255,10 +201,9 @@ class ApproveAppointment(Resource):
 
                 appointment.status = "Rejected"
                 appointment.rejection_reason = rejection_reason  # Save the reason
-                db.session.commit()
-
-                # Send rejection email
+                # Queue the rejection email with the status change
                 self.send_rejection_email(appointment, rejection_reason)
+                db.session.commit()
 
                 return make_response(jsonify({"msg": "Appointment rejected"}), 200)
 
@@ -274,81 +219,21 @@ class ApproveAppointment(Resource):
             return jsonify({"msg": str(e)}), 500
 
     def send_approval_email(self, appointment):
-        try:
-            # Prepare email content
-            provider = appointment.provider
-            appointment_date_str = appointment.appointment_date.strftime(
-                "%Y-%m-%d %H:%M"
-            )
-            html_body = f"""
-            <div style="width: 100%;background: #ebf2fa;padding: 20px 0 0 0;font-family: system-ui, sans-serif; text-align: center;">
-                <div style="border-top: 6px solid #007BFF; background-color: #fff; display: block; padding: 8px 20px; text-align: center; max-width: 500px; border-bottom-left-radius: .4rem; border-bottom-right-radius: .4rem; letter-spacing: .037rem; line-height: 26px; margin: auto; font-size: 14px;">
-                    <img src="https://res.cloudinary.com/droynil1n/image/upload/v1728204000/e50iplialg1fawi16enn.png"
-                        alt="Happy Hearts Logo" style="width: 70%; height: auto; margin:auto">
-                    <div style="text-align: left; padding-top: 10px;">
-                        <p>Your appointment with {provider.name} on {appointment_date_str} has been <strong>approved</strong>.</p>
-                    </div>
-                    <div style="text-align: center; padding-top: 2px;">
-                        <p>If you have any questions, contact us at
-                        <a href='mailto:{os.getenv('MAIL_USERNAME')}'
-                            style='color: #007BFF; text-decoration: underline;'>{os.getenv('MAIL_USERNAME')}</a>.
-                        </p>
-                    </div>
-                </div>
-                <p style="padding: 20px 0 5px 0; text-align: center;color: rgb(150, 150, 150);font-size: 12px;">Happy Hearts Community
-                </p>
-            </div>"""
-
-            recipient_email = appointment.parent.email.strip()
-
-            # Send email message
-            msg = Message(
-                subject="Appointment Approved",
-                sender=os.getenv("MAIL_USERNAME"),
-                recipients=[recipient_email],
-                html=html_body,
-            )
-
-            mail.send(msg)
-            logger.info(f"Approval email sent to {recipient_email}")
-        except Exception as e:
-            logger.error(f"Error sending approval email: {e}")
+        queue_email(
+            appointment.parent.email,
+            *render(
+                "appointment_approved",
+                provider_name=appointment.provider.name,
+                appointment_date=appointment.appointment_date,
+            ),
+        )
 
     def send_rejection_email(self, appointment, rejection_reason):
-        try:
-            # Prepare email content
-            provider = appointment.provider
-            html_body = f"""
-            <div style="width: 100%;background: #ebf2fa;padding: 20px 0 0 0;font-family: system-ui, sans-serif; text-align: center;">
-                <div style="border-top: 6px solid #007BFF; background-color: #fff; display: block; padding: 8px 20px; text-align: center; max-width: 500px; border-bottom-left-radius: .4rem; border-bottom-right-radius: .4rem; letter-spacing: .037rem; line-height: 26px; margin: auto; font-size: 14px;">
-                    <img src="https://res.cloudinary.com/droynil1n/image/upload/v1728204000/e50iplialg1fawi16enn.png"
-                        alt="Happy Hearts Logo" style="width: 70%; height: auto; margin:auto">
-                    <div style="text-align: left; padding-top: 10px;">
-                        <p>Your appointment with {provider.name} was <strong>rejected</strong>.</p>
-                        <p>Reason: {rejection_reason}</p>
-                    </div>
-                    <div style="text-align: center; padding-top: 2px;">
-                        <p>If you have any questions, contact us at
-                        <a href='mailto:{os.getenv('MAIL_USERNAME')}'
-                            style='color: #007BFF; text-decoration: underline;'>{os.getenv('MAIL_USERNAME')}</a>.
-                        </p>
-                    </div>
-                </div>
-                <p style="padding: 20px 0 5px 0; text-align: center;color: rgb(150, 150, 150);font-size: 12px;">Happy Hearts Community
-                </p>
-            </div>"""
-
-            recipient_email = appointment.parent.email.strip()
-
-            # Send email message
-            msg = Message(
-                subject="Appointment Rejected",
-                sender=os.getenv("MAIL_USERNAME"),
-                recipients=[recipient_email],
-                html=html_body,
-            )
-
-            mail.send(msg)
-            logger.info(f"Rejection email sent to {recipient_email}")
-        except Exception as e:
-            logger.error(f"Error sending rejection email: {e}")
+        queue_email(
+            appointment.parent.email,
+            *render(
+                "appointment_rejected",
+                provider_name=appointment.provider.name,
+                rejection_reason=rejection_reason,
+            ),
+        )
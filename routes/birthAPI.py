@@ -1,17 +1,20 @@
 from flask import jsonify, make_response, request
 from flask_restful import Resource
-from models import Birth, Provider, Parent
+from models import Birth
 from config import db
 from sqlalchemy.exc import IntegrityError
+from utils.customs import allocate_serial_numbers
+from utils.loading import eager_query
+from utils.pagination import paginated_response
+from utils.resolver import NotFoundError, resolve
 
 
 class BirthAPI(Resource):
     def get(self, id=None):
         if id is None:
-            births = [b.to_dict() for b in Birth.query.all()]
-            return make_response(jsonify(births), 200)
+            return paginated_response(Birth.query, Birth)
         else:
-            birth = Birth.query.filter_by(birth_id=id).first()
+            birth = eager_query(Birth).filter_by(birth_id=id).first()
             if not birth:
                 return make_response(jsonify({"msg": "Birth record not found"}), 404)
             return make_response(jsonify(birth.to_dict()), 200)
@@ -21,17 +24,10 @@ class BirthAPI(Resource):
         if not data:
             return make_response(jsonify({"msg": "No input provided"}), 400)
 
-        provider_id = data.get("provider_id")
-        parent_id = data.get("parent_id")
-
-        provider = Provider.query.get(provider_id)
-        parent = Parent.query.get(parent_id)
-
-        if not provider:
-            return make_response(jsonify({"msg": "Provider not found"}), 404)
-
-        if not parent:
-            return make_response(jsonify({"msg": "Parent not found"}), 404)
+        try:
+            found = resolve(data, "provider", "parent")
+        except NotFoundError as e:
+            return make_response(jsonify({"msg": str(e)}), 404)
 
         try:
             birth = Birth(
@@ -50,8 +46,9 @@ class BirthAPI(Resource):
                 father_age=data.get("father_age"),
                 father_occupation=data.get("father_occupation"),
                 marital_status=data.get("marital_status"),
-                provider_id=provider_id,
-                parent_id=parent_id,
+                serial_number=allocate_serial_numbers(1)[0],
+                provider_id=found["provider"].provider_id,
+                parent_id=found["parent"].parent_id,
             )
             db.session.add(birth)
             db.session.commit()
@@ -108,15 +105,9 @@ class BirthAPI(Resource):
 
 class BirthForProvider(Resource):
     def get(self, id):
-        births = [a.to_dict() for a in Birth.query.filter_by(provider_id=id).all()]
-        if births:
-            response = make_response(jsonify(births), 200)
-            return response
+        return paginated_response(Birth.query.filter_by(provider_id=id), Birth)
 
 
 class BirthForParent(Resource):
     def get(self, id):
-        births = [a.to_dict() for a in Birth.query.filter_by(parent_id=id).all()]
-        if births:
-            response = make_response(jsonify(births), 200)
-            return response
+        return paginated_response(Birth.query.filter_by(parent_id=id), Birth)
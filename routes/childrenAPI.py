@@ -2,6 +2,9 @@ from flask import make_response, jsonify, request
 from flask_restful import Resource
 from config import db
 from utils.Age import calculate_age
+from utils.loading import eager_query
+from utils.pagination import paginated_response
+from utils.resolver import NotFoundError, resolve
 from models import Child, Parent, Document
 from sqlalchemy.exc import IntegrityError
 from datetime import datetime, date
@@ -11,11 +14,9 @@ import cloudinary
 class ChildrenAPI(Resource):
     def get(self, id=None):
         if id is None:
-            children = [c.to_dict() for c in Child.query.all()]
-            response = make_response(jsonify(children), 200)
-            return response
+            return paginated_response(Child.query, Child)
         else:
-            child = Child.query.filter_by(child_id=id).first()
+            child = eager_query(Child).filter_by(child_id=id).first()
             if not child:
                 return make_response(jsonify({"msg": "Child doesn't exist"}), 404)
             response = jsonify(child.to_dict())
@@ -44,9 +45,10 @@ class ChildrenAPI(Resource):
             return make_response(
                 jsonify({"msg": "Child with that certificate number exists"}), 404
             )
-        parent = Parent.query.get(data.get("parent_id"))
-        if not parent:
-            return make_response(jsonify({"msg": "Parent not found"}), 404)
+        try:
+            parent = resolve(data, "parent")["parent"]
+        except NotFoundError as e:
+            return make_response(jsonify({"msg": str(e)}), 404)
         try:
             # Upload the passport image to Cloudinary
             upload_result = cloudinary.uploader.upload(file, folder="happyhearts")
@@ -58,7 +60,7 @@ class ChildrenAPI(Resource):
                 date_of_birth=dob,
                 age=age,
                 gender=data.get("gender"),
-                parent_id=data.get("parent_id"),
+                parent_id=parent.parent_id,
             )
             db.session.add(child)
             db.session.commit()
@@ -68,9 +70,8 @@ class ChildrenAPI(Resource):
                 fileName=file.name,
                 size=upload_result["bytes"],
                 url=upload_result["secure_url"],  # Cloudinary link
-                parent_id=data.get(
-                    "parent_id"
-                ),  # Assuming the document also belongs to the parent
+                # Assuming the document also belongs to the parent
+                parent_id=parent.parent_id,
                 child_id=child.child_id,
             )
             db.session.add(document)
@@ -136,7 +137,4 @@ class ChildrenAPI(Resource):
 
 class ChildByParentIdAPI(Resource):
     def get(self, id):
-        children = Child.query.filter(Child.parent_id == id).all()
-        if children:
-            children_list = [child.to_dict() for child in children]
-            return make_response(jsonify(children_list), 200)
+        return paginated_response(Child.query.filter(Child.parent_id == id), Child)
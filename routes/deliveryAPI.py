@@ -4,25 +4,26 @@ from models import (
     Delivery,
     Parent,
     Provider,
-    Present_pregnancy,
     Previous_pregnancy,
     Birth,
 )
-from config import db, mail
+from config import db
 from sqlalchemy.exc import IntegrityError
 from datetime import datetime
-from flask_mail import Message
-import os
-from utils.customs import generate_serial_number
+from utils.customs import allocate_serial_numbers
+from utils.email_templates import render
+from utils.loading import eager_query
+from utils.outbox import queue_email
+from utils.pagination import paginated_response
+from utils.resolver import NotFoundError, resolve
 
 
 class DeliveryAPI(Resource):
     def get(self, id=None):
         if id is None:
-            deliveries = [d.to_dict() for d in Delivery.query.all()]
-            return make_response(jsonify(deliveries), 200)
+            return paginated_response(Delivery.query, Delivery)
         else:
-            delivery = Delivery.query.filter_by(delivery_id=id).first()
+            delivery = eager_query(Delivery).filter_by(delivery_id=id).first()
             if not delivery:
                 return make_response(jsonify({"msg": "Delivery not found"}), 404)
             return make_response(jsonify(delivery.to_dict()), 200)
@@ -32,26 +33,13 @@ class DeliveryAPI(Resource):
         if not data:
             return make_response(jsonify({"msg": "No input provided"}), 400)
 
-        # national_id = data.get("national_id")
-        # parent_id = data.get("parent_id")
-        provider_id = data.get("provider_id")
-        present_pregnancy_id = data.get("pregnancy_id")
-
-        provider = Provider.query.filter_by(provider_id=provider_id).first()
-        present_pregnancy = Present_pregnancy.query.filter_by(
-            pp_id=present_pregnancy_id
-        ).first()
+        try:
+            found = resolve(data, "provider", "pregnancy")
+        except NotFoundError as e:
+            return make_response(jsonify({"msg": str(e)}), 404)
+        provider, present_pregnancy = found["provider"], found["pregnancy"]
 
-        if not provider:
-            return make_response(jsonify({"msg": "Provider not found"}), 404)
-        if not present_pregnancy:
-            return make_response(jsonify({"msg": "Pregnacy not found"}), 404)
-        parent = (
-            Parent.query.filter_by(
-                national_id=present_pregnancy.parent.national_id
-            ).first()
-            # or Parent.query.filter_by(parent_id=parent_id).first()
-        )
+        parent = present_pregnancy.parent
         if not parent:
             return make_response(jsonify({"msg": "Parent not found"}), 404)
         type_of_birth_map = {
@@ -87,7 +75,8 @@ class DeliveryAPI(Resource):
             )
             db.session.add(delivery)
             present_pregnancy.is_delivered = True
-            db.session.commit()
+            # Everything below, the email included, commits together at the end
+            db.session.flush()
 
             pregnancy = Previous_pregnancy(
                 year=delivery.date.year,
@@ -103,17 +92,17 @@ class DeliveryAPI(Resource):
                 delivery_id=delivery.delivery_id,
             )
             db.session.add(pregnancy)
-            db.session.commit()
 
             if delivery.fate == "Alive":
-                for i in range(type_of_birth_num):
+                serial_numbers = allocate_serial_numbers(type_of_birth_num)
+                for i, serial_number in enumerate(serial_numbers):
                     birth_record = Birth(
                         delivery_id=delivery.delivery_id,
                         baby_name=data.get("baby_name") or f"Baby {i + 1}",
                         date_of_birth=delivery.date,
                         place_of_birth="Happy Hearts",
                         sub_county="Nairobi",
-                        serial_number=generate_serial_number(),
+                        serial_number=serial_number,
                         weight=delivery.weight_at_birth,
                         gender=delivery.gender,
                         fate=delivery.fate,
@@ -124,92 +113,25 @@ class DeliveryAPI(Resource):
                         type_of_birth=delivery.type_of_birth,
                     )
                     db.session.add(birth_record)
-                db.session.commit()
 
-                msg = Message(
-                    subject="Congratulations on Your New Baby!",
-                    sender=os.getenv("MAIL_USERNAME"),
-                    recipients=[delivery.parent.email],
-                    html=f"""
-                <div style="width: 100%;background: #ebf2fa;padding: 20px 0 0 0;font-family: system-ui, sans-serif; text-align: center;">
-                    <div style="border-top: 6px solid #007BFF; background-color: #fff; display: block; padding: 8px 20px; text-align: center; max-width: 500px; border-bottom-left-radius: .4rem; border-bottom-right-radius: .4rem; letter-spacing: .037rem; line-height: 26px; margin: auto; font-size: 14px;">
-                        <img src="https://res.cloudinary.com/droynil1n/image/upload/v1728204000/e50iplialg1fawi16enn.png"
-                            alt="Happy Hearts Logo" style="width: 70%; height: auto; margin:auto">
-                        <div style="text-align: left; padding-top: 10px;">
-                            <p>Congratulations on the birth of your precious baby! 
-                        We are overjoyed to share in this special moment with you. 
-                        May this new chapter bring you immense joy and cherished memories. 
-                        Please remember to update your details under the Births tab at your earliest convenience as its important for your Child's Birth Certificate. 
-                        We are here to support you and your growing family!</p>
-                        </div>
-                        <div style="text-align: center; padding-top: 2px;">
-                            <p>For assistance, reach us at
-                            <a href='mailto:{os.getenv('MAIL_USERNAME')}'
-                                style='color: #007BFF; text-decoration: underline;'>{os.getenv('MAIL_USERNAME')}</a>.
-                            </p>
-                        </div>
-                    </div>
-                    <p style="padding: 20px 0 5px 0; text-align: center;color: rgb(150, 150, 150);font-size: 12px;">Happy Hearts
-                    Community
-                    </p>
-                </div>""",
+                queue_email(
+                    delivery.parent.email, *render("delivery_congratulations")
                 )
             else:
                 # Condolence email message
-                msg = Message(
-                    subject="Our Heartfelt Condolences",
-                    sender=os.getenv("MAIL_USERNAME"),
-                    recipients=[delivery.parent.email],
-                    html=f"""
-                <div style="width: 100%;background: #ebf2fa;padding: 20px 0 0 0;font-family: system-ui, sans-serif; text-align: center;">
-                    <div style="border-top: 6px solid #007BFF; background-color: #fff; display: block; padding: 8px 20px; text-align: center; max-width: 500px; border-bottom-left-radius: .4rem; border-bottom-right-radius: .4rem; letter-spacing: .037rem; line-height: 26px; margin: auto; font-size: 14px;">
-                        <img src="https://res.cloudinary.com/droynil1n/image/upload/v1728204000/e50iplialg1fawi16enn.png"
-                            alt="Happy Hearts Logo" style="width: 70%; height: auto; margin:auto">
-                        <div style="text-align: left; padding-top: 10px;">
-                            <p>We are deeply saddened by the loss of your beloved child.
-                        "Please accept our heartfelt condolences during this difficult time.
-                        Our hearts go out to you, and we are here to offer any support and comfort you may need.
-                        Please take all the time you need, and know that you are not alone in your grief.</p>
-                        </div>
-                        <div style="text-align: center; padding-top: 2px;">
-                            <p>For assistance, reach us at
-                            <a href='mailto:{os.getenv('MAIL_USERNAME')}'
-                                style='color: #007BFF; text-decoration: underline;'>{os.getenv('MAIL_USERNAME')}</a>.
-                            </p>
-                        </div>
-                    </div>
-                    <p style="padding: 20px 0 5px 0; text-align: center;color: rgb(150, 150, 150);font-size: 12px;">Happy Hearts
-                    Community
-                    </p>
-                </div>""",
-                )
+                queue_email(delivery.parent.email, *render("delivery_condolences"))
 
-            # Send the email
-            try:
-                mail.send(msg)
-                return make_response(
-                    jsonify(
-                        {
-                            "msg": "Delivery and related records created successfully, email sent"
-                        }
-                    ),
-                    201,
-                )
-            except Exception as e:
-                print(f"Error sending email: {e}")
-                db.session.rollback()
-                return make_response(
-                    jsonify(
-                        {
-                            "error": "An error occurred while sending the email. Please try again later."
-                        }
-                    ),
-                    500,
-                )
+            # The delivery, its records and the email, or none of them; the
+            # outbox workers send the email once this commits
             db.session.commit()
 
             return make_response(
-                jsonify({"msg": "Delivery and related records created successfully"}),
+                jsonify(
+                    {
+                        "msg": "Delivery and related records created successfully, "
+                        "email queued"
+                    }
+                ),
                 201,
             )
 
@@ -280,15 +202,9 @@ class DeliveryAPI(Resource):
 
 class DeliveryForProvider(Resource):
     def get(self, id):
-        deliveries = [
-            d.to_dict() for d in Delivery.query.filter_by(provider_id=id).all()
-        ]
-        if deliveries:
-            return make_response(jsonify(deliveries), 200)
+        return paginated_response(Delivery.query.filter_by(provider_id=id), Delivery)
 
 
 class DeliveryForParent(Resource):
     def get(self, id):
-        deliveries = [d.to_dict() for d in Delivery.query.filter_by(parent_id=id).all()]
-        if deliveries:
-            return make_response(jsonify(deliveries), 200)
+        return paginated_response(Delivery.query.filter_by(parent_id=id), Delivery)
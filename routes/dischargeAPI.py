@@ -1,18 +1,20 @@
 from flask import jsonify, make_response, request
 from flask_restful import Resource
-from models import Child, Discharge_summary, Parent, Provider, Admission
+from models import Discharge_summary, Parent, Provider
 from config import db
 from sqlalchemy.exc import IntegrityError
 from datetime import datetime
+from utils.loading import eager_query
+from utils.pagination import paginated_response
+from utils.resolver import NotFoundError, resolve
 
 
 class DischargeSummaryAPI(Resource):
     def get(self, id=None):
         if id is None:
-            summaries = [d.to_dict() for d in Discharge_summary.query.all()]
-            return make_response(jsonify(summaries), 200)
+            return paginated_response(Discharge_summary.query, Discharge_summary)
         else:
-            summary = Discharge_summary.query.filter_by(discharge_id=id).first()
+            summary = eager_query(Discharge_summary).filter_by(discharge_id=id).first()
             if not summary:
                 return make_response(
                     jsonify({"msg": "Discharge summary not found"}), 404
@@ -23,30 +25,20 @@ class DischargeSummaryAPI(Resource):
         data = request.json
         if not data:
             return make_response(jsonify({"msg": "No input provided"}), 400)
-        provider_id = data.get("provider_id")
-        admission_id = data.get("admission_id")
-        provider_id = data.get("provider_id")
-        # Validate responsible party (parent or child) using find_parent_or_child
-        validation_result = find_parent_or_child(
-            parent_id=data.get("parent_id"),
-            child_certificate_no=data.get("child_certificate_no"),
-        )
+        try:
+            found = resolve(
+                data, "provider", "admission", optional=("parent", "child")
+            )
+        except NotFoundError as e:
+            return make_json_response(str(e), 404)
+        parent, child, admission = found["parent"], found["child"], found["admission"]
 
         # Ensure valid relationship (either parent or child)
-        if validation_result is None:
+        if parent is None and child is None:
             return make_json_response(
                 "Medication must belong to either a parent or child, not both", 400
             )
 
-        # Verify Provider exists
-        provider = Provider.query.filter_by(provider_id=provider_id)
-        admission = Admission.query.filter_by(admission_id=admission_id)
-        if not provider:
-            return make_json_response("Provider not found", 404)
-
-        if not admission:
-            return make_response(jsonify({"msg": "Admission not found"}), 404)
-
         try:
             summary = Discharge_summary(
                 admission_id=admission.admission_id,
@@ -56,9 +48,9 @@ class DischargeSummaryAPI(Resource):
                 ),
                 discharge_diagnosis=data["discharge_diagnosis"],
                 procedure=data.get("procedure"),
-                parent_id=validation_result.get("parent", {}).get("parent_id"),
-                child_id=validation_result.get("child", {}).get("child_id"),
-                provider_id=data["provider_id"],
+                parent_id=parent.parent_id if parent else None,
+                child_id=None if parent else child.child_id,
+                provider_id=found["provider"].provider_id,
             )
             db.session.add(summary)
             db.session.commit()
@@ -129,34 +121,16 @@ class DischargeSummaryAPI(Resource):
 
 class DischargeForParent(Resource):
     def get(self, id):
-        discharges = [
-            d.to_dict() for d in Discharge_summary.query.filter_by(parent_id=id).all()
-        ]
-        if discharges:
-            response = make_response(jsonify(discharges), 200)
-            return response
+        return paginated_response(
+            Discharge_summary.query.filter_by(parent_id=id), Discharge_summary
+        )
 
 
 class DischargeForProvider(Resource):
     def get(self, id):
-        discharges = [
-            d.to_dict() for d in Discharge_summary.query.filter_by(provider_id=id).all()
-        ]
-        if discharges:
-            response = make_response(jsonify(discharges), 200)
-            return response
-
-
-def find_parent_or_child(parent_id=None, child_certificate_no=None):
-    if parent_id:
-        parent = Parent.query.get(parent_id)
-        if parent:
-            return {"parent": parent}
-    elif child_certificate_no:
-        child = Child.query.filter_by(certificate_No=child_certificate_no).first()
-        if child:
-            return {"child": child}
-    return None
+        return paginated_response(
+            Discharge_summary.query.filter_by(provider_id=id), Discharge_summary
+        )
 
 
 def make_json_response(message, status_code=200):
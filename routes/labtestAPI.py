@@ -5,17 +5,18 @@ from flask import jsonify, make_response, request
 from flask_restful import Resource
 from models import Child, LabTest, Parent
 from sqlalchemy.exc import IntegrityError
+from utils.loading import eager_query
+from utils.pagination import paginated_response
+from utils.resolver import NotFoundError, resolve
 
 
 class LabTestAPI(Resource):
 
     def get(self, id=None):
         if id is None:
-            lab_tests = LabTest.query.all()
-            lab_test_list = [lab_test.to_dict() for lab_test in lab_tests]
-            return make_response(jsonify(lab_test_list), 200)
+            return paginated_response(LabTest.query, LabTest)
         else:
-            lab_test = LabTest.query.get(id)
+            lab_test = eager_query(LabTest).get(id)
             if not lab_test:
                 return make_response(jsonify({"msg": "Lab test not found"}), 404)
             return make_response(jsonify(lab_test.to_dict()), 200)
@@ -25,12 +26,13 @@ class LabTestAPI(Resource):
         if not data:
             return make_json_response("No input data provided", 400)
 
-        validation_result = find_parent_or_child(
-            parent_id=data.get("parent_id"),
-            child_certificate_no=data.get("child_certificate_no"),
-        )
+        try:
+            found = resolve(data, optional=("parent", "child"))
+        except NotFoundError as e:
+            return make_json_response(str(e), 404)
+        parent, child = found["parent"], found["child"]
 
-        if validation_result is None:
+        if parent is None and child is None:
             return make_json_response(
                 "Lab test must belong to either parent or child, not both", 400
             )
@@ -42,8 +44,8 @@ class LabTestAPI(Resource):
                 test_date=test_date,
                 result=data["result"],
                 remarks=data.get("remarks"),
-                parent_id=validation_result.get("parent", {}).get("parent_id"),
-                child_id=validation_result.get("child", {}).get("child_id"),
+                parent_id=parent.parent_id if parent else None,
+                child_id=None if parent else child.child_id,
             )
             db.session.add(lab_test)
             db.session.commit()
@@ -123,38 +125,17 @@ class LabTestAPI(Resource):
 
 class LabTestsForParents(Resource):
     def get(self, id):
-        labtests = [a.to_dict() for a in LabTest.query.filter_by(parent_id=id).all()]
-        if labtests:
-            response = make_response(jsonify(labtests), 200)
-            return response
+        return paginated_response(LabTest.query.filter_by(parent_id=id), LabTest)
 
 
 class LabTestsForProviders(Resource):
     def get(self, id):
-        labtests = [a.to_dict() for a in LabTest.query.filter_by(provider_id=id).all()]
-        if labtests:
-            response = make_response(jsonify(labtests), 200)
-            return response
+        return paginated_response(LabTest.query.filter_by(provider_id=id), LabTest)
 
 
 class LabTestsForChild(Resource):
     def get(self, id):
-        labtests = [a.to_dict() for a in LabTest.query.filter_by(child_id=id).all()]
-        if labtests:
-            response = make_response(jsonify(labtests), 200)
-            return response
-
-
-def find_parent_or_child(parent_id=None, child_certificate_no=None):
-    if parent_id:
-        parent = Parent.query.get(parent_id)
-        if parent:
-            return {"parent": parent}
-    elif child_certificate_no:
-        child = Child.query.filter_by(certificate_No=child_certificate_no).first()
-        if child:
-            return {"child": child}
-    return None
+        return paginated_response(LabTest.query.filter_by(child_id=id), LabTest)
 
 
 def make_json_response(message, status_code=200):
@@ -1,8 +1,11 @@
 from flask_restful import Resource
 from flask import request, jsonify, make_response
-from models import Medical_info_parent, Parent
+from models import Medical_info_parent
 from config import db
 from sqlalchemy.exc import IntegrityError
+from utils.loading import eager_query
+from utils.pagination import paginated_response
+from utils.resolver import NotFoundError, resolve
 
 # from datetime import datetime
 
@@ -10,10 +13,9 @@ from sqlalchemy.exc import IntegrityError
 class MedicalInfoParentAPI(Resource):
     def get(self, id=None):
         if id is None:
-            medical_info = [info.to_dict() for info in Medical_info_parent.query.all()]
-            return make_response(jsonify(medical_info), 200)
+            return paginated_response(Medical_info_parent.query, Medical_info_parent)
         else:
-            info = Medical_info_parent.query.filter_by(history_id=id).first()
+            info = eager_query(Medical_info_parent).filter_by(history_id=id).first()
             if not info:
                 return jsonify({"msg": "Medical info not found"}), 404
             return make_response(jsonify(info.to_dict()), 200)
@@ -23,10 +25,10 @@ class MedicalInfoParentAPI(Resource):
         if not data:
             return make_response(jsonify({"msg": "No input provided"}), 400)
 
-        national_id = data["national_id"]
-        parent = Parent.query.filter_by(national_id=national_id).first()
-        if not parent:
-            return make_response(jsonify({"msg": "Parent not found"}), 404)
+        try:
+            parent = resolve(data, "parent")["parent"]
+        except NotFoundError as e:
+            return make_response(jsonify({"msg": str(e)}), 404)
 
         try:
             info = Medical_info_parent(
@@ -87,9 +89,6 @@ class MedicalInfoParentAPI(Resource):
 
 class MedicalInfoForParent(Resource):
     def get(self, id):
-        medinfo = [
-            m.to_dict() for m in Medical_info_parent.query.filter_by(parent_id=id).all()
-        ]
-        if medinfo:
-            response = make_response(jsonify(medinfo), 200)
-            return response
+        return paginated_response(
+            Medical_info_parent.query.filter_by(parent_id=id), Medical_info_parent
+        )
@@ -1,17 +1,19 @@
 from flask_restful import Resource
 from flask import request, jsonify, make_response
-from models import Child, Medications, Parent, Provider
+from models import Medications, Parent, Provider
 from config import db
 from sqlalchemy.exc import IntegrityError
+from utils.loading import eager_query
+from utils.pagination import paginated_response
+from utils.resolver import NotFoundError, resolve
 
 
 class MedicationsAPI(Resource):
     def get(self, id=None):
         if id is None:
-            medications = [med.to_dict() for med in Medications.query.all()]
-            return make_response(jsonify(medications), 200)
+            return paginated_response(Medications.query, Medications)
         else:
-            medication = Medications.query.filter_by(medication_id=id).first()
+            medication = eager_query(Medications).filter_by(medication_id=id).first()
             if not medication:
                 return jsonify({"msg": "Medication not found"}), 404
             return make_response(jsonify(medication.to_dict()), 200)
@@ -21,23 +23,18 @@ class MedicationsAPI(Resource):
         if not data:
             return make_json_response("No input data provided", 400)
 
-        # Validate responsible party (parent or child) using find_parent_or_child
-        validation_result = find_parent_or_child(
-            parent_id=data.get("parent_id"),
-            child_certificate_no=data.get("child_certificate_no"),
-        )
+        try:
+            found = resolve(data, "provider", optional=("parent", "child"))
+        except NotFoundError as e:
+            return make_json_response(str(e), 404)
+        parent, child = found["parent"], found["child"]
 
         # Ensure valid relationship (either parent or child)
-        if validation_result is None:
+        if parent is None and child is None:
             return make_json_response(
                 "Medication must belong to either a parent or child, not both", 400
             )
 
-        # Verify Provider exists
-        provider = Provider.query.get(data.get("provider_id"))
-        if not provider:
-            return make_json_response("Provider not found", 404)
-
         # Create medication record
         try:
             medication = Medications(
@@ -47,9 +44,9 @@ class MedicationsAPI(Resource):
                 route=data.get("route"),
                 dose_per_day=data.get("dose_per_day"),
                 referral=data.get("referral"),
-                provider_id=data["provider_id"],
-                parent_id=validation_result.get("parent", {}).get("parent_id"),
-                child_id=validation_result.get("child", {}).get("child_id"),
+                provider_id=found["provider"].provider_id,
+                parent_id=parent.parent_id if parent else None,
+                child_id=None if parent else child.child_id,
             )
             db.session.add(medication)
             db.session.commit()
@@ -112,38 +109,21 @@ class MedicationsAPI(Resource):
 
 class MedicationForParents(Resource):
     def get(self, id):
-        meds = [a.to_dict() for a in Medications.query.filter_by(parent_id=id).all()]
-        if meds:
-            response = make_response(jsonify(meds), 200)
-            return response
+        return paginated_response(
+            Medications.query.filter_by(parent_id=id), Medications
+        )
 
 
 class MedicationForProviders(Resource):
     def get(self, id):
-        meds = [a.to_dict() for a in Medications.query.filter_by(provider_id=id).all()]
-        if meds:
-            response = make_response(jsonify(meds), 200)
-            return response
+        return paginated_response(
+            Medications.query.filter_by(provider_id=id), Medications
+        )
 
 
 class MedicationForChild(Resource):
     def get(self, id):
-        meds = [a.to_dict() for a in Medications.query.filter_by(child_id=id).all()]
-        if meds:
-            response = make_response(jsonify(meds), 200)
-            return response
-
-
-def find_parent_or_child(parent_id=None, child_certificate_no=None):
-    if parent_id:
-        parent = Parent.query.get(parent_id)
-        if parent:
-            return {"parent": parent}
-    elif child_certificate_no:
-        child = Child.query.filter_by(certificate_No=child_certificate_no).first()
-        if child:
-            return {"child": child}
-    return None
+        return paginated_response(Medications.query.filter_by(child_id=id), Medications)
 
 
 def make_json_response(message, status_code=200):
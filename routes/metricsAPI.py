@@ -0,0 +1,42 @@
+from flask import jsonify, make_response, request
+from flask_jwt_extended import jwt_required
+from flask_restful import Resource
+
+from config import db
+from utils.customs import role_required
+from utils.db_pool import pool_stats
+from utils.slow_queries import slow_log
+from utils.sql_metrics import metrics as sql_metrics
+
+
+class PoolMetricsAPI(Resource):
+    @jwt_required()
+    @role_required(["admin"])
+    def get(self):
+        return make_response(jsonify(pool_stats(db.engine)), 200)
+
+
+class SQLMetricsAPI(Resource):
+    @jwt_required()
+    @role_required(["admin"])
+    def get(self):
+        limit = request.args.get("limit", 50, type=int)
+        return make_response(jsonify({"routes": sql_metrics.snapshot(limit)}), 200)
+
+
+class SlowQueriesAPI(Resource):
+    @jwt_required()
+    @role_required(["admin"])
+    def get(self):
+        limit = request.args.get("limit", 20, type=int)
+        return make_response(
+            jsonify(
+                {
+                    "threshold_ms": slow_log.threshold * 1000
+                    if slow_log.threshold is not None
+                    else None,
+                    "statements": slow_log.top(limit),
+                }
+            ),
+            200,
+        )
@@ -4,16 +4,16 @@ from models import Parent
 from config import db
 from sqlalchemy.exc import IntegrityError
 from werkzeug.security import generate_password_hash
+from utils.loading import eager_query
+from utils.pagination import paginated_response
 
 
 class parentsAPI(Resource):
     def get(self, id=None):
         if id is None:
-            parents = [p.to_dict() for p in Parent.query.all()]
-            response = make_response(jsonify(parents), 200)
-            return response
+            return paginated_response(Parent.query, Parent)
         else:
-            parent = Parent.query.filter_by(parent_id=id).first()
+            parent = eager_query(Parent).filter_by(parent_id=id).first()
             if parent:
                 response = make_response(jsonify(parent.to_dict()), 200)
                 return response
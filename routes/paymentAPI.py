@@ -2,19 +2,21 @@ from flask import make_response, request, jsonify
 from flask_restful import Resource
 from config import db
 from models import Payment, Parent
+from utils.loading import eager_query
+from utils.pagination import paginated_response
+from utils.resolver import NotFoundError, resolve
 
 
 class PaymentAPI(Resource):
 
     def get(self, payment_id=None):
         if payment_id:
-            payment = Payment.query.filter_by(payment_id=payment_id).first()
+            payment = eager_query(Payment).filter_by(payment_id=payment_id).first()
             if not payment:
                 return make_response(jsonify({"msg": "Payment not found"}), 404)
             return make_response(jsonify(payment.to_dict()), 200)
         else:
-            payments = Payment.query.all()
-            return jsonify([payment.to_dict() for payment in payments])
+            return paginated_response(Payment.query, Payment)
 
     # POST method to create a new payment
     def post(self):
@@ -30,12 +32,15 @@ class PaymentAPI(Resource):
             return make_response(jsonify({"msg": "Missing fields"}), 400)
 
         try:
-            parent = Parent.query.filter_by(parent_id=parent_id).first()
-            if not parent:
-                return make_response(jsonify({"msg": "Parent not found"}), 404)
+            parent = resolve(data, "parent")["parent"]
+        except NotFoundError as e:
+            return make_response(jsonify({"msg": str(e)}), 404)
 
+        try:
             payment = Payment(
-                parent_id=parent_id, amount=amount, payment_method=payment_method
+                parent_id=parent.parent_id,
+                amount=amount,
+                payment_method=payment_method,
             )
 
             db.session.add(payment)
@@ -1,21 +1,23 @@
 from flask_restful import Resource
 from flask import request, jsonify, make_response
-from models import Present_pregnancy, Parent
+from models import Present_pregnancy
 from config import db
 from sqlalchemy.exc import IntegrityError
 from datetime import datetime
+from utils.loading import eager_query
+from utils.pagination import paginated_response
+from utils.resolver import NotFoundError, resolve
 
 
 class PresentPregnancyAPI(Resource):
     def get(self, id=None):
         if id is None:
-            pregnancies = [
-                preg.to_dict()
-                for preg in Present_pregnancy.query.filter_by(is_delivered=False).all()
-            ]
-            return make_response(jsonify(pregnancies), 200)
+            return paginated_response(
+                Present_pregnancy.query.filter_by(is_delivered=False),
+                Present_pregnancy,
+            )
         else:
-            pregnancy = Present_pregnancy.query.filter_by(
+            pregnancy = eager_query(Present_pregnancy).filter_by(
                 pp_id=id, is_delivered=False
             ).first()
             if not pregnancy:
@@ -26,15 +28,12 @@ class PresentPregnancyAPI(Resource):
         data = request.json
         if not data:
             return make_response(jsonify({"msg": "No input provided"}), 400)
-        national_id = data["national_id"]
-        provider_id = data["provider_id"]
-
-        parent = Parent.query.filter_by(national_id=national_id).first()
-        if not parent:
-            return make_response(jsonify({"msg": "Parent not found"}), 404)
-        provider = Parent.query.filter_by(provider_id=provider_id).first()
-        if not provider:
-            return make_response(jsonify({"msg": "Provider not found"}), 404)
+        try:
+            found = resolve(data, "parent", "provider")
+        except NotFoundError as e:
+            return make_response(jsonify({"msg": str(e)}), 404)
+        parent, provider = found["parent"], found["provider"]
+
         present_pregnancy = Present_pregnancy.query.filter_by(
             parent_id=parent.parent_id, is_delivered=False
         ).first()
@@ -122,34 +121,27 @@ class PresentPregnancyAPI(Resource):
 
 class PresentPregnancyForParent(Resource):
     def get(self, id):
-        pregnancies = [
-            p.to_dict() for p in Present_pregnancy.query.filter_by(parent_id=id).all()
-        ]
-        if pregnancies:
-            response = make_response(jsonify(pregnancies), 200)
-            return response
+        return paginated_response(
+            Present_pregnancy.query.filter_by(parent_id=id), Present_pregnancy
+        )
 
 
 class PresentPregnancyForProvider(Resource):
     def get(self, id):
-        pregnancies = [
-            p.to_dict() for p in Present_pregnancy.query.filter_by(provider_id=id).all()
-        ]
-        if pregnancies:
-            response = make_response(jsonify(pregnancies), 200)
-            return response
+        return paginated_response(
+            Present_pregnancy.query.filter_by(provider_id=id), Present_pregnancy
+        )
 
 
 class PreviousPregnancyAPI(Resource):
     def get(self, id=None):
         if id is None:
-            pregnancies = [
-                preg.to_dict()
-                for preg in Present_pregnancy.query.filter_by(is_delivered=True).all()
-            ]
-            return make_response(jsonify(pregnancies), 200)
+            return paginated_response(
+                Present_pregnancy.query.filter_by(is_delivered=True),
+                Present_pregnancy,
+            )
         else:
-            pregnancy = Present_pregnancy.query.filter_by(
+            pregnancy = eager_query(Present_pregnancy).filter_by(
                 pp_id=id, is_delivered=True
             ).first()
             if not pregnancy:
@@ -159,25 +151,15 @@ class PreviousPregnancyAPI(Resource):
 
 class PreviousPregnancyForParent(Resource):
     def get(self, id):
-        pregnancies = [
-            p.to_dict()
-            for p in Present_pregnancy.query.filter_by(
-                parent_id=id, is_delivered=True
-            ).all()
-        ]
-        if pregnancies:
-            response = make_response(jsonify(pregnancies), 200)
-            return response
+        return paginated_response(
+            Present_pregnancy.query.filter_by(parent_id=id, is_delivered=True),
+            Present_pregnancy,
+        )
 
 
 class PreviousPregnancyForProvider(Resource):
     def get(self, id):
-        pregnancies = [
-            p.to_dict()
-            for p in Present_pregnancy.query.filter_by(
-                provider_id=id, is_delivered=True
-            ).all()
-        ]
-        if pregnancies:
-            response = make_response(jsonify(pregnancies), 200)
-            return response
+        return paginated_response(
+            Present_pregnancy.query.filter_by(provider_id=id, is_delivered=True),
+            Present_pregnancy,
+        )
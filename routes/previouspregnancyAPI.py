@@ -1,8 +1,11 @@
 from flask_restful import Resource
 from flask import request, jsonify, make_response
-from models import Previous_pregnancy, Parent, Provider
+from models import Previous_pregnancy
 from config import db
 from sqlalchemy.exc import IntegrityError
+from utils.loading import eager_query
+from utils.pagination import paginated_response
+from utils.resolver import NotFoundError, resolve
 
 # from datetime import datetime
 
@@ -10,10 +13,9 @@ from sqlalchemy.exc import IntegrityError
 class PreviousPregnancyAPI(Resource):
     def get(self, id=None):
         if id is None:
-            pregnancies = [preg.to_dict() for preg in Previous_pregnancy.query.all()]
-            return make_response(jsonify(pregnancies), 200)
+            return paginated_response(Previous_pregnancy.query, Previous_pregnancy)
         else:
-            pregnancy = Previous_pregnancy.query.filter_by(pp_id=id).first()
+            pregnancy = eager_query(Previous_pregnancy).filter_by(pp_id=id).first()
             if not pregnancy:
                 return jsonify({"msg": "Previous pregnancy not found"}), 404
             return make_response(jsonify(pregnancy.to_dict()), 200)
@@ -23,18 +25,11 @@ class PreviousPregnancyAPI(Resource):
         if not data:
             return make_response(jsonify({"msg": "No input provided"}), 400)
 
-        national_id = data.get("national_id")
-        parent_id = data.get("parent_id")
-        parent = (
-            Parent.query.filter_by(national_id=national_id).first()
-            or Parent.query.filter_by(parent_id=parent_id).first()
-        )
-        provider = Provider.query.get(data.get("provider_id"))
-
-        if not parent:
-            return make_response(jsonify({"msg": "Parent not found"}), 404)
-        if not provider:
-            return make_response(jsonify({"msg": "Provider not found"}), 404)
+        try:
+            found = resolve(data, "parent", "provider")
+        except NotFoundError as e:
+            return make_response(jsonify({"msg": str(e)}), 404)
+        parent, provider = found["parent"], found["provider"]
 
         try:
             pregnancy = Previous_pregnancy(
@@ -98,20 +93,13 @@ class PreviousPregnancyAPI(Resource):
 
 class PreviousPregnancyForParent(Resource):
     def get(self, id):
-        pregnancies = [
-            p.to_dict() for p in Previous_pregnancy.query.filter_by(parent_id=id).all()
-        ]
-        if pregnancies:
-            response = make_response(jsonify(pregnancies), 200)
-            return response
+        return paginated_response(
+            Previous_pregnancy.query.filter_by(parent_id=id), Previous_pregnancy
+        )
 
 
 class PreviousPregnancyForProvider(Resource):
     def get(self, id):
-        pregnancies = [
-            p.to_dict()
-            for p in Previous_pregnancy.query.filter_by(provider_id=id).all()
-        ]
-        if pregnancies:
-            response = make_response(jsonify(pregnancies), 200)
-            return response
+        return paginated_response(
+            Previous_pregnancy.query.filter_by(provider_id=id), Previous_pregnancy
+        )
@@ -4,20 +4,16 @@ from models import Provider
 from config import db
 from sqlalchemy.exc import IntegrityError
 from werkzeug.security import generate_password_hash
+from utils.loading import eager_query
+from utils.pagination import paginated_response
 
 
 class providersAPI(Resource):
     def get(self, id=None):
         if id is None:
-            providers = [p.to_dict() for p in Provider.query.all()]
-            for provider in providers:
-                for appointment in provider.get("appointments", []):
-                    if "info" in appointment:
-                        del appointment["info"]
-            response = make_response(jsonify(providers), 200)
-            return response
+            return paginated_response(Provider.query, Provider)
         else:
-            provider = Provider.query.filter_by(provider_id=id).first()
+            provider = eager_query(Provider).filter_by(provider_id=id).first()
             if not provider:
                 return {"message": "Provider not found"}, 404
             provider_dict = provider.to_dict()
@@ -2,17 +2,23 @@ from config import db
 from flask_restful import Resource
 from models import Record, Child, Parent, Provider, Vaccine
 from flask import make_response, jsonify, request
+from sqlalchemy import insert, or_, select
 from sqlalchemy.exc import IntegrityError
+from utils.loading import eager_query
+from utils.pagination import paginated_response
+from utils.resolver import NotFoundError, resolve
+
+# One immunisation session's worth; keeps the IN lists and the insert to a
+# handful of statements
+MAX_BULK_RECORDS = 500
 
 
 class RecordsApi(Resource):
     def get(self, id=None):
         if id is None:
-            records = [r.to_dict() for r in Record.query.all()]
-            response = make_response(jsonify(records), 200)
-            return response
+            return paginated_response(Record.query, Record, streamable=True)
         else:
-            record = Record.query.filter_by(parent_id=id).first()
+            record = eager_query(Record).filter_by(parent_id=id).first()
             response = make_response(jsonify(record), 200)
             return response
 
@@ -25,7 +31,6 @@ class RecordsApi(Resource):
         child_id = data.get("child_id")
         national_id = data.get("national_id")
         child_certificate_no = data.get("child_certificate_no")
-        provider_id = data["provider_id"]
         vaccine_id = data["vaccine_id"]
 
         if not (parent_id or national_id) or not (child_certificate_no or child_id):
@@ -33,27 +38,11 @@ class RecordsApi(Resource):
                 jsonify({"msg": "Parent ID and Child Certificate No are required"}), 400
             )
 
-        parent = (
-            Parent.query.filter_by(parent_id=parent_id).first()
-            or Parent.query.filter_by(national_id=national_id).first()
-        )
-        if not parent:
-            return make_response(jsonify({"msg": "Parent not found"}), 404)
-
-        child = (
-            Child.query.filter_by(certificate_No=child_certificate_no).first()
-            or Child.query.filter_by(child_id=child_id).first()
-        )
-        if not child:
-            return make_response(jsonify({"msg": "Child not found"}), 404)
-
-        provider = Provider.query.filter_by(provider_id=provider_id).first()
-        if not provider:
-            return make_response(jsonify({"msg": "Provider not found"}), 404)
-
-        vaccine = Vaccine.query.filter_by(vaccine_id=vaccine_id).first()
-        if not vaccine:
-            return make_response(jsonify({"msg": "Vaccine not found"}), 404)
+        try:
+            found = resolve(data, "parent", "child", "provider", "vaccine")
+        except NotFoundError as e:
+            return make_response(jsonify({"msg": str(e)}), 404)
+        parent, child, provider = found["parent"], found["child"], found["provider"]
 
         if child.parent_id != parent.parent_id:
             return make_response(
@@ -125,17 +114,161 @@ class RecordsApi(Resource):
         return make_response(jsonify({"msg": "Record deleted sucesfully"}), 200)
 
 
+def _as_int(value):
+    if value is None or value == "" or isinstance(value, bool):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class RecordsBulkAPI(Resource):
+    def post(self):
+        """Creates one vaccination record per entry of ``records`` for the
+        payload's ``provider_id``. Each entry names a child by ``child_id``
+        or ``child_certificate_no`` and a ``vaccine_id``; the parent is the
+        child's.
+
+        Children and vaccines are validated with one query each and the
+        valid entries are inserted in a single executemany, so the cost no
+        longer grows by a handful of round trips per record. Invalid entries
+        are reported in ``results`` (in request order) without failing the
+        rest.
+        """
+        data = request.json
+        if not data:
+            return make_response(jsonify({"msg": "No input provided"}), 400)
+
+        items = data.get("records")
+        if not isinstance(items, list) or not items:
+            return make_response(
+                jsonify({"msg": "records must be a non-empty list"}), 400
+            )
+        if len(items) > MAX_BULK_RECORDS:
+            return make_response(
+                jsonify({"msg": f"At most {MAX_BULK_RECORDS} records per request"}),
+                400,
+            )
+
+        try:
+            provider = resolve(data, "provider")["provider"]
+        except NotFoundError as e:
+            return make_response(jsonify({"msg": str(e)}), 404)
+
+        results = [None] * len(items)
+        wanted = []
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                item = {}
+            certificate = _as_int(
+                item.get("child_certificate_no", item.get("certificate_No"))
+            )
+            child_id = _as_int(item.get("child_id"))
+            vaccine_id = _as_int(item.get("vaccine_id"))
+            if (certificate is None and child_id is None) or vaccine_id is None:
+                results[index] = {
+                    "index": index,
+                    "status": 400,
+                    "msg": "Child and vaccine_id are required",
+                }
+                continue
+            wanted.append((index, certificate, child_id, vaccine_id))
+
+        certificates = {w[1] for w in wanted if w[1] is not None}
+        child_ids = {w[2] for w in wanted if w[2] is not None}
+        children = db.session.execute(
+            select(Child.child_id, Child.certificate_No, Child.parent_id).where(
+                or_(
+                    Child.certificate_No.in_(certificates),
+                    Child.child_id.in_(child_ids),
+                )
+            )
+        ).all()
+        by_certificate = {row.certificate_No: row for row in children}
+        by_id = {row.child_id: row for row in children}
+        vaccines = set(
+            db.session.scalars(
+                select(Vaccine.vaccine_id).where(
+                    Vaccine.vaccine_id.in_({w[3] for w in wanted})
+                )
+            )
+        )
+
+        rows = []
+        indexes = {}
+        for index, certificate, child_id, vaccine_id in wanted:
+            # The certificate wins over child_id, as in the single-record path
+            child = by_certificate.get(certificate) or by_id.get(child_id)
+            if child is None:
+                error = (404, "Child not found")
+            elif vaccine_id not in vaccines:
+                error = (404, "Vaccine not found")
+            elif (child.child_id, vaccine_id) in indexes:
+                error = (409, "Duplicate entry in this request")
+            else:
+                indexes[child.child_id, vaccine_id] = index
+                rows.append(
+                    {
+                        "parent_id": child.parent_id,
+                        "child_id": child.child_id,
+                        "vaccine_id": vaccine_id,
+                        "provider_id": provider.provider_id,
+                    }
+                )
+                continue
+            results[index] = {"index": index, "status": error[0], "msg": error[1]}
+
+        try:
+            if rows:
+                # RETURNING order isn't guaranteed across a multi-row
+                # insert, but (child, vaccine) is unique within the batch
+                created = db.session.execute(
+                    insert(Record).returning(
+                        Record.record_id, Record.child_id, Record.vaccine_id
+                    ),
+                    rows,
+                ).all()
+                db.session.commit()
+                for record_id, child_id, vaccine_id in created:
+                    index = indexes[child_id, vaccine_id]
+                    results[index] = {
+                        "index": index,
+                        "status": 201,
+                        "record_id": record_id,
+                    }
+        except IntegrityError:
+            db.session.rollback()
+            return make_response(jsonify({"msg": "Integrity constraint failed"}), 400)
+        except Exception as e:
+            db.session.rollback()
+            return make_response(jsonify({"msg": str(e)}), 500)
+
+        created = len(rows)
+        if created == len(items):
+            status = 201
+        elif created:
+            status = 207
+        else:
+            status = 400
+        return make_response(
+            jsonify(
+                {
+                    "msg": f"{created} of {len(items)} records created",
+                    "created": created,
+                    "failed": len(items) - created,
+                    "results": results,
+                }
+            ),
+            status,
+        )
+
+
 class VaccinationRecordsForParent(Resource):
     def get(self, id):
-        records = [r.to_dict() for r in Record.query.filter_by(parent_id=id).all()]
-        if records:
-            response = make_response(jsonify(records), 200)
-            return response
+        return paginated_response(Record.query.filter_by(parent_id=id), Record)
 
 
 class VaccinationRecordsForProvider(Resource):
     def get(self, id):
-        records = [r.to_dict() for r in Record.query.filter_by(provider_id=id).all()]
-        if records:
-            response = make_response(jsonify(records), 200)
-            return response
+        return paginated_response(Record.query.filter_by(provider_id=id), Record)
@@ -1,16 +1,15 @@
 import email
-import os
 import secrets
 from datetime import datetime, timedelta
 from sqlite3 import IntegrityError
-from venv import logger
 
-from config import db, mail
+from config import db
 from dotenv import load_dotenv
 from flask import jsonify, make_response, request
-from flask_mail import Message
 from flask_restful import Resource
 from models import Parent, Provider, ResetToken, User
+from utils.email_templates import render
+from utils.outbox import queue_email
 from werkzeug.security import generate_password_hash
 import random
 
@@ -77,70 +76,21 @@ class ForgotPassword(Resource):
             reset_token_entry.provider_id = entity_id
 
         db.session.add(reset_token_entry)
+        reset_link = f"http://localhost:4000/reset_password?token={reset_token}"
+        queue_email(
+            email,
+            *render(
+                "password_reset",
+                email=email,
+                reset_link=reset_link,
+                expires_in="1 hour",
+            ),
+        )
         db.session.commit()
-        try:
-            reset_link = f"http://localhost:4000/reset_password?token={reset_token}"
-            expiration_time = "1 hour"
-
-            html_body = f"""
-            <div
-              style="width: 100%;background: #ebf2fa;padding: 20px 0 0 0;font-family: system-ui, sans-serif; text-align: center;">
-              <div
-              style="border-top: 6px solid #007BFF; background-color: #fff; display: block; padding:  8px 20px; text-align: center;   max-width: 500px;  border-bottom-left-radius: .4rem; border-bottom-right-radius: .4rem; letter-spacing: .037rem; line-height: 26px;  margin: auto; font-size: 14px; ">
-              <!-- Logo -->
-              <img src="https://res.cloudinary.com/droynil1n/image/upload/v1728204000/e50iplialg1fawi16enn.png"
-                  alt="Happy Hearts Logo" style="width: 70%; height: auto; margin:auto">
-              <!-- Content Section -->
-              <div style="text-align: left; padding-top: 10px;">
-                  <p>We've received a request to reset the password for the Happy Hearts account associated with {email}.
-                  Please note that no changes have been made to your account yet. We recommend resetting your password
-                  immediately
-                  to ensure the security of your account.</p>
-                  <p>Click the button below to reset your password:</p>
-              </div>
-              <!-- Button -->
-              <a href='{reset_link}'
-                  style='display: inline-block;width:90%; padding: 8px 20px;  color: white; background: linear-gradient(to bottom right, rgba(33,121,243,1) 25%, rgba(65,202,227,1) 100%); text-decoration: none; border-radius: .4rem;'>
-                  Reset Password
-              </a>
-              <!-- Additional Information -->
-              <div style="text-align: center; padding-top: 2px;">
-                  <p>This link will expire in <strong>{expiration_time}</strong>.</p>
-                  <p> For assistance, reach us at
-                  <a href='mailto:{os.getenv(' MAIL_USERNAME')}'
-                      style='color: #007BFF; text-decoration: underline;'>{os.getenv('MAIL_USERNAME')}</a>.
-                  </p>
-              </div>
-              </div>
-              <p style="padding: 20px 0 5px 0; text-align: center;color: rgb(150, 150, 150);font-size: 12px;">Happy Hearts
-              Community
-              </p>
-          </div>"""
-
-            # Create message
-            msg = Message(
-                subject="Reset Your Password",
-                sender=os.getenv("MAIL_USERNAME"),
-                recipients=[email],
-                html=html_body,
-            )
-
-            mail.send(msg)
 
-            return make_response(
-                jsonify({"message": "Password reset link sent to your email"}), 200
-            )
-        except Exception as e:
-            logger.error(f"Error sending password reset email: {e}")
-            db.session.rollback()
-            return make_response(
-                jsonify(
-                    {
-                        "error": "An error occurred while sending the email. Please try again later."
-                    }
-                ),
-                500,
-            )
+        return make_response(
+            jsonify({"message": "Password reset link sent to your email"}), 200
+        )
 
 
 class ResetPassword(Resource):
@@ -266,65 +216,16 @@ class EmailChange(Resource):
 
         # Save token to the database
         db.session.add(reset_token_entry)
-        db.session.commit()
-
-        try:
 
-            expiration_time = "1 hour"
-
-            html_body = f"""
-                    <div
-                    style="width: 100%;background: #ebf2fa;padding: 20px 0 0 0;font-family: system-ui, sans-serif; text-align: center;">
-                    <div
-                    style="border-top: 6px solid #007BFF; background-color: #fff; display: block; padding:  8px 20px; text-align: center;   max-width: 500px;  border-bottom-left-radius: .4rem; border-bottom-right-radius: .4rem; letter-spacing: .037rem; line-height: 26px;  margin: auto; font-size: 14px; ">
-                    <!-- Logo -->
-                    <img src="https://res.cloudinary.com/droynil1n/image/upload/v1728204000/e50iplialg1fawi16enn.png"
-                        alt="Happy Hearts Logo" style="width: 70%; height: auto; margin:auto">
-                    <!-- Content Section -->
-                    <div style="text-align: left; padding-top: 10px;">
-                        <p style="text-align: center;">You have requested to change your email address, to confirm change please enter the provided code
-                        </p>
-                    </div>
-                        <h1>{reset_token}</h1>
-
-                    <!-- Additional Information -->
-                    <div style="text-align: center; padding-top: 2px;">
-                        <p>Code  expires in <strong>{expiration_time}</strong>.</p>
-                        <p> For assistance, reach us at
-                        <a href='mailto:{os.getenv(' MAIL_USERNAME')}'
-                            style='color: #007BFF; text-decoration: underline;'>{os.getenv('MAIL_USERNAME')}</a>.
-                        </p>
-                    </div>
-                    </div>
-                    <p style="padding: 20px 0 5px 0; text-align: center;color: rgb(150, 150, 150);font-size: 12px;">Happy Hearts
-                    Community
-                    </p>
-                    </div>"""
-
-            # Create message
-            msg = Message(
-                subject="Email Verification",
-                sender=os.getenv("MAIL_USERNAME"),
-                recipients=[entity_email],
-                html=html_body,
-            )
-
-            mail.send(msg)
+        queue_email(
+            entity_email,
+            *render("email_change_code", code=reset_token, expires_in="1 hour"),
+        )
+        db.session.commit()
 
-            return make_response(
-                jsonify({"msg": " verification code sent to your old email"}), 201
-            )
-        except Exception as e:
-            logger.error(f"Error sending password reset email: {e}")
-            db.session.rollback()
-            return make_response(
-                jsonify(
-                    {
-                        "error": "An error occurred while sending the email. Please try again later."
-                    }
-                ),
-                500,
-            )
+        return make_response(
+            jsonify({"msg": " verification code sent to your old email"}), 201
+        )
 
     def get_unique_reset_token(self):
         """Generates a unique 5-digit reset token."""
@@ -382,53 +283,11 @@ class EmailChange(Resource):
             if entity:
                 entity.email = email
                 db.session.delete(reset_token_entry)
-                db.session.commit()
-            try:
-
-                html_body = f"""
-                        <div
-                        style="width: 100%;background: #ebf2fa;padding: 20px 0 0 0;font-family: system-ui, sans-serif; text-align: center;">
-                        <div
-                        style="border-top: 6px solid #007BFF; background-color: #fff; display: block; padding:  8px 20px; text-align: center;   max-width: 500px;  border-bottom-left-radius: .4rem; border-bottom-right-radius: .4rem; letter-spacing: .037rem; line-height: 26px;  margin: auto; font-size: 14px; ">
-                        <!-- Logo -->
-                        <img src="https://res.cloudinary.com/droynil1n/image/upload/v1728204000/e50iplialg1fawi16enn.png"
-                            alt="Happy Hearts Logo" style="width: 70%; height: auto; margin:auto">
-                        <!-- Content Section -->
-                        <div style="text-align: left; padding-top: 10px;">
-                            <p style="text-align: center;">Email has been updated sucessfully. This will be the new channel of infomation future updates and logins</p>
-                        </div>
-
-                        <!-- Additional Information -->
-                        <div style="text-align: center; padding-top: 2px;">
-                            <p> For assistance, reach us at
-                            <a href='mailto:{os.getenv(' MAIL_USERNAME')}'
-                                style='color: #007BFF; text-decoration: underline;'>{os.getenv('MAIL_USERNAME')}</a>.
-                            </p>
-                        </div>
-                        </div>
-                        <p style="padding: 20px 0 5px 0; text-align: center;color: rgb(150, 150, 150);font-size: 12px;">Happy Hearts
-                        Community
-                        </p>
-                        </div>"""
-
-                # Create message
-                msg = Message(
-                    subject="Email Update",
-                    sender=os.getenv("MAIL_USERNAME"),
-                    recipients=[email],
-                    html=html_body,
-                )
 
-                mail.send(msg)
+            queue_email(email, *render("email_updated"))
+            db.session.commit()
 
-                return make_response(jsonify({"msg": " Email Update sucessful"}), 200)
-            except Exception as e:
-                logger.error(f"Error sending password reset email: {e}")
-                db.session.rollback()
-                return make_response(
-                    jsonify({"msg": f"{e}, Check your mail and try Again"}),
-                    500,
-                )
+            return make_response(jsonify({"msg": " Email Update sucessful"}), 200)
 
             return make_response(
                 jsonify({"msg": "Email has been changed successfully"}), 200
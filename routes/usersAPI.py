@@ -4,16 +4,16 @@ from config import db, valid_roles
 from models import User
 from werkzeug.security import generate_password_hash
 from sqlalchemy.exc import IntegrityError
+from utils.loading import eager_query
+from utils.pagination import paginated_response
 
 
 class UserAPI(Resource):
     def get(self, id=None):
         if id is None:
-            users = [u.to_dict() for u in User.query.all()]
-            response = make_response(jsonify(users), 200)
-            return response
+            return paginated_response(User.query, User)
         else:
-            user = User.query.filter_by(user_id=id).first()
+            user = eager_query(User).filter_by(user_id=id).first()
             if not user:
                 response = make_response(jsonify({"msg": "user not found"}), 404)
                 return response
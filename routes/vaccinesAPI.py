@@ -3,52 +3,53 @@ from models import Vaccine
 from flask import make_response,jsonify, request
 from config import db
 from sqlalchemy.exc import IntegrityError
+from utils.catalog_cache import catalog_item, catalog_response, invalidate
 
 class vaccinesAPI(Resource):
     def get(self,id=None):
         if id is None:
-            vaccines=[v.to_dict() for v in Vaccine.query.all()]
-            return make_response(jsonify(vaccines),200)
+            return catalog_response(Vaccine)
         else:
-            vaccine=Vaccine.query.filter_by(id=id).first()
+            vaccine=catalog_item(Vaccine, id)
             if not vaccine:
                 return make_response(jsonify({"msg": "Vaccine doesn't exist"}), 404)
 
-            return make_response(jsonify(vaccine.to_dict()),200)
+            return make_response(jsonify(vaccine),200)
 
-        def post(self):
-            data = request.json
-            if not data:
-                return make_response(jsonify({"msg": "No input provided"}), 400)
+    def post(self):
+        data = request.json
+        if not data:
+            return make_response(jsonify({"msg": "No input provided"}), 400)
 
-            try:
-                vaccine = Vaccine(
-                    name=data["name"],
-                    composition=data["composition"],
-                    schedule=data["schedule"],
-                    indication=data["indication"],
-                    side_effects=data["side_effects"],
-                    info=data["additional_information"],
-                )
+        try:
+            vaccine = Vaccine(
+                name=data["name"],
+                composition=data["composition"],
+                schedule=data["schedule"],
+                indication=data["indication"],
+                side_effects=data["side_effects"],
+                info=data["additional_information"],
+            )
 
-                db.session.add(vaccine)
-                db.session.commit()
+            db.session.add(vaccine)
+            db.session.commit()
+            invalidate(Vaccine)
 
-                return make_response(jsonify({"msg": "Vaccine created successfully"}), 201)
+            return make_response(jsonify({"msg": "Vaccine created successfully"}), 201)
 
-            except IntegrityError:
-                db.session.rollback()
-                return jsonify({"msg": "Integrity constraint failed"}), 400
+        except IntegrityError:
+            db.session.rollback()
+            return jsonify({"msg": "Integrity constraint failed"}), 400
 
-            except Exception as e:
-                return jsonify({"msg": str(e)}), 500
+        except Exception as e:
+            return jsonify({"msg": str(e)}), 500
 
     def patch(self,id):
         data = request.json
         if not data:
             return make_response(jsonify({"msg": "No input provided"}), 400)
 
-        vaccine = Vaccine.query.filter_by(id=id).first()
+        vaccine = Vaccine.query.filter_by(vaccine_id=id).first()
         if not vaccine:
             return make_response(jsonify({"msg":"Vaccine doesn't exist"}),404)
 
@@ -57,6 +58,7 @@ class vaccinesAPI(Resource):
                 if hasattr(vaccine,field):
                     setattr(vaccine,field,value)
             db.session.commit()
+            invalidate(Vaccine)
             return make_response(jsonify({"msg": "Vaccine updated succesfully"}), 200)            
         except IntegrityError:
             db.session.rollback()
@@ -66,10 +68,11 @@ class vaccinesAPI(Resource):
             return jsonify({"msg": str(e)}), 500
 
     def delete(self,id):
-        vaccine = Vaccine.query.filter_by(id=id).first()
+        vaccine = Vaccine.query.filter_by(vaccine_id=id).first()
         if not vaccine:
             return make_response(jsonify({"msg": "Vaccine doesn't exist"}), 404)
         
         db.session.delete(vaccine)
         db.session.commit()
+        invalidate(Vaccine)
         return make_response(jsonify({"msg":"Vaccine deleted succesfully"}),200)
@@ -0,0 +1,62 @@
+import os
+import tempfile
+
+import pytest
+
+os.environ["DATABASE_URI"] = os.environ.get(
+    "TEST_DATABASE_URI",
+    "sqlite:///" + os.path.join(tempfile.mkdtemp(), "happyhearts_test.db"),
+)
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ.setdefault("MAIL_USERNAME", "clinic@example.com")
+# Tests read queued email from the outbox rather than sending it
+os.environ["OUTBOX_WORKERS"] = "0"
+
+import app as _routes  # noqa: E402,F401
+from config import app as flask_app  # noqa: E402
+from config import db  # noqa: E402
+from models import Parent, Provider  # noqa: E402
+
+
+@pytest.fixture
+def app():
+    with flask_app.app_context():
+        db.create_all()
+        yield flask_app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def parent(app):
+    parent = Parent(
+        name="Amina",
+        email="amina@example.com",
+        national_id=20000001,
+        phone_number=710000001,
+        gender="Female",
+        password_hash="x",
+    )
+    db.session.add(parent)
+    db.session.commit()
+    return parent
+
+
+@pytest.fixture
+def provider(app):
+    provider = Provider(
+        name="Dr. Otieno",
+        email="otieno@example.com",
+        national_id=10000001,
+        phone_number=700000001,
+        gender="Male",
+        password_hash="x",
+    )
+    db.session.add(provider)
+    db.session.commit()
+    return provider
@@ -0,0 +1,87 @@
+from datetime import datetime
+
+import pytest
+
+from config import db
+from models import Birth, Delivery, EmailOutbox, Present_pregnancy, Previous_pregnancy
+
+
+@pytest.fixture
+def pregnancy(parent, provider):
+    pregnancy = Present_pregnancy(
+        date=datetime(2026, 1, 10),
+        weight_in_kg=64,
+        urinalysis="Normal",
+        blood_pressure="120/80",
+        pollar="Normal",
+        maturity_in_weeks=39,
+        fundal_height=36,
+        comments="Healthy",
+        clinical_notes="None",
+        parent_id=parent.parent_id,
+        provider_id=provider.provider_id,
+    )
+    db.session.add(pregnancy)
+    db.session.commit()
+    return pregnancy
+
+
+def delivery_body(pregnancy, provider):
+    return {
+        "pregnancy_id": pregnancy.pp_id,
+        "provider_id": provider.provider_id,
+        "mode_of_delivery": "SVD",
+        "date": "2026-10-01T08:30",
+        "duration_of_labour": "6 hours",
+        "condition_of_mother": "Stable",
+        "condition_of_baby": "Stable",
+        "weight_at_birth": 3,
+        "gender": "Female",
+        "fate": "Alive",
+        "typeOfBirth": "Twins",
+    }
+
+
+def counts():
+    return {
+        model.__name__: db.session.query(model).count()
+        for model in (Delivery, Previous_pregnancy, Birth, EmailOutbox)
+    }
+
+
+def test_delivery_and_email_commit_together(client, pregnancy, provider):
+    response = client.post("/deliveries", json=delivery_body(pregnancy, provider))
+
+    assert response.status_code == 201
+    assert counts() == {
+        "Delivery": 1,
+        "Previous_pregnancy": 1,
+        "Birth": 2,
+        "EmailOutbox": 1,
+    }
+
+
+def test_failed_commit_leaves_nothing_half_written(
+    client, pregnancy, provider, monkeypatch
+):
+    commit = db.session.commit
+
+    def commit_unless_email_queued():
+        # The commit that carries the notification is the one that fails
+        if any(isinstance(obj, EmailOutbox) for obj in db.session.new):
+            raise RuntimeError("database went away")
+        commit()
+
+    with monkeypatch.context() as patched:
+        patched.setattr(db.session, "commit", commit_unless_email_queued)
+        response = client.post("/deliveries", json=delivery_body(pregnancy, provider))
+
+    assert response.status_code == 500
+    db.session.rollback()
+    assert counts() == {
+        "Delivery": 0,
+        "Previous_pregnancy": 0,
+        "Birth": 0,
+        "EmailOutbox": 0,
+    }
+    assert db.session.get(Present_pregnancy, pregnancy.pp_id).is_delivered is False
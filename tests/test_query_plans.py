@@ -0,0 +1,23 @@
+import os
+
+import pytest
+from sqlalchemy.engine import make_url
+
+# Only Postgres plans say anything about production, and SQLite's planner
+# scans small tables freely
+pytestmark = pytest.mark.skipif(
+    make_url(os.environ["DATABASE_URI"]).get_backend_name() != "postgresql",
+    reason="query plans are checked on Postgres; set TEST_DATABASE_URI",
+)
+
+
+def test_get_routes_avoid_sequential_scans(app, monkeypatch):
+    # benchmarks.endpoints points DATABASE_URI at BENCH_DATABASE_URI when
+    # imported; the app is already bound, so just put the variable back after
+    monkeypatch.setenv("DATABASE_URI", os.environ["DATABASE_URI"])
+    from benchmarks.explain_routes import find_seq_scans
+
+    routes, failures = find_seq_scans(scale=0.05)
+
+    assert routes
+    assert [(rule, table) for rule, table, _ in failures] == []
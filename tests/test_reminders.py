@@ -0,0 +1,30 @@
+from datetime import timedelta
+
+from config import db
+from models import Appointment, EmailOutbox
+from utils.reminders import ReminderEngine, _now
+
+
+def test_late_first_reminder_states_time_left(parent, provider):
+    now = _now()
+    db.session.add(
+        Appointment(
+            parent_id=parent.parent_id,
+            provider_id=provider.provider_id,
+            reason="Antenatal check",
+            appointment_date=now + timedelta(hours=10),
+            status="pending",
+        )
+    )
+    db.session.commit()
+
+    engine = ReminderEngine()
+    engine.load(now, now + timedelta(hours=25))
+    # The 24h reminder fell due 14 hours ago; the 2h one is still ahead
+    assert engine.fire(now) == 1
+    assert engine.fire(now) == 0
+
+    (email,) = db.session.scalars(db.select(EmailOutbox)).all()
+    assert email.subject == "Appointment Reminder"
+    assert "10 hours from now" in email.html
+    assert "24 hours" not in email.html
@@ -0,0 +1,55 @@
+import pytest
+from sqlalchemy import event
+
+from config import db
+from models import Parent
+from utils.versions import current_versions, updates_key
+
+
+def versions():
+    return current_versions(["parents", updates_key("parents")])
+
+
+@pytest.fixture
+def crash_after_commit(app):
+    """Fails every COMMIT after the first, as if the process died the moment
+    the write was committed."""
+    commits = []
+
+    def crash(connection):
+        commits.append(connection)
+        if len(commits) > 1:
+            raise RuntimeError("worker killed")
+
+    event.listen(db.engine, "commit", crash)
+    yield
+    event.remove(db.engine, "commit", crash)
+
+
+def test_counters_commit_with_the_write(parent, crash_after_commit):
+    before = versions()
+    parent.name = "Amina W."
+    db.session.commit()
+
+    after = versions()
+    assert after["parents"][0] == before["parents"][0] + 1
+    assert after[updates_key("parents")][0] == 1
+
+
+def test_failed_commit_bumps_nothing(parent):
+    before = versions()
+
+    def crash(connection):
+        raise RuntimeError("connection lost")
+
+    parent.name = "Amina W."
+    event.listen(db.engine, "commit", crash)
+    try:
+        with pytest.raises(RuntimeError):
+            db.session.commit()
+    finally:
+        event.remove(db.engine, "commit", crash)
+    db.session.rollback()
+
+    assert versions() == before
+    assert db.session.get(Parent, parent.parent_id).name == "Amina"
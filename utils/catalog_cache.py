@@ -0,0 +1,105 @@
+from bisect import bisect_right
+
+from flask import current_app, jsonify, make_response
+from sqlalchemy import inspect
+
+from utils.conditional import conditional_response, serialized_tables
+from utils.fields import FieldsError, project, requested_fields
+from utils.loading import eager_query
+from utils.pagination import PaginationError, decode_cursor, encode_cursor, page_args
+from utils.serializers import serializer_for
+from utils.versions import current_versions
+
+_catalogs = {}
+
+
+class Catalog:
+    """A fully serialized reference table, ordered by primary key, with
+    every row also held as encoded JSON so pages are just byte joins."""
+
+    def __init__(self, model, version):
+        self.version = version
+        self.pk = pk = inspect(model).primary_key[0]
+        serialize = serializer_for(model)
+        dumps = _dumps_bytes()
+
+        self.ids = []
+        self.rows = {}
+        self.encoded = []
+        for obj in eager_query(model).order_by(pk):
+            row = serialize(obj)
+            self.ids.append(getattr(obj, pk.key))
+            self.rows[self.ids[-1]] = row
+            self.encoded.append(dumps(row))
+
+
+def _dumps_bytes():
+    provider = current_app.json
+    if hasattr(provider, "dumps_bytes"):
+        return provider.dumps_bytes
+    return lambda obj: provider.dumps(obj).encode()
+
+
+def _version(model, versions):
+    return tuple(
+        versions.get(table, (0, None))[0] for table in sorted(serialized_tables(model))
+    )
+
+
+def get_catalog(model, versions=None):
+    """Returns the cached catalog for ``model``, rebuilding it when any
+    table it is rendered from has been written since it was built, by this
+    worker or any other."""
+    if versions is None:
+        versions = current_versions(serialized_tables(model))
+    version = _version(model, versions)
+    catalog = _catalogs.get(model)
+    if catalog is None or catalog.version != version:
+        catalog = Catalog(model, version)
+        _catalogs[model] = catalog
+    return catalog
+
+
+def invalidate(model):
+    _catalogs.pop(model, None)
+
+
+def catalog_response(model):
+    """Drop-in for ``paginated_response(model.query, model)`` on reference
+    tables, served from the in-process catalog."""
+    versions = current_versions(serialized_tables(model))
+
+    def build():
+        catalog = get_catalog(model, versions)
+        try:
+            fields = requested_fields(model)
+            limit, after = page_args()
+            start = 0
+            if after:
+                (last,) = decode_cursor(after, [catalog.pk])
+                start = bisect_right(catalog.ids, last)
+        except (PaginationError, FieldsError) as e:
+            return make_response(jsonify({"msg": str(e)}), 400)
+
+        end = start + limit
+        next_cursor = None
+        if end < len(catalog.ids):
+            next_cursor = encode_cursor([catalog.ids[end - 1]])
+        dumps = _dumps_bytes()
+        if fields is None:
+            page = catalog.encoded[start:end]
+        else:
+            rows = catalog.rows
+            page = [dumps(project(rows[id], fields)) for id in catalog.ids[start:end]]
+        body = b'{"data":[%s],"next_cursor":%s}\n' % (
+            b",".join(page),
+            dumps(next_cursor),
+        )
+        return current_app.response_class(body, mimetype="application/json")
+
+    return conditional_response(model, build, versions=versions)
+
+
+def catalog_item(model, id):
+    """The serialized row with primary key ``id``, or ``None``."""
+    return get_catalog(model).rows.get(id)
@@ -0,0 +1,207 @@
+import csv
+import json
+import os
+from itertools import islice
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import or_, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from config import db
+from models import Medicine, Vaccine
+from utils.versions import mark_written
+
+BATCH_SIZE = 500
+
+# name: (model, {file field: column}, JSON list columns). Rows are matched
+# on name, which is unique in both catalogs.
+CATALOGS = {
+    "medicines": (
+        Medicine,
+        {
+            "name": "name",
+            "composition": "composition",
+            "dosage": "dosage",
+            "indication": "indication",
+            "side_effects": "side_effects",
+        },
+        {"side_effects"},
+    ),
+    "vaccines": (
+        Vaccine,
+        {
+            "name": "name",
+            "composition": "composition",
+            "schedule": "schedule",
+            "indication": "indication",
+            "side_effects": "side_effects",
+            "info": "info",
+            "additional_information": "info",
+        },
+        {"schedule", "side_effects"},
+    ),
+}
+
+_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+class CatalogImportError(ValueError):
+    pass
+
+
+def read_rows(path):
+    """Yields the records in a .json (a list of objects), .jsonl (one object
+    per line) or .csv file. CSV and JSON Lines are read a row at a time."""
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, newline="", encoding="utf-8") as f:
+        if extension == ".csv":
+            yield from csv.DictReader(f)
+        elif extension == ".jsonl":
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        elif extension == ".json":
+            rows = json.load(f)
+            if not isinstance(rows, list):
+                raise CatalogImportError(f"{path}: expected a list of objects")
+            yield from rows
+        else:
+            raise CatalogImportError(f"{path}: expected a .json, .jsonl or .csv file")
+
+
+def _list_value(value):
+    # CSV cells hold either a JSON list or "a; b; c"
+    if value is None or isinstance(value, list):
+        return value
+    value = str(value).strip()
+    if value.startswith("["):
+        return json.loads(value)
+    return [part.strip() for part in value.split(";") if part.strip()]
+
+
+def _normalize(table, fields, lists, raw, line):
+    if not isinstance(raw, dict):
+        raise CatalogImportError(f"row {line}: expected an object")
+    # Every row binds every column, so a field left out of the file clears
+    # the column rather than keeping what an earlier import wrote
+    row = {column: [] if column in lists else None for column in fields.values()}
+    for field, column in fields.items():
+        value = raw.get(field)
+        if value is None or value == "":
+            continue
+        if column in lists:
+            row[column] = _list_value(value)
+        else:
+            row[column] = str(value).strip()
+    missing = [
+        column
+        for column, value in row.items()
+        if value is None and not table.c[column].nullable
+    ]
+    if missing:
+        raise CatalogImportError(f"row {line}: missing {', '.join(sorted(missing))}")
+    return row
+
+
+def _upsert_batch(table, rows, counts):
+    names = [row["name"] for row in rows]
+    existing = {
+        row.name: row
+        for row in db.session.execute(select(table).where(table.c.name.in_(names)))
+    }
+    changed = []
+    for row in rows:
+        current = existing.get(row["name"])
+        if current is None:
+            counts["inserted"] += 1
+        elif any(getattr(current, column) != value for column, value in row.items()):
+            counts["updated"] += 1
+        else:
+            counts["unchanged"] += 1
+            continue
+        changed.append(row)
+    if not changed:
+        return
+
+    statement = _INSERTS[db.engine.dialect.name](table).values(changed)
+    updates = [column for column in changed[0] if column != "name"]
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.name],
+        set_={column: statement.excluded[column] for column in updates},
+        # A concurrent import may already have written the same values
+        where=or_(
+            *(
+                table.c[column].is_distinct_from(statement.excluded[column])
+                for column in updates
+            )
+        ),
+    )
+    db.session.execute(statement)
+
+
+def import_catalog(catalog, records, batch_size=BATCH_SIZE):
+    """Upserts ``records`` (dicts, e.g. from ``read_rows``) into the
+    ``catalog`` table by name, one INSERT ... ON CONFLICT per batch, and
+    commits once at the end.
+
+    Returns the inserted, updated and unchanged counts, plus rows that
+    repeat a name later in the same batch under ``duplicates``. The rows are
+    written through Core rather than the ORM, so the catalog is marked
+    written here; its resource version is bumped on commit for other
+    workers to rebuild their cache.
+    """
+    model, fields, lists = CATALOGS[catalog]
+    table = model.__table__
+    if db.engine.dialect.name not in _INSERTS:
+        raise CatalogImportError(
+            f"Catalog import needs INSERT ... ON CONFLICT, which "
+            f"{db.engine.dialect.name} doesn't support"
+        )
+
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0, "duplicates": 0}
+    rows = iter(records)
+    line = 0
+    try:
+        while True:
+            batch = {}
+            for raw in islice(rows, batch_size):
+                line += 1
+                row = _normalize(table, fields, lists, raw, line)
+                if row["name"] in batch:
+                    # ON CONFLICT can't touch the same row twice in one
+                    # statement; the last occurrence wins
+                    counts["duplicates"] += 1
+                batch[row["name"]] = row
+            if not batch:
+                break
+            _upsert_batch(table, list(batch.values()), counts)
+        if counts["inserted"] or counts["updated"]:
+            mark_written(db.session, {table.name}, updated=bool(counts["updated"]))
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return counts
+
+
+catalog_cli = AppGroup("catalog", help="Manage the medicine and vaccine catalogs.")
+
+
+@catalog_cli.command("import")
+@click.argument("catalog", type=click.Choice(sorted(CATALOGS)))
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--batch-size", default=BATCH_SIZE, show_default=True)
+def import_command(catalog, path, batch_size):
+    """Upsert CATALOG rows from a .json, .jsonl or .csv file at PATH."""
+    try:
+        counts = import_catalog(catalog, read_rows(path), batch_size)
+    except (CatalogImportError, json.JSONDecodeError) as e:
+        raise click.ClickException(str(e))
+    summary = (
+        f"{catalog}: {counts['inserted']} inserted, {counts['updated']} updated, "
+        f"{counts['unchanged']} unchanged"
+    )
+    if counts["duplicates"]:
+        summary += f", {counts['duplicates']} repeated names skipped"
+    click.echo(summary)
@@ -0,0 +1,110 @@
+import hashlib
+from datetime import timezone
+
+import pytz
+from flask import current_app, request
+from sqlalchemy import func, inspect
+
+from utils.serializers import serialized_fields
+from utils.versions import current_versions, updates_key
+
+EAT = pytz.timezone("Africa/Nairobi")
+
+_tables = {}
+
+
+def _collect(model, fields, tables):
+    mapper = inspect(model)
+    tables.add(mapper.local_table.name)
+    for key, nested in fields.items():
+        prop = mapper.relationships.get(key)
+        if prop is not None:
+            if prop.secondary is not None:
+                tables.add(prop.secondary.name)
+            _collect(prop.mapper.class_, nested or {}, tables)
+    return tables
+
+
+def serialized_tables(model):
+    """Every table whose rows can show up in the model's serialized output."""
+    if model not in _tables:
+        _tables[model] = frozenset(_collect(model, serialized_fields(model), set()))
+    return _tables[model]
+
+
+def _scope_state(query, model):
+    # Count, highest id and latest timestamp of the rows in scope, answered
+    # from the index on the scope's filter column
+    mapper = inspect(model)
+    columns = [func.count(), func.max(mapper.primary_key[0])]
+    timestamp = mapper.columns.get("timestamp")
+    if timestamp is not None:
+        columns.append(func.max(timestamp))
+    return list(query.with_entities(*columns).order_by(None).one())
+
+
+def _as_utc(value):
+    if value.tzinfo is None:
+        value = EAT.localize(value)
+    return value.astimezone(timezone.utc)
+
+
+def validators(model, query=None, versions=None):
+    """ETag and Last-Modified for the current request.
+
+    A list scoped by a filter, e.g. one parent's appointments, is validated
+    by the count, highest id and latest timestamp of its own rows, plus the
+    counter of updates to that table; a write elsewhere in the table leaves
+    it alone. Whole-table lists and every related table the response embeds
+    use the table's resource_versions counter."""
+    tables = serialized_tables(model)
+    root = inspect(model).local_table.name
+    if query is None or query.whereclause is None:
+        keys, scope = tables, []
+    else:
+        keys = (tables - {root}) | {updates_key(root)}
+        scope = _scope_state(query, model)
+    if versions is None:
+        versions = current_versions(keys)
+    token = "|".join(
+        [request.full_path, str(current_app.json.compact), str(current_app.debug)]
+        + [f"{key}:{versions.get(key, (0, None))[0]}" for key in sorted(keys)]
+        + [str(value) for value in scope]
+    )
+    etag = hashlib.sha1(token.encode()).hexdigest()
+    updated = [
+        updated_at.replace(tzinfo=timezone.utc)
+        for key, (_, updated_at) in versions.items()
+        if key in keys
+    ]
+    if len(scope) > 2 and scope[2] is not None:
+        updated.append(_as_utc(scope[2]))
+    last_modified = max(updated) if updated else None
+    return etag, last_modified
+
+
+def is_not_modified(etag, last_modified):
+    # If-None-Match takes precedence over If-Modified-Since (RFC 9110 13.2.2)
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since and last_modified:
+        return last_modified.replace(microsecond=0) <= request.if_modified_since
+    return False
+
+
+def conditional_response(model, build, query=None, versions=None):
+    """Answers with 304 when the client's copy is still current, otherwise
+    calls ``build()`` and tags its response with ETag/Last-Modified.
+    ``query`` selects the rows the response lists."""
+    etag, last_modified = validators(model, query, versions)
+    if is_not_modified(etag, last_modified):
+        response = current_app.response_class(status=304)
+    else:
+        response = build()
+        if response.status_code != 200:
+            return response
+    response.set_etag(etag, weak=True)
+    if last_modified:
+        response.last_modified = last_modified
+    response.cache_control.no_cache = True
+    return response
@@ -3,102 +3,170 @@ import json
 from sqlalchemy.types import TypeDecorator, VARCHAR
 from datetime import datetime
 import pytz
-from config import db, app, mail
-from models import Appointment, Birth
+from config import db, app
+from models import Appointment, Birth, Parent, SerialCounter
+from models.Parent import FIRST_BIRTH_SERIAL_NUMBER, birth_serial_number_seq
+from sqlalchemy import func, insert, select, update
 import logging
-import os
+import threading
+import zlib
+from contextlib import contextmanager
 from flask import make_response, jsonify
-from flask_mail import Message
 from venv import logger
 from functools import wraps
 from flask_jwt_extended import verify_jwt_in_request, get_jwt
+from utils.settings import setting
+from utils.email_templates import render_many
+from utils.outbox import drain, queue_email
 
 
 logging.basicConfig(level=logging.INFO)
 
+# Fallback for advisory_lock on databases without advisory locks
+_local_locks = {}
+
+
+@contextmanager
+def advisory_lock(name):
+    """Yields True to one caller at a time across every process sharing the
+    database, and False, without waiting, to anyone else meanwhile.
+
+    On Postgres this is a session-level advisory lock held on its own
+    connection, so it is released even if the process dies mid-sweep
+    (which also means it needs a session pooler, not PgBouncer in
+    transaction mode). Other backends only get a lock within this process.
+    """
+    local = _local_locks.setdefault(name, threading.Lock())
+    if not local.acquire(blocking=False):
+        yield False
+        return
+    try:
+        if db.engine.dialect.name != "postgresql":
+            yield True
+            return
+        key = zlib.crc32(name.encode())
+        with db.engine.connect() as connection:
+            acquired = connection.execute(
+                select(func.pg_try_advisory_lock(key))
+            ).scalar()
+            connection.commit()
+            try:
+                yield acquired
+            finally:
+                if acquired:
+                    connection.execute(select(func.pg_advisory_unlock(key)))
+                    connection.commit()
+    finally:
+        local.release()
+
+
+def _mark_missed(now, chunk_size):
+    # Flips up to chunk_size pending, past appointments to missed in one
+    # statement through ix_appointments_status_appointment_date, skipping
+    # rows a request has locked (they're picked up by the next run)
+    due = (
+        select(Appointment.appointment_id)
+        .where(Appointment.status == "pending", Appointment.appointment_date <= now)
+        .order_by(Appointment.appointment_date)
+        .limit(chunk_size)
+        .with_for_update(skip_locked=True)
+    )
+    return db.session.execute(
+        update(Appointment)
+        .where(Appointment.appointment_id.in_(due), Appointment.status == "pending")
+        .values(status="missed")
+        .returning(
+            Appointment.appointment_id,
+            Appointment.parent_id,
+            Appointment.appointment_date,
+            Appointment.reason,
+        )
+        .execution_options(synchronize_session=False)
+    ).all()
+
+
+def queue_missed_emails(rows):
+    """Queues a missed-appointment email for each row of (appointment_id,
+    parent_id, appointment_date, reason) just marked missed."""
+    recipients = dict(
+        db.session.query(Parent.parent_id, Parent.email).filter(
+            Parent.parent_id.in_({row.parent_id for row in rows})
+        )
+    )
+    subject, bodies = render_many(
+        "appointment_missed",
+        [{"appointment_date": row.appointment_date, "reason": row.reason} for row in rows],
+    )
+    for row, html_body in zip(rows, bodies):
+        queue_email(recipients[row.parent_id], subject, html_body)
+
 
 def update_appointment_statuses():
-    with app.app_context():
+    with app.app_context(), advisory_lock("missed_appointment_sweep") as acquired:
+        if not acquired:
+            logging.info("Missed-appointment sweep is already running elsewhere.")
+            return make_response(jsonify({"msg": "Sweep already running."}), 200)
+
         now = datetime.now(pytz.timezone("Africa/Nairobi"))  # Current time in EAT
         logging.info(f"Running update at {now}")
 
-        # Query appointments where the appointment date is in the past and status is pending
-        appointments = Appointment.query.filter(
-            Appointment.appointment_date <= now, Appointment.status == "pending"
-        ).all()
-
-        if not appointments:
-            logging.info("No appointments to update.")
-            return make_response(jsonify({"msg": "No appointments to update."}), 200)
-
-        for appointment in appointments:
+        # Each chunk's status changes and emails commit together, so an
+        # error loses at most the chunk in progress
+        chunk_size = setting("MISSED_SWEEP_CHUNK_SIZE")
+        updated = chunks = 0
+        while True:
             try:
-                # Update the appointment status to 'missed'
-                appointment.status = "missed"
-                db.session.add(
-                    appointment
-                )  # Add the appointment to the session after updating the status
-
-                # Prepare the email body
-                appointment_date_str = appointment.appointment_date.strftime(
-                    "%Y-%m-%d %H:%M"
-                )
-
-                html_body = f"""
-                <div style="width: 100%;background: #ebf2fa;padding: 20px 0 0 0;font-family: system-ui, sans-serif; text-align: center;">
-                    <div style="border-top: 6px solid #007BFF; background-color: #fff; display: block; padding: 8px 20px; text-align: center; max-width: 500px; border-bottom-left-radius: .4rem; border-bottom-right-radius: .4rem; letter-spacing: .037rem; line-height: 26px; margin: auto; font-size: 14px;">
-                        <img src="https://res.cloudinary.com/droynil1n/image/upload/v1728204000/e50iplialg1fawi16enn.png"
-                            alt="Happy Hearts Logo" style="width: 70%; height: auto; margin:auto">
-                        <div style="text-align: left; padding-top: 10px;">
-                            <p> You have missed an appointment that was scheduled for {appointment_date_str}.Reason for Appointment: {appointment.reason}.</p>
-                        </div>
-                        <div style="text-align: center; padding-top: 2px;">
-                            <p>For assistance, reach us at
-                            <a href='mailto:{os.getenv('MAIL_USERNAME')}'
-                                style='color: #007BFF; text-decoration: underline;'>{os.getenv('MAIL_USERNAME')}</a>.
-                            </p>
-                        </div>
-                    </div>
-                    <p style="padding: 20px 0 5px 0; text-align: center;color: rgb(150, 150, 150);font-size: 12px;">Happy Hearts
-                    Community
-                    </p>
-                </div>"""
-
-                recipient_email = appointment.parent.email.strip()
-
-                # Send email message
-                msg = Message(
-                    subject="Missed Appointment",
-                    sender=os.getenv("MAIL_USERNAME"),
-                    recipients=[recipient_email],
-                    html=html_body,
-                )
-                mail.send(msg)
-
-                logging.info(
-                    f"Email sent to {recipient_email} for appointment {appointment.appointment_id}"
+                rows = _mark_missed(now, chunk_size)
+                if not rows:
+                    break
+                queue_missed_emails(rows)
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Error updating missed appointments: {e}")
+                return make_response(
+                    jsonify(
+                        {
+                            "error": "An error occurred while updating the "
+                            "appointments",
+                            "appointments": updated,
+                        }
+                    ),
+                    500,
                 )
+            updated += len(rows)
+            chunks += 1
+            if len(rows) < chunk_size:
+                break
 
-            except Exception as e:
-                logger.error(f"Error sending appointment email: {e}")
-                db.session.rollback()  # Rollback transaction in case of error
-                continue  # Skip to the next appointment in case of error
-
-        # Commit all updates after processing all appointments
-        try:
-            db.session.commit()
-            logging.info(f"Appointment statuses updated at {now}")
-            return make_response(
-                jsonify({"msg": "Appointments updated and emails sent successfully"}),
-                200,
-            )
-        except Exception as e:
-            db.session.rollback()  # Rollback in case commit fails
-            logger.error(f"Error committing appointment updates: {e}")
-            return make_response(
-                jsonify({"error": "An error occurred while updating the appointments"}),
-                500,
-            )
+        if not updated:
+            logging.info("No appointments to update.")
+            return make_response(jsonify({"msg": "No appointments to update."}), 200)
+        logging.info(f"{updated} appointments marked missed in {chunks} chunks")
+
+        # Send the backlog over a few SMTP connections at once, each reused
+        # for a whole batch, rather than one connection per email
+        batches = drain(setting("MISSED_SWEEP_CONNECTIONS"))
+        emails = {
+            key: round(sum(batch[key] for batch in batches), 1)
+            for key in ("messages", "sent", "failed", "connections", "connect_ms")
+        }
+        emails["batches"] = len(batches)
+        emails["batch_ms_max"] = round(
+            max((batch["batch_ms"] for batch in batches), default=0), 1
+        )
+        logging.info(f"Missed appointment emails: {emails}")
+        return make_response(
+            jsonify(
+                {
+                    "msg": "Appointments updated and emails sent successfully",
+                    "appointments": updated,
+                    "chunks": chunks,
+                    "emails": emails,
+                }
+            ),
+            200,
+        )
 
 
 def role_required(required_roles):
@@ -138,9 +206,38 @@ class JSONEncodedList(TypeDecorator):
     # appointment_date = db.Column(db.DateTime(timezone=True), nullable=False)
 
 
-def generate_serial_number():
-    latest_record = db.session.query(Birth).order_by(Birth.serial_number.desc()).first()
-    if latest_record is None:
-        return 4953636
-    else:
-        return latest_record.serial_number + 1
+def allocate_serial_numbers(count=1):
+    """Reserves ``count`` unique birth serial numbers in one round trip,
+    e.g. one per baby of a multiple birth, and returns them in order.
+
+    Postgres draws them from birth_serial_number_seq, which never hands out
+    a number twice no matter how many workers ask at once (numbers of rolled
+    back transactions are skipped, not reused). Backends without sequences
+    bump a row in serial_counters instead, which holds a write lock until
+    the surrounding transaction ends.
+    """
+    if count < 1:
+        return []
+
+    if db.session.get_bind().dialect.supports_sequences:
+        serials = select(birth_serial_number_seq.next_value()).select_from(
+            func.generate_series(1, count)
+        )
+        return sorted(db.session.execute(serials).scalars())
+
+    counter = SerialCounter.__table__
+    end = db.session.execute(
+        update(counter)
+        .where(counter.c.name == Birth.__tablename__)
+        .values(next_value=counter.c.next_value + count)
+        .returning(counter.c.next_value)
+    ).scalar()
+    if end is None:
+        # First allocation on this database: carry on from existing births
+        latest = db.session.query(func.max(Birth.serial_number)).scalar()
+        start = max(FIRST_BIRTH_SERIAL_NUMBER, (latest or 0) + 1)
+        end = start + count
+        db.session.execute(
+            insert(counter).values(name=Birth.__tablename__, next_value=end)
+        )
+    return list(range(end - count, end))
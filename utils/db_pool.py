@@ -0,0 +1,163 @@
+import logging
+import os
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from sqlalchemy.pool import QueuePool
+
+from utils.settings import parse
+
+logger = logging.getLogger(__name__)
+
+# pool_size + max_overflow should cover the threads one gunicorn worker
+# runs (--threads), or requests queue for up to DB_POOL_TIMEOUT seconds
+DEFAULTS = {
+    "DB_POOL_SIZE": 10,
+    "DB_MAX_OVERFLOW": 10,
+    "DB_POOL_TIMEOUT": 10,
+    "DB_POOL_RECYCLE": 1800,
+    "DB_POOL_PRE_PING": True,
+    "DB_STATEMENT_TIMEOUT_MS": 30000,
+    "DB_PGBOUNCER": False,
+    "DB_POOL_WAIT_WARN_MS": 100,
+}
+
+
+def setting(name, environ=None):
+    environ = os.environ if environ is None else environ
+    return parse(environ.get(name), DEFAULTS[name])
+
+
+class PoolMetrics:
+    """Checkout counts and how long callers waited for a connection."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.wait_total = 0.0
+            self.wait_max = 0.0
+
+    def record(self, wait, timed_out=False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+
+    def snapshot(self):
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_mean_ms": round(self.wait_total / attempts * 1000, 3)
+                if attempts
+                else 0.0,
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that times every checkout, including the ones that give
+    up after ``timeout`` seconds."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+        self.wait_warn = setting("DB_POOL_WAIT_WARN_MS") / 1000
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeout:
+            self.metrics.record(time.perf_counter() - start, timed_out=True)
+            logger.error("Connection pool exhausted: %s", self.status())
+            raise
+        wait = time.perf_counter() - start
+        self.metrics.record(wait)
+        if wait > self.wait_warn:
+            logger.warning(
+                "Waited %.0fms for a pooled connection: %s", wait * 1000, self.status()
+            )
+        return connection
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep the counters going
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+def engine_options(uri, environ=None):
+    """SQLALCHEMY_ENGINE_OPTIONS for ``uri`` from the DB_* environment
+    variables (see DEFAULTS)."""
+    if not uri:
+        return {}
+    url = make_url(uri)
+    options = {
+        "pool_pre_ping": setting("DB_POOL_PRE_PING", environ),
+        "pool_recycle": setting("DB_POOL_RECYCLE", environ),
+    }
+    # In-memory SQLite lives in a single connection, so there is no pool
+    # to size
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return options
+
+    options.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=setting("DB_POOL_SIZE", environ),
+        max_overflow=setting("DB_MAX_OVERFLOW", environ),
+        pool_timeout=setting("DB_POOL_TIMEOUT", environ),
+    )
+    timeout = setting("DB_STATEMENT_TIMEOUT_MS", environ)
+    if (
+        url.get_backend_name() == "postgresql"
+        and timeout
+        and not setting("DB_PGBOUNCER", environ)
+    ):
+        # PgBouncer rejects startup options; see configure_engine for that case
+        options["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+    return options
+
+
+def configure_engine(engine, environ=None):
+    """Engine-level hooks that can't be expressed as create_engine options."""
+    timeout = setting("DB_STATEMENT_TIMEOUT_MS", environ)
+    if (
+        engine.dialect.name == "postgresql"
+        and timeout
+        and setting("DB_PGBOUNCER", environ)
+    ):
+        # In transaction pooling mode consecutive transactions may run on
+        # different server connections, so a session-level SET would leak to
+        # other clients. SET LOCAL lasts exactly one transaction.
+        @event.listens_for(engine, "begin")
+        def set_statement_timeout(connection):
+            connection.exec_driver_sql(f"SET LOCAL statement_timeout = {timeout}")
+
+
+def pool_stats(engine):
+    pool = engine.pool
+    stats = {"pool": type(pool).__name__, "status": pool.status()}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            checked_in=pool.checkedin(),
+        )
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        stats.update(metrics.snapshot())
+    return stats
@@ -0,0 +1,90 @@
+import time
+
+from flask import g, has_request_context, request
+from flask_sqlalchemy.session import Session
+
+from utils.db_pool import engine_options
+from utils.settings import setting
+
+REPLICA = "replica"
+READ_METHODS = ("GET", "HEAD", "OPTIONS")
+# Unix time until which the client's reads stay on the primary. Browsers
+# calling cross-origin don't send cookies back, so the same value also goes
+# out in a response header for the client to echo on its next requests
+PRIMARY_COOKIE = "db_primary_until"
+PRIMARY_HEADER = "X-DB-Primary-Until"
+
+
+def replica_binds(uri):
+    """SQLALCHEMY_BINDS entry for the replica at ``uri``, if one is set."""
+    if not uri:
+        return {}
+    return {REPLICA: {"url": uri, **engine_options(uri)}}
+
+
+class RoutingSession(Session):
+    """Session that sends the SELECTs of read-only requests to the replica
+    bind. Flushes, INSERT/UPDATE/DELETE, SELECT ... FOR UPDATE and plain
+    ``session.connection()`` calls always go to the primary."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (
+            bind is None
+            and not self._flushing
+            and getattr(clause, "is_select", False)
+            and getattr(clause, "_for_update_arg", None) is None
+            and has_request_context()
+            and g.get("read_replica", False)
+        ):
+            return self._db.engines[REPLICA]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def init_app(app):
+    """Routes Flask-RESTful ``get`` handlers to the replica when a
+    ``replica`` bind is configured.
+
+    A client that has just written successfully reads from the primary for
+    DB_READ_YOUR_WRITES_SECONDS afterwards, so replication lag never hides
+    its own change from it. The deadline travels with the client, not the
+    worker: in a cookie for same-site callers, and in the
+    X-DB-Primary-Until response header, which cross-origin callers send
+    back as a request header.
+    """
+    if REPLICA not in app.config.get("SQLALCHEMY_BINDS", {}):
+        return
+    window = setting("DB_READ_YOUR_WRITES_SECONDS")
+
+    @app.before_request
+    def choose_bind():
+        g.read_replica = (
+            request.method in READ_METHODS and _primary_until() < time.time()
+        )
+
+    @app.after_request
+    def remember_write(response):
+        wrote = request.method not in READ_METHODS and 200 <= response.status_code < 300
+        if wrote and window:
+            primary_until = f"{time.time() + window:.3f}"
+            response.headers[PRIMARY_HEADER] = primary_until
+            response.set_cookie(
+                PRIMARY_COOKIE,
+                primary_until,
+                max_age=window,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+
+def _primary_until():
+    deadline = 0.0
+    for value in (
+        request.headers.get(PRIMARY_HEADER),
+        request.cookies.get(PRIMARY_COOKIE),
+    ):
+        try:
+            deadline = max(deadline, float(value or 0))
+        except ValueError:
+            pass
+    return deadline
@@ -0,0 +1,106 @@
+import os
+from datetime import datetime
+
+from jinja2 import Environment, FileSystemLoader, StrictUndefined, select_autoescape
+from markupsafe import Markup
+
+from config import app
+
+LOGO_URL = (
+    "https://res.cloudinary.com/droynil1n/image/upload/v1728204000/"
+    "e50iplialg1fawi16enn.png"
+)
+FOR_ASSISTANCE = "For assistance, reach us at"
+ANY_QUESTIONS = "If you have any questions, contact us at"
+
+# Notification name -> (subject, line before the support address). The body
+# is templates/email/<name>.html, rendered inside templates/email/base.html
+NOTIFICATIONS = {
+    "appointment_scheduled": ("Appointment schedule", FOR_ASSISTANCE),
+    "appointment_approved": ("Appointment Approved", ANY_QUESTIONS),
+    "appointment_rejected": ("Appointment Rejected", ANY_QUESTIONS),
+    "appointment_reminder": ("Appointment Reminder", FOR_ASSISTANCE),
+    "appointment_missed": ("Missed Appointment", FOR_ASSISTANCE),
+    "password_reset": ("Reset Your Password", FOR_ASSISTANCE),
+    "email_change_code": ("Email Verification", FOR_ASSISTANCE),
+    "email_updated": ("Email Update", FOR_ASSISTANCE),
+    "delivery_congratulations": ("Congratulations on Your New Baby!", FOR_ASSISTANCE),
+    "delivery_condolences": ("Our Heartfelt Condolences", FOR_ASSISTANCE),
+}
+
+# Stands in for the body while the shell is rendered, then split on
+_BODY = "\x00body\x00"
+
+
+def _when(value):
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M")
+    return value
+
+
+env = Environment(
+    loader=FileSystemLoader(os.path.join(app.root_path, "templates")),
+    # Reasons, names and the like come from users
+    autoescape=select_autoescape(["html"]),
+    undefined=StrictUndefined,
+    # Templates are compiled once below, never re-checked on disk
+    auto_reload=False,
+    trim_blocks=True,
+    lstrip_blocks=True,
+)
+env.filters["when"] = _when
+
+
+class EmailTemplate:
+    """A notification's subject and compiled body between the shell's
+    already-rendered head and tail."""
+
+    __slots__ = ("subject", "head", "body", "tail")
+
+    def __init__(self, subject, head, body, tail):
+        self.subject = subject
+        self.head = head
+        self.body = body
+        self.tail = tail
+
+    def render(self, params):
+        return self.head + self.body.render(params) + self.tail
+
+    def render_many(self, rows):
+        render_body = self.body.render
+        head, tail = self.head, self.tail
+        return [head + render_body(row) + tail for row in rows]
+
+
+def compile_templates():
+    """Compiles every notification and renders the shell around each once,
+    reading the support address from the config a single time."""
+    shell = env.get_template("email/base.html")
+    support_email = app.config["MAIL_USERNAME"]
+    templates = {}
+    for name, (subject, assistance) in NOTIFICATIONS.items():
+        head, tail = shell.render(
+            body=Markup(_BODY),
+            assistance=assistance,
+            support_email=support_email,
+            logo_url=LOGO_URL,
+        ).split(_BODY)
+        body = env.get_template(f"email/{name}.html")
+        templates[name] = EmailTemplate(subject, head, body, tail)
+    return templates
+
+
+TEMPLATES = compile_templates()
+
+
+def render(name, **params):
+    """``(subject, html)`` of notification ``name``."""
+    template = TEMPLATES[name]
+    return template.subject, template.render(params)
+
+
+def render_many(name, rows):
+    """``(subject, [html, ...])`` of notification ``name`` for each dict of
+    parameters in ``rows``, for batch sends."""
+    template = TEMPLATES[name]
+    return template.subject, template.render_many(rows)
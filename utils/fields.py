@@ -0,0 +1,64 @@
+from flask import request
+from sqlalchemy import inspect
+
+from utils.serializers import serialized_fields
+
+
+class FieldsError(ValueError):
+    pass
+
+
+def _add(model, allowed, tree, parts, path):
+    head, rest = parts[0], parts[1:]
+    if head not in allowed:
+        raise FieldsError(f"Unknown field '{path}'")
+
+    # model is None below a dict-valued field such as Appointment.info
+    relationship = model and inspect(model).relationships.get(head)
+    if not rest:
+        # A bare relationship name selects everything it normally renders
+        tree[head] = allowed[head] if relationship is not None else None
+        return
+    if relationship is None and not isinstance(allowed[head], dict):
+        raise FieldsError(f"Unknown field '{path}'")
+    if head in tree and tree[head] in (None, allowed[head]):
+        return
+    subtree = tree.setdefault(head, {})
+    nested = relationship.mapper.class_ if relationship is not None else None
+    _add(nested, allowed[head], subtree, rest, path)
+
+
+def parse_fields(model, spec):
+    """Turns ``"appointment_id,status,parent.name"`` into a ``{field:
+    subfields}`` tree, rejecting anything outside the model's
+    serialize_only."""
+    tree = {}
+    for path in spec.split(","):
+        path = path.strip()
+        if path:
+            _add(model, serialized_fields(model), tree, path.split("."), path)
+    if not tree:
+        raise FieldsError("fields must name at least one field")
+    return tree
+
+
+def requested_fields(model):
+    """The ``?fields=`` tree for the current request, or ``None`` when the
+    client wants the full representation."""
+    spec = request.args.get("fields")
+    if spec is None:
+        return None
+    return parse_fields(model, spec)
+
+
+def project(data, fields):
+    """Cuts an already serialized dict down to ``fields``."""
+    projected = {}
+    for key, subfields in fields.items():
+        value = data.get(key)
+        if subfields and isinstance(value, dict):
+            value = project(value, subfields)
+        elif subfields and isinstance(value, list):
+            value = [project(v, subfields) for v in value]
+        projected[key] = value
+    return projected
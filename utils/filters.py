@@ -0,0 +1,165 @@
+from datetime import date, datetime, timedelta
+
+import pytz
+from flask import request
+from sqlalchemy import inspect
+
+from config import db
+
+EAT = pytz.timezone("Africa/Nairobi")
+
+# Query parameters owned by pagination, streaming and sparse fieldsets
+RESERVED_ARGS = {"limit", "after", "stream", "fields", "sort", "from", "to"}
+
+_specs = {}
+
+
+class FilterError(ValueError):
+    pass
+
+
+class FilterSpecError(Exception):
+    pass
+
+
+class ListSpec:
+    """Compiled form of a model's ``filter_fields``/``date_field``/
+    ``sort_fields`` declarations."""
+
+    def __init__(self, model):
+        mapper = inspect(model)
+        self.model = model
+        self.columns = frozenset(mapper.columns.keys())
+        self.filters = {
+            name: _indexed_column(model, mapper, name)
+            for name in getattr(model, "filter_fields", ())
+        }
+        date_field = getattr(model, "date_field", None)
+        self.date_column = (
+            _indexed_column(model, mapper, date_field) if date_field else None
+        )
+        self.sorts = {
+            name: _indexed_column(model, mapper, name)
+            for name in getattr(model, "sort_fields", ())
+        }
+
+
+def _is_indexed(column):
+    if column.primary_key or column.index or column.unique:
+        return True
+    # Composite indexes only help when the column leads them
+    return any(next(iter(index.columns)) is column for index in column.table.indexes)
+
+
+def _indexed_column(model, mapper, name):
+    if name not in mapper.columns:
+        raise FilterSpecError(f"{model.__name__} has no column {name!r}")
+    column = mapper.columns[name]
+    if not _is_indexed(column):
+        raise FilterSpecError(
+            f"{model.__name__}.{name} is not indexed and can't be filtered or sorted on"
+        )
+    return column
+
+
+def _declares_spec(model):
+    return any(
+        hasattr(model, attr) for attr in ("filter_fields", "date_field", "sort_fields")
+    )
+
+
+def compile_specs():
+    """Compiles every model's list spec up front so a filter on an unindexed
+    column fails at startup rather than on the first request."""
+    for mapper in db.Model.registry.mappers:
+        if _declares_spec(mapper.class_):
+            spec_for(mapper.class_)
+
+
+def spec_for(model):
+    if model not in _specs:
+        _specs[model] = ListSpec(model) if _declares_spec(model) else None
+    return _specs[model]
+
+
+def _python_type(column):
+    try:
+        return column.type.python_type
+    except NotImplementedError:
+        return str
+
+
+def _parse(column, name, raw):
+    python_type = _python_type(column)
+    try:
+        if python_type is bool:
+            if raw.lower() not in ("true", "false", "1", "0"):
+                raise ValueError
+            return raw.lower() in ("true", "1")
+        if python_type is datetime:
+            return _parse_datetime(column, raw)
+        if python_type is date:
+            return date.fromisoformat(raw[:10])
+        return python_type(raw)
+    except ValueError:
+        raise FilterError(f"Invalid value for {name}: {raw!r}")
+
+
+def _parse_datetime(column, raw):
+    value = datetime.fromisoformat(raw)
+    if value.tzinfo is None and getattr(column.type, "timezone", False):
+        value = EAT.localize(value)
+    return value
+
+
+def _is_date_only(raw):
+    return len(raw) == 10
+
+
+def apply_filters(query, model):
+    """Applies ``?field=value``, ``?from=``/``?to=`` and ``?sort=[-]field``
+    from the current request according to the model's list spec.
+
+    Returns the filtered query and the ``(sort_key, descending)`` pair to
+    paginate by; models without a spec are returned untouched.
+    """
+    spec = spec_for(model)
+    if spec is None:
+        return query, None, False
+
+    for name in request.args:
+        if name in RESERVED_ARGS:
+            continue
+        column = spec.filters.get(name)
+        if column is None:
+            if name in spec.columns:
+                raise FilterError(f"Cannot filter by {name}")
+            # Not a field at all: cache-busters, tracking parameters and the
+            # like are ignored, as on every other list endpoint
+            continue
+        values = [_parse(column, name, raw) for raw in request.args.getlist(name)]
+        query = query.filter(
+            column == values[0] if len(values) == 1 else column.in_(values)
+        )
+
+    start, end = request.args.get("from"), request.args.get("to")
+    if (start or end) and spec.date_column is None:
+        raise FilterError("This resource can't be filtered by date")
+    if start:
+        query = query.filter(spec.date_column >= _parse(spec.date_column, "from", start))
+    if end:
+        value = _parse(spec.date_column, "to", end)
+        if _is_date_only(end) and isinstance(value, datetime):
+            # A bare date in ?to= includes that whole day
+            query = query.filter(spec.date_column < value + timedelta(days=1))
+        else:
+            query = query.filter(spec.date_column <= value)
+
+    sort = request.args.get("sort")
+    if not sort:
+        return query, None, False
+    descending = sort.startswith("-")
+    column = spec.sorts.get(sort.lstrip("-"))
+    if column is None:
+        raise FilterError(f"Cannot sort by {sort.lstrip('-')}")
+    return query, column, descending
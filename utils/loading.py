@@ -0,0 +1,94 @@
+from sqlalchemy import inspect
+from sqlalchemy.orm import (
+    ColumnProperty,
+    RelationshipProperty,
+    joinedload,
+    load_only,
+    selectinload,
+)
+
+from utils.serializers import (
+    MAX_PARTIAL_SERIALIZERS,
+    freeze_fields,
+    serialized_fields,
+)
+
+_options = {}
+_partial = {}
+
+
+def _merge(tree, path):
+    head, _, rest = path.partition(".")
+    if not rest:
+        tree.setdefault(head, None)
+        return
+    subtree = tree.get(head) or {}
+    tree[head] = subtree
+    _merge(subtree, rest)
+
+
+def _with_depends(model, fields):
+    # Hybrid properties (e.g. Appointment.info) hide which relationships
+    # they touch, so models list them in serialize_depends as dotted paths
+    depends = getattr(model, "serialize_depends", {})
+    if not any(key in fields for key in depends):
+        return fields
+
+    fields = dict(fields)
+    for key, paths in depends.items():
+        if key in fields:
+            for path in paths:
+                _merge(fields, path)
+    return fields
+
+
+def _build(model, fields):
+    mapper = inspect(model)
+    fields = _with_depends(model, fields)
+
+    columns = []
+    options = []
+    projectable = True
+    for key, nested in fields.items():
+        prop = mapper.attrs.get(key)
+        if isinstance(prop, RelationshipProperty):
+            attr = getattr(model, key)
+            loader = selectinload(attr) if prop.uselist else joinedload(attr)
+            sub_options = _build(prop.mapper.class_, nested or {})
+            options.append(loader.options(*sub_options) if sub_options else loader)
+            # Foreign keys on this side are needed to match up related rows
+            columns.extend(
+                getattr(model, c.key)
+                for c in prop.local_columns
+                if c.table is mapper.local_table and c.key in mapper.columns
+            )
+        elif isinstance(prop, ColumnProperty):
+            columns.append(getattr(model, key))
+        elif key not in getattr(model, "serialize_depends", {}):
+            # Unknown attribute that may read any column; load the full row
+            projectable = False
+
+    if projectable and columns:
+        options.insert(0, load_only(*dict.fromkeys(columns)))
+    return options
+
+
+def loader_options(model, fields=None):
+    """Loader options that fetch everything ``fields`` (by default the
+    model's serialize_only) needs in a fixed number of statements:
+    ``joinedload`` for many-to-one, ``selectinload`` for collections and
+    ``load_only`` for the columns actually serialized."""
+    if fields is not None:
+        key = (model, freeze_fields(fields))
+        if key not in _partial:
+            if len(_partial) >= MAX_PARTIAL_SERIALIZERS:
+                _partial.clear()
+            _partial[key] = _build(model, fields)
+        return _partial[key]
+    if model not in _options:
+        _options[model] = _build(model, serialized_fields(model))
+    return _options[model]
+
+
+def eager_query(model):
+    return model.query.options(*loader_options(model))
@@ -0,0 +1,345 @@
+import logging
+import random
+import smtplib
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+
+import click
+from flask.cli import AppGroup
+from flask_mail import Message
+from sqlalchemy import and_, bindparam, event, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from config import app, db, mail
+from models import EmailOutbox
+from utils.settings import setting
+
+logger = logging.getLogger(__name__)
+
+_outbox = EmailOutbox.__table__
+# Fresh connections a batch may open after the first one breaks
+MAX_RECONNECTS = 2
+
+
+def queue_email(recipient, subject, html):
+    """Adds a message to the outbox in the caller's transaction. Nothing is
+    sent unless that transaction commits, and the request never waits on
+    SMTP; the outbox workers pick it up right after the commit."""
+    db.session.add(EmailOutbox(recipient=recipient.strip(), subject=subject, html=html))
+    db.session.info["outbox_queued"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_workers(session):
+    if session.info.pop("outbox_queued", False):
+        workers.notify()
+
+
+def backoff(attempts):
+    """Seconds before retry number ``attempts``: exponential, capped, with
+    jitter so a burst of failures doesn't retry in lockstep."""
+    delay = min(
+        setting("OUTBOX_RETRY_BASE_SECONDS") * 2 ** max(attempts - 1, 0),
+        setting("OUTBOX_RETRY_MAX_SECONDS"),
+    )
+    return delay * random.uniform(0.5, 1.0)
+
+
+def claim(batch_size, now=None):
+    """Marks up to ``batch_size`` due messages as sending and returns them.
+
+    Due means pending and past next_attempt_at, or claimed by a worker whose
+    lease ran out. One UPDATE ... RETURNING does the claim; on Postgres its
+    subquery skips rows other workers are claiming, and SQLite serializes
+    writers, so no message is handed to two workers.
+    """
+    now = now or datetime.utcnow()
+    due = or_(
+        and_(_outbox.c.status == "pending", _outbox.c.next_attempt_at <= now),
+        and_(_outbox.c.status == "sending", _outbox.c.locked_until < now),
+    )
+    ids = (
+        select(_outbox.c.outbox_id)
+        .where(due)
+        .order_by(_outbox.c.next_attempt_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    lease = timedelta(seconds=setting("OUTBOX_LEASE_SECONDS"))
+    with db.engine.begin() as connection:
+        return connection.execute(
+            update(_outbox)
+            .where(_outbox.c.outbox_id.in_(ids), due)
+            .values(
+                status="sending",
+                attempts=_outbox.c.attempts + 1,
+                locked_until=now + lease,
+            )
+            .returning(
+                _outbox.c.outbox_id,
+                _outbox.c.recipient,
+                _outbox.c.subject,
+                _outbox.c.html,
+                _outbox.c.attempts,
+            )
+        ).all()
+
+
+class Throttle:
+    """Spaces out sends so that all threads of the process together stay
+    under OUTBOX_SEND_RATE messages a second (0 for no limit)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self):
+        rate = setting("OUTBOX_SEND_RATE")
+        if not rate:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + 1 / rate
+        if slot > now:
+            time.sleep(slot - now)
+
+
+throttle = Throttle()
+
+
+def _elapsed_ms(started):
+    return (time.perf_counter() - started) * 1000
+
+
+def _send_over(connection, pending, sent, failed, timing):
+    # Returns the error that broke the connection, leaving the message it
+    # was sending at the head of ``pending``
+    while pending:
+        row = pending[0]
+        message = Message(
+            subject=row.subject,
+            recipients=[row.recipient],
+            html=row.html,
+            extra_headers={"X-Outbox-Id": str(row.outbox_id)},
+        )
+        throttle.wait()
+        started = time.perf_counter()
+        try:
+            connection.send(message)
+        except smtplib.SMTPServerDisconnected as e:
+            return e
+        except smtplib.SMTPException as e:
+            # Refused by the server (e.g. a 4xx for this recipient), but the
+            # connection is still usable
+            failed.append((row, e))
+        except OSError as e:
+            return e
+        except Exception as e:
+            failed.append((row, e))
+        else:
+            sent.append(row.outbox_id)
+        finally:
+            timing["send_ms"] += _elapsed_ms(started)
+        pending.popleft()
+    return None
+
+
+def send_batch(rows):
+    """Sends ``rows`` over one SMTP connection, opening a new one up to
+    MAX_RECONNECTS times if it breaks. Returns the ids sent, ``(row, error)``
+    for the rest and the batch's timings."""
+    sent, failed = [], []
+    pending = deque(rows)
+    timing = {"connections": 0, "connect_ms": 0.0, "send_ms": 0.0}
+    error = None
+    for _ in range(MAX_RECONNECTS + 1):
+        started = time.perf_counter()
+        try:
+            with mail.connect() as connection:
+                timing["connections"] += 1
+                timing["connect_ms"] += _elapsed_ms(started)
+                error = _send_over(connection, pending, sent, failed, timing)
+        except Exception as e:
+            # Connecting or logging in failed, or QUIT on a broken connection
+            error = error or e
+        if not pending:
+            break
+        logger.warning("SMTP connection lost, %d emails left: %s", len(pending), error)
+    failed.extend((row, error) for row in pending)
+    return sent, failed, timing
+
+
+def finish(sent, failed, now=None):
+    now = now or datetime.utcnow()
+    max_attempts = setting("OUTBOX_MAX_ATTEMPTS")
+    with db.engine.begin() as connection:
+        if sent:
+            connection.execute(
+                update(_outbox)
+                .where(_outbox.c.outbox_id.in_(sent))
+                .values(status="sent", sent_at=now, locked_until=None, last_error=None)
+            )
+        if failed:
+            connection.execute(
+                update(_outbox)
+                .where(_outbox.c.outbox_id == bindparam("failed_id"))
+                .values(
+                    status=bindparam("failed_status"),
+                    next_attempt_at=bindparam("retry_at"),
+                    last_error=bindparam("error"),
+                    locked_until=None,
+                ),
+                [
+                    {
+                        "failed_id": row.outbox_id,
+                        "failed_status": "failed"
+                        if row.attempts >= max_attempts
+                        else "pending",
+                        "retry_at": now + timedelta(seconds=backoff(row.attempts)),
+                        "error": f"{type(error).__name__}: {error}"[:1000],
+                    }
+                    for row, error in failed
+                ],
+            )
+    for row, error in failed:
+        if row.attempts >= max_attempts:
+            logger.error(
+                "Giving up on email %s to %s after %d attempts: %s",
+                row.outbox_id,
+                row.recipient,
+                row.attempts,
+                error,
+            )
+
+
+def drain_once(batch_size=None):
+    """Claims, sends and records one batch. Returns the batch's size,
+    outcome and timings, or None when nothing was due."""
+    started = time.perf_counter()
+    rows = claim(batch_size or setting("OUTBOX_BATCH_SIZE"))
+    if not rows:
+        return None
+    sent, failed, timing = send_batch(rows)
+    finish(sent, failed)
+    batch = dict(
+        timing,
+        messages=len(rows),
+        sent=len(sent),
+        failed=len(failed),
+        batch_ms=_elapsed_ms(started),
+    )
+    logger.info(
+        "Sent %(sent)d of %(messages)d emails in %(batch_ms).0fms: "
+        "%(connections)d connections, %(connect_ms).0fms connecting, "
+        "%(send_ms).0fms sending",
+        batch,
+    )
+    return batch
+
+
+def drain(threads=1, batch_size=None):
+    """Sends everything due now over ``threads`` concurrent SMTP
+    connections, then returns every batch's timings."""
+    batches = []
+
+    def run():
+        with app.app_context():
+            while batch := drain_once(batch_size):
+                batches.append(batch)
+
+    pool = [
+        threading.Thread(target=run, name=f"outbox-drain-{i}") for i in range(threads)
+    ]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return batches
+
+
+class OutboxWorkerPool:
+    """Threads that drain the outbox, woken by commits that queued mail and
+    polling every OUTBOX_POLL_SECONDS for retries and other processes'
+    messages."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self.threads = []
+
+    def start(self, flask_app, count):
+        with self._lock:
+            if self.threads:
+                return
+            self._stop.clear()
+            self.threads = [
+                threading.Thread(
+                    target=self._run, args=(flask_app,), name=f"outbox-{i}", daemon=True
+                )
+                for i in range(count)
+            ]
+            for thread in self.threads:
+                thread.start()
+
+    def notify(self):
+        # Web workers start their pool the first time they queue mail, so
+        # CLI commands and migrations never spawn one
+        if not self.threads and setting("OUTBOX_WORKERS"):
+            self.start(app, setting("OUTBOX_WORKERS"))
+        self._wake.set()
+
+    def stop(self, timeout=None):
+        with self._lock:
+            threads, self.threads = self.threads, []
+        self._stop.set()
+        self._wake.set()
+        for thread in threads:
+            thread.join(timeout)
+
+    def _run(self, flask_app):
+        poll = setting("OUTBOX_POLL_SECONDS")
+        with flask_app.app_context():
+            while not self._stop.is_set():
+                try:
+                    batch = drain_once()
+                except Exception:
+                    logger.exception("Outbox worker failed")
+                    batch = None
+                if batch is None:
+                    self._wake.wait(poll)
+                    self._wake.clear()
+
+
+workers = OutboxWorkerPool()
+
+outbox_cli = AppGroup("outbox", help="Send queued email.")
+
+
+@outbox_cli.command("work")
+@click.option("--threads", default=lambda: setting("OUTBOX_WORKERS") or 1)
+def work_command(threads):
+    """Send queued email until interrupted."""
+    workers.start(app, threads)
+    click.echo(f"Sending queued email with {threads} threads, Ctrl+C to stop")
+    try:
+        while True:
+            threading.Event().wait(3600)
+    except KeyboardInterrupt:
+        workers.stop(timeout=30)
+
+
+@outbox_cli.command("drain")
+@click.option("--threads", default=1)
+def drain_command(threads):
+    """Send everything that is due now, then exit."""
+    total = sum(batch["messages"] for batch in drain(threads))
+    counts = dict(
+        db.session.execute(
+            select(_outbox.c.status, func.count()).group_by(_outbox.c.status)
+        ).all()
+    )
+    click.echo(f"{total} claimed; outbox now {counts}")
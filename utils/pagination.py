@@ -0,0 +1,167 @@
+import base64
+import json
+from datetime import date, datetime
+
+from flask import jsonify, make_response, request
+from sqlalchemy import and_, inspect, or_
+from sqlalchemy.orm import undefer
+
+from utils.conditional import conditional_response
+from utils.fields import FieldsError, requested_fields
+from utils.filters import FilterError, apply_filters
+from utils.loading import loader_options
+from utils.serializers import serializer_for
+from utils.streaming import streamed_response, wants_stream
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class PaginationError(ValueError):
+    pass
+
+
+def page_args():
+    """Reads ``?limit=`` and ``?after=`` from the current request."""
+    limit = request.args.get("limit", DEFAULT_PAGE_SIZE)
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        raise PaginationError("limit must be an integer")
+    if limit < 1:
+        raise PaginationError("limit must be greater than 0")
+    return min(limit, MAX_PAGE_SIZE), request.args.get("after")
+
+
+def encode_cursor(values):
+    values = [v.isoformat() if isinstance(v, (date, datetime)) else v for v in values]
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor, keys):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError):
+        raise PaginationError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != len(keys):
+        raise PaginationError("Invalid cursor")
+
+    decoded = []
+    for key, value in zip(keys, values):
+        if value is None and _nullable(key):
+            decoded.append(None)
+            continue
+        try:
+            python_type = key.type.python_type
+        except NotImplementedError:
+            python_type = None
+        try:
+            if python_type is datetime:
+                value = datetime.fromisoformat(value)
+            elif python_type is date:
+                value = date.fromisoformat(value)
+            elif python_type is not None and value is not None:
+                value = python_type(value)
+        except (TypeError, ValueError):
+            raise PaginationError("Invalid cursor")
+        decoded.append(value)
+    return decoded
+
+
+def _nullable(key):
+    return key.nullable and not key.primary_key
+
+
+def _same(key, value):
+    return key.is_(None) if value is None else key == value
+
+
+def _after(keys, values, descending):
+    # Row-value comparison (k1, k2) > (v1, v2) spelled out so it works on
+    # every backend: k1 > v1 OR (k1 = v1 AND k2 > v2). NULLs sort last in
+    # either direction: they follow every value, and nothing follows a NULL
+    # but rows with the same NULL and a later primary key
+    clauses = []
+    for i, key in enumerate(keys):
+        if values[i] is None:
+            continue
+        beyond = key < values[i] if descending else key > values[i]
+        if _nullable(key):
+            beyond = or_(beyond, key.is_(None))
+        clauses.append(and_(*[_same(keys[j], values[j]) for j in range(i)], beyond))
+    return or_(*clauses)
+
+
+def _order(key, descending):
+    order = key.desc() if descending else key.asc()
+    return order.nulls_last() if _nullable(key) else order
+
+
+def keyset(query, model, sort_key=None, descending=False, after=None, fields=None):
+    """Orders ``query`` by ``sort_key`` (if given) and then the model's
+    primary key, so the cursor stays stable when several rows share a sort
+    value, and skips everything up to and including the ``after`` cursor.
+    Returns the query and the key columns the cursor is built from."""
+    query = query.options(*loader_options(model, fields))
+    pk = inspect(model).primary_key[0]
+    keys = [pk] if sort_key is None or sort_key.key == pk.key else [sort_key, pk]
+
+    if len(keys) > 1:
+        # The cursor is read off the last row, so the sort column must be
+        # loaded even when serialize_only or ?fields= leave it out
+        query = query.options(undefer(getattr(model, sort_key.key)))
+    if after:
+        query = query.filter(_after(keys, decode_cursor(after, keys), descending))
+    query = query.order_by(*[_order(k, descending) for k in keys])
+    return query, keys
+
+
+def paginate(query, model, sort_key=None, descending=False, fields=None):
+    """Applies keyset pagination to ``query``.
+
+    Returns the page of rows and the cursor for the next page, or ``None``
+    when this is the last page.
+    """
+    limit, after = page_args()
+    query, keys = keyset(query, model, sort_key, descending, after, fields)
+
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([getattr(last, k.key) for k in keys])
+    return rows, next_cursor
+
+
+def paginated_response(
+    query, model, sort_key=None, descending=False, streamable=False
+):
+    return conditional_response(
+        model,
+        lambda: _paginated_response(query, model, sort_key, descending, streamable),
+        query,
+    )
+
+
+def _paginated_response(query, model, sort_key, descending, streamable):
+    try:
+        fields = requested_fields(model)
+        query, requested_sort, requested_descending = apply_filters(query, model)
+        if requested_sort is not None:
+            sort_key, descending = requested_sort, requested_descending
+        if streamable and wants_stream():
+            after = request.args.get("after")
+            query, _ = keyset(query, model, sort_key, descending, after, fields)
+            return streamed_response(query, model, fields)
+        rows, next_cursor = paginate(query, model, sort_key, descending, fields)
+    except (PaginationError, FieldsError, FilterError) as e:
+        return make_response(jsonify({"msg": str(e)}), 400)
+
+    serialize = serializer_for(model, fields)
+    return make_response(
+        jsonify({"data": [serialize(row) for row in rows], "next_cursor": next_cursor}),
+        200,
+    )
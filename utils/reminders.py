@@ -0,0 +1,388 @@
+"""Appointment reminders and missed-appointment transitions, fired at each
+appointment's due time by ``flask reminders run``.
+
+Scheduling is event-driven only inside the engine's own process: commits
+there push their appointments onto the heap at once. Appointments booked or
+rescheduled by the web workers are picked up when the engine next re-reads
+its window, up to REMINDER_REFRESH_SECONDS (300 by default) later. An event
+that falls due in that gap fires late, when it is loaded, and the hourly
+missed sweep remains the backstop if the engine isn't running at all.
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+
+import click
+import pytz
+from flask.cli import AppGroup
+from sqlalchemy import and_, event, or_, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.base import NO_VALUE
+
+from config import app, db
+from models import Appointment, Parent, Provider
+from utils.customs import (
+    advisory_lock,
+    queue_missed_emails,
+    update_appointment_statuses,
+)
+from utils.email_templates import render_many
+from utils.outbox import queue_email
+from utils.settings import setting
+
+logger = logging.getLogger(__name__)
+
+EAT = pytz.timezone("Africa/Nairobi")
+# Appointments that still get reminders; only pending ones can be missed
+REMINDER_STATUSES = ("pending", "approved", "Approved")
+# Largest IN list per statement when many events fall due at once
+_FIRE_CHUNK = 500
+_MISSED = 0
+
+
+def _now():
+    return datetime.now(EAT)
+
+
+def _aware(value):
+    # SQLite hands timezone=True columns back naive, in the EAT wall time
+    # they were written in
+    return EAT.localize(value) if value.tzinfo is None else value
+
+
+def _lead_text(seconds):
+    # Rounded from the time actually left, so a reminder that goes out late,
+    # e.g. the first one for an appointment booked 10 hours ahead, still
+    # reads true
+    minutes = max(round(seconds / 60), 1)
+    if minutes < 60:
+        return f"{minutes} minute{'s' if minutes != 1 else ''}"
+    hours = round(minutes / 60)
+    return f"{hours} hour{'s' if hours != 1 else ''}"
+
+
+def reminder_leads():
+    """Seconds before an appointment at which reminders go out, longest
+    first."""
+    leads = setting("REMINDER_LEADS_SECONDS").split(",")
+    return sorted({int(lead) for lead in leads if lead.strip()}, reverse=True)
+
+
+class ReminderEngine:
+    """Sends appointment reminders and marks appointments missed at the
+    moment each falls due, instead of scanning the table on a timer.
+
+    Only appointments dated within the longest lead plus
+    REMINDER_LOOKAHEAD_SECONDS are held, as events on a min-heap keyed by
+    due time; the window is extended from the appointment_date index as
+    time passes, and re-read every REMINDER_REFRESH_SECONDS for changes
+    made by other processes. Commits in this process schedule their
+    appointments straight away. Each event is a conditional UPDATE ...
+    RETURNING, so an event that is stale (the appointment was rescheduled,
+    cancelled or already handled) does nothing, and nothing is sent twice
+    across restarts. One engine runs per database, under an advisory lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._heap = []
+        self._seq = itertools.count()
+        # appointment_id -> appointment_date its events were queued for
+        self._scheduled = {}
+        self.loaded_until = None
+        self.thread = None
+        self.running = False
+        self.stats = {"loaded": 0, "reminded": 0, "missed": 0, "max_late_ms": 0.0}
+
+    def __len__(self):
+        return len(self._heap)
+
+    def schedule(self, appointment_id, appointment_date):
+        """Queues the appointment's reminders and missed transition, unless
+        they are already queued for this date or it lies beyond the loaded
+        window (the loader will reach it)."""
+        appointment_date = _aware(appointment_date)
+        with self._lock:
+            if self.loaded_until is None or appointment_date > self.loaded_until:
+                return False
+            if self._scheduled.get(appointment_id) == appointment_date:
+                return False
+            self._scheduled[appointment_id] = appointment_date
+            for lead in (*reminder_leads(), _MISSED):
+                due_at = appointment_date - timedelta(seconds=lead)
+                heapq.heappush(
+                    self._heap, (due_at, next(self._seq), lead, appointment_id)
+                )
+        self._wake.set()
+        return True
+
+    def load(self, start, end):
+        """Schedules every appointment still due reminders dated in
+        (start, end], reading the appointment_date index in keyset pages."""
+        with self._lock:
+            if self.loaded_until is None or end > self.loaded_until:
+                self.loaded_until = end
+        batch = setting("REMINDER_LOAD_BATCH")
+        after_date, after_id = start, 0
+        loaded = 0
+        while True:
+            rows = db.session.execute(
+                select(Appointment.appointment_id, Appointment.appointment_date)
+                .where(
+                    Appointment.status.in_(REMINDER_STATUSES),
+                    Appointment.appointment_date <= end,
+                    or_(
+                        Appointment.appointment_date > after_date,
+                        and_(
+                            Appointment.appointment_date == after_date,
+                            Appointment.appointment_id > after_id,
+                        ),
+                    ),
+                )
+                .order_by(Appointment.appointment_date, Appointment.appointment_id)
+                .limit(batch)
+            ).all()
+            db.session.commit()
+            for appointment_id, appointment_date in rows:
+                loaded += self.schedule(appointment_id, appointment_date)
+            if len(rows) < batch:
+                break
+            after_date, after_id = rows[-1].appointment_date, rows[-1].appointment_id
+        self.stats["loaded"] += loaded
+        return loaded
+
+    def fire(self, now=None):
+        """Runs every event due by ``now``. Returns how many there were."""
+        now = now or _now()
+        due = {}
+        late_ms = 0.0
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                due_at, _, lead, appointment_id = heapq.heappop(self._heap)
+                due.setdefault(lead, []).append(appointment_id)
+                late_ms = max(late_ms, (now - due_at).total_seconds() * 1000)
+                if lead == _MISSED:
+                    self._scheduled.pop(appointment_id, None)
+        # Longest lead first: a 24h reminder still due is never sent after
+        # a 2h one for the same appointment
+        for lead in sorted(due, reverse=True):
+            ids = due[lead]
+            for i in range(0, len(ids), _FIRE_CHUNK):
+                chunk = ids[i : i + _FIRE_CHUNK]
+                if lead == _MISSED:
+                    self.stats["missed"] += self._mark_missed(chunk, now)
+                else:
+                    self.stats["reminded"] += self._remind(chunk, lead, now)
+                db.session.commit()
+        if due:
+            self.stats["max_late_ms"] = max(self.stats["max_late_ms"], late_ms)
+        return sum(len(ids) for ids in due.values())
+
+    def _remind(self, ids, lead, now):
+        # Skipped when a shorter lead is already due, e.g. no 24h reminder
+        # for an appointment booked an hour ahead
+        shorter = max((other for other in reminder_leads() if other < lead), default=0)
+        rows = db.session.execute(
+            update(Appointment)
+            .where(
+                Appointment.appointment_id.in_(ids),
+                Appointment.status.in_(REMINDER_STATUSES),
+                or_(
+                    Appointment.last_reminder_lead.is_(None),
+                    Appointment.last_reminder_lead > lead,
+                ),
+                Appointment.appointment_date > now + timedelta(seconds=shorter),
+                Appointment.appointment_date <= now + timedelta(seconds=lead),
+            )
+            .values(last_reminder_lead=lead)
+            .returning(Appointment.appointment_id)
+            .execution_options(synchronize_session=False)
+        ).all()
+        if not rows:
+            return 0
+        details = db.session.execute(
+            select(
+                Parent.email,
+                Provider.name,
+                Appointment.appointment_date,
+                Appointment.reason,
+            )
+            .join(Appointment.parent)
+            .join(Appointment.provider)
+            .where(Appointment.appointment_id.in_([row.appointment_id for row in rows]))
+        ).all()
+        subject, bodies = render_many(
+            "appointment_reminder",
+            [
+                {
+                    "provider_name": row.name,
+                    "appointment_date": row.appointment_date,
+                    "reason": row.reason,
+                    "lead": _lead_text(
+                        (_aware(row.appointment_date) - now).total_seconds()
+                    ),
+                }
+                for row in details
+            ],
+        )
+        for row, html_body in zip(details, bodies):
+            queue_email(row.email, subject, html_body)
+        return len(details)
+
+    def _mark_missed(self, ids, now):
+        rows = db.session.execute(
+            update(Appointment)
+            .where(
+                Appointment.appointment_id.in_(ids),
+                Appointment.status == "pending",
+                Appointment.appointment_date <= now,
+            )
+            .values(status="missed")
+            .returning(
+                Appointment.appointment_id,
+                Appointment.parent_id,
+                Appointment.appointment_date,
+                Appointment.reason,
+            )
+            .execution_options(synchronize_session=False)
+        ).all()
+        if rows:
+            queue_missed_emails(rows)
+        return len(rows)
+
+    def start(self, flask_app):
+        with self._lock:
+            if self.thread is not None:
+                return
+            self._stop.clear()
+            self.thread = threading.Thread(
+                target=self._run, args=(flask_app,), name="reminders", daemon=True
+            )
+            self.thread.start()
+
+    def stop(self, timeout=None):
+        with self._lock:
+            thread, self.thread = self.thread, None
+        self._stop.set()
+        self._wake.set()
+        if thread is not None:
+            thread.join(timeout)
+
+    def _reset(self):
+        with self._lock:
+            self._heap = []
+            self._scheduled = {}
+            self.loaded_until = None
+
+    def _run(self, flask_app):
+        with flask_app.app_context():
+            while not self._stop.is_set():
+                with advisory_lock("reminder_engine") as acquired:
+                    if acquired:
+                        try:
+                            self._serve()
+                            continue
+                        except Exception:
+                            db.session.rollback()
+                            logger.exception("Reminder engine stopped")
+                # Another process runs the engine, or starting failed: try
+                # again later
+                self._stop.wait(setting("REMINDER_REFRESH_SECONDS"))
+
+    def _serve(self):
+        # Appointments missed while no engine was running, in chunks
+        started = _now()
+        update_appointment_statuses()
+        self._reset()
+        horizon = timedelta(
+            seconds=max(reminder_leads(), default=0)
+            + setting("REMINDER_LOOKAHEAD_SECONDS")
+        )
+        self.load(started, started + horizon)
+        logger.info(
+            "Reminder engine started with %d appointments", len(self._scheduled)
+        )
+        self.running = True
+        refreshed = time.monotonic()
+        refresh = setting("REMINDER_REFRESH_SECONDS")
+        # Extend the window in steps rather than on every wake-up
+        step = timedelta(seconds=setting("REMINDER_LOOKAHEAD_SECONDS") / 2)
+        try:
+            while not self._stop.is_set():
+                self._wake.clear()
+                now = _now()
+                try:
+                    self.fire(now)
+                    if time.monotonic() - refreshed >= refresh:
+                        self.load(now, now + horizon)
+                        refreshed = time.monotonic()
+                    elif now + horizon - step > self.loaded_until:
+                        self.load(self.loaded_until, now + horizon)
+                except Exception:
+                    db.session.rollback()
+                    logger.exception("Reminder engine failed")
+                with self._lock:
+                    next_due = self._heap[0][0] if self._heap else None
+                wait = refresh - (time.monotonic() - refreshed)
+                if next_due is not None:
+                    wait = min(wait, (next_due - _now()).total_seconds())
+                self._wake.wait(max(wait, 0))
+        finally:
+            self.running = False
+
+
+engine = ReminderEngine()
+
+
+@event.listens_for(Appointment.appointment_date, "set")
+def _reset_reminders(target, value, oldvalue, initiator):
+    # A rescheduled appointment gets its reminders again
+    if oldvalue is not NO_VALUE and oldvalue != value:
+        target.last_reminder_lead = None
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_appointments(session, flush_context):
+    if not engine.running:
+        return
+    changed = [
+        (obj.appointment_id, obj.appointment_date)
+        for obj in (*session.new, *session.dirty)
+        if isinstance(obj, Appointment) and obj.appointment_date is not None
+    ]
+    if changed:
+        session.info.setdefault("reminder_appointments", []).extend(changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _schedule_appointments(session):
+    for appointment_id, appointment_date in session.info.pop(
+        "reminder_appointments", ()
+    ):
+        engine.schedule(appointment_id, appointment_date)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_appointments(session):
+    session.info.pop("reminder_appointments", None)
+
+
+reminders_cli = AppGroup("reminders", help="Send appointment reminders.")
+
+
+@reminders_cli.command("run")
+def run_command():
+    """Run the reminder engine until interrupted."""
+    engine.start(app)
+    click.echo("Reminder engine running, Ctrl+C to stop")
+    try:
+        while True:
+            threading.Event().wait(3600)
+    except KeyboardInterrupt:
+        engine.stop(timeout=30)
@@ -0,0 +1,153 @@
+from sqlalchemy import inspect, literal, select
+from sqlalchemy.orm import aliased, outerjoin
+
+from config import db
+from models import (
+    Admission,
+    Bed,
+    Child,
+    Medicine,
+    Parent,
+    Present_pregnancy,
+    Provider,
+    Room,
+    User,
+    Vaccine,
+)
+
+
+class NotFoundError(LookupError):
+    entity = "Record"
+
+    def __init__(self):
+        super().__init__(f"{self.entity} not found")
+
+
+class ParentNotFound(NotFoundError):
+    entity = "Parent"
+
+
+class ChildNotFound(NotFoundError):
+    entity = "Child"
+
+
+class ProviderNotFound(NotFoundError):
+    entity = "Provider"
+
+
+class UserNotFound(NotFoundError):
+    entity = "User"
+
+
+class MedicineNotFound(NotFoundError):
+    entity = "Medicine"
+
+
+class VaccineNotFound(NotFoundError):
+    entity = "Vaccine"
+
+
+class RoomNotFound(NotFoundError):
+    entity = "Room"
+
+
+class BedNotFound(NotFoundError):
+    entity = "Bed"
+
+
+class AdmissionNotFound(NotFoundError):
+    entity = "Admission"
+
+
+class PregnancyNotFound(NotFoundError):
+    entity = "Pregnancy"
+
+
+# name: (model, {payload key: unique column}, error). Keys are tried in
+# order, so national_id wins over parent_id when a payload sends both.
+LOOKUPS = {
+    "parent": (
+        Parent,
+        {"national_id": "national_id", "parent_id": "parent_id"},
+        ParentNotFound,
+    ),
+    "child": (
+        Child,
+        {
+            "certificate_No": "certificate_No",
+            "child_certificate_no": "certificate_No",
+            "child_id": "child_id",
+        },
+        ChildNotFound,
+    ),
+    "provider": (Provider, {"provider_id": "provider_id"}, ProviderNotFound),
+    "user": (User, {"user_id": "user_id"}, UserNotFound),
+    "medicine": (Medicine, {"medicine_id": "medicine_id"}, MedicineNotFound),
+    "vaccine": (Vaccine, {"vaccine_id": "vaccine_id"}, VaccineNotFound),
+    "room": (Room, {"room_id": "room_id"}, RoomNotFound),
+    "bed": (Bed, {"bed_id": "bed_id"}, BedNotFound),
+    "admission": (Admission, {"admission_id": "admission_id"}, AdmissionNotFound),
+    "pregnancy": (Present_pregnancy, {"pregnancy_id": "pp_id"}, PregnancyNotFound),
+}
+
+
+def _coerce(column, value):
+    # Form and JSON payloads send ids as strings as often as numbers; a
+    # value the column can't hold simply matches nothing
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if isinstance(value, python_type) or python_type not in (int, str):
+        return value
+    try:
+        return python_type(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def resolve(data, *names, optional=()):
+    """Looks up the entities in ``names`` and ``optional`` (keys of
+    ``LOOKUPS``) from the identifiers in ``data`` with a single SELECT.
+
+    Every candidate key becomes a LEFT OUTER JOIN against a one-row anchor,
+    each matching at most one row through a unique column, so the result is
+    always exactly one row whatever was found. Returns ``{name: object}``;
+    raises the lookup's ``NotFoundError`` subclass when a required entity, or
+    an optional one whose identifier was sent, doesn't exist. Optional
+    entities without an identifier map to ``None``.
+    """
+    anchor = select(literal(1).label("anchor")).subquery()
+    joined = anchor
+    # The anchor column keeps the row even when every entity is NULL
+    entities = [anchor.c.anchor]
+    slots = {}
+    for name in (*names, *optional):
+        model, keys, _ = LOOKUPS[name]
+        slots[name] = []
+        for key, column_name in keys.items():
+            value = data.get(key)
+            if value is None or value == "":
+                continue
+            value = _coerce(inspect(model).columns[column_name], value)
+            if value is None:
+                slots[name].append(None)
+                continue
+            entity = aliased(model)
+            joined = outerjoin(joined, entity, getattr(entity, column_name) == value)
+            slots[name].append(len(entities))
+            entities.append(entity)
+
+    row = ()
+    if len(entities) > 1:
+        row = db.session.execute(select(*entities).select_from(joined)).one()
+
+    resolved = {}
+    for name, found in slots.items():
+        _, _, error = LOOKUPS[name]
+        matches = [row[i] for i in found if i is not None and row[i] is not None]
+        match = matches[0] if matches else None
+        if match is None and (found or name not in optional):
+            raise error()
+        resolved[name] = match
+    return resolved
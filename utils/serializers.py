@@ -0,0 +1,216 @@
+from datetime import date, datetime, time
+from decimal import Decimal
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import RelationshipProperty
+from sqlalchemy_serializer import SerializerMixin
+from sqlalchemy_serializer.lib.schema import Schema
+
+from config import db
+
+# Nested relationships are compiled eagerly, so guard against a
+# serialize_only that walks back and forth between two models forever
+MAX_DEPTH = 8
+# Serializers for ?fields= subsets are keyed on client input, so bound them
+MAX_PARTIAL_SERIALIZERS = 256
+
+_serializers = {}
+_fields = {}
+_partial = {}
+
+
+class SerializerCompileError(Exception):
+    pass
+
+
+def _identity(value):
+    return value
+
+
+def _generic(model):
+    # Mirrors SerializerMixin for values whose type isn't known up front,
+    # e.g. hybrid properties and the contents of JSON columns
+    def convert(value):
+        if value is None or isinstance(value, (str, int, float, bool)):
+            return value
+        if isinstance(value, time):
+            return value.strftime(model.time_format)
+        if isinstance(value, datetime):
+            return value.strftime(model.datetime_format)
+        if isinstance(value, date):
+            return value.strftime(model.date_format)
+        if isinstance(value, Decimal):
+            return model.decimal_format.format(value)
+        if isinstance(value, dict):
+            return {k: convert(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple, set)):
+            return [convert(v) for v in value]
+        return str(value)
+
+    return convert
+
+
+def _column_converter(column, root):
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return _generic(root)
+
+    if python_type is datetime:
+        fmt = root.datetime_format
+        return lambda v: v.strftime(fmt) if v is not None else None
+    if python_type is date:
+        fmt = root.date_format
+        return lambda v: v.strftime(fmt) if v is not None else None
+    if python_type is time:
+        fmt = root.time_format
+        return lambda v: v.strftime(fmt) if v is not None else None
+    if python_type in (int, str, float, bool):
+        return _identity
+    return _generic(root)
+
+
+def _dict_converter(schema, root):
+    convert = _generic(root)
+    if schema.is_greedy:
+        return lambda value: {
+            k: convert(v) for k, v in value.items() if schema.is_included(k)
+        }
+    keys = schema.keys
+    return lambda value: {k: convert(v) for k, v in value.items() if k in keys}
+
+
+def _has_attribute(model, mapper, key):
+    if key in mapper.all_orm_descriptors:
+        return True
+    return any(key in vars(klass) for klass in model.__mro__)
+
+
+def _compile_plan(model, schema, root, depth=0, only=None):
+    if depth > MAX_DEPTH:
+        raise SerializerCompileError(
+            f"{model.__name__}: serialize_only nests deeper than {MAX_DEPTH}"
+        )
+
+    # Same schema resolution that Serializer.serialize_model performs
+    schema.update(only=model.serialize_only, extend=model.serialize_rules)
+    mapper = inspect(model)
+
+    keys = schema.keys
+    if schema.is_greedy:
+        keys.update(attr.key for attr in mapper.attrs)
+
+    plan = []
+    fields = {}
+    for key in sorted(keys):
+        if not schema.is_included(key) or (only is not None and key not in only):
+            continue
+        if not _has_attribute(model, mapper, key):
+            raise SerializerCompileError(
+                f"{model.__name__}.serialize_only references unknown field {key!r}"
+            )
+
+        prop = mapper.attrs.get(key)
+        forked = schema.fork(key)
+        if isinstance(prop, RelationshipProperty):
+            nested, fields[key] = _compile_plan(
+                prop.mapper.class_,
+                forked,
+                root,
+                depth + 1,
+                only[key] if only is not None else None,
+            )
+            if prop.uselist:
+                plan.append((key, _many(nested)))
+            else:
+                plan.append((key, _one(nested)))
+        elif prop is not None and hasattr(prop, "columns"):
+            plan.append((key, _column_converter(prop.columns[0], root)))
+            fields[key] = None
+        else:
+            plan.append((key, _lazy_value(forked, root)))
+            fields[key] = _dict_fields(forked)
+
+    return tuple(plan), fields
+
+
+def _dict_fields(schema):
+    if schema.is_greedy:
+        return None
+    return {key: None for key in schema.keys}
+
+
+def _lazy_value(schema, root):
+    # Non-column attributes (hybrid properties such as Appointment.info)
+    # only reveal their type at runtime
+    to_dict = _dict_converter(schema, root)
+    convert = _generic(root)
+    return lambda v: to_dict(v) if isinstance(v, dict) else convert(v)
+
+
+def _run(plan, obj):
+    return {key: convert(getattr(obj, key)) for key, convert in plan}
+
+
+def _one(plan):
+    return lambda obj: _run(plan, obj) if obj is not None else None
+
+
+def _many(plan):
+    return lambda objs: [_run(plan, obj) for obj in objs]
+
+
+def compile_serializer(model):
+    """Builds a flat ``(field, converter)`` plan from the model's
+    ``serialize_only``/``serialize_rules`` that produces the same dict as
+    ``to_dict()`` without re-walking the rules for every row."""
+    plan, fields = _compile_plan(model, Schema(), model)
+    serializer = _one(plan)
+    _serializers[model] = serializer
+    _fields[model] = fields
+    return serializer
+
+
+def compile_all():
+    for mapper in db.Model.registry.mappers:
+        model = mapper.class_
+        if issubclass(model, SerializerMixin):
+            compile_serializer(model)
+
+
+def freeze_fields(fields):
+    """Hashable form of a ``{field: subfields}`` tree."""
+    return tuple(
+        sorted((k, freeze_fields(v) if v else None) for k, v in fields.items())
+    )
+
+
+def serializer_for(model, fields=None):
+    """The compiled serializer for ``model``, or for the subset ``fields`` of
+    its serialize_only (a tree as returned by ``serialized_fields``)."""
+    if fields is not None:
+        key = (model, freeze_fields(fields))
+        serializer = _partial.get(key)
+        if serializer is None:
+            if len(_partial) >= MAX_PARTIAL_SERIALIZERS:
+                _partial.clear()
+            plan, _ = _compile_plan(model, Schema(), model, only=fields)
+            serializer = _partial[key] = _one(plan)
+        return serializer
+
+    serializer = _serializers.get(model)
+    if serializer is None:
+        serializer = compile_serializer(model)
+    return serializer
+
+
+def serialized_fields(model):
+    """Nested ``{field: subfields}`` tree of everything the model's
+    serializer reads; columns and plain values map to ``None``."""
+    if model not in _fields:
+        compile_serializer(model)
+    return _fields[model]
+
+
+def serialize(obj):
+    return serializer_for(type(obj))(obj)
@@ -0,0 +1,50 @@
+import os
+
+# Settings the app reads from the environment, with their defaults. The
+# connection pool's own are in utils.db_pool
+DEFAULTS = {
+    # utils.db_routing
+    "DB_READ_YOUR_WRITES_SECONDS": 5,
+    # utils.sql_metrics
+    "DB_N_PLUS_ONE_WARN": 0,
+    # utils.slow_queries
+    "DB_SLOW_QUERY_MS": 500,
+    "DB_SLOW_QUERY_LOG": "slow_queries.log",
+    "DB_SLOW_QUERY_LOG_BYTES": 10 * 1024 * 1024,
+    "DB_SLOW_QUERY_LOG_BACKUPS": 5,
+    # utils.outbox
+    "OUTBOX_WORKERS": 2,
+    "OUTBOX_BATCH_SIZE": 20,
+    "OUTBOX_POLL_SECONDS": 5,
+    "OUTBOX_LEASE_SECONDS": 300,
+    "OUTBOX_MAX_ATTEMPTS": 8,
+    "OUTBOX_RETRY_BASE_SECONDS": 30,
+    "OUTBOX_RETRY_MAX_SECONDS": 3600,
+    "OUTBOX_SEND_RATE": 0,
+    # utils.customs.update_appointment_statuses
+    "MISSED_SWEEP_CONNECTIONS": 3,
+    "MISSED_SWEEP_CHUNK_SIZE": 500,
+    "MISSED_SWEEP_INTERVAL_MINUTES": 60,
+    # utils.reminders
+    "REMINDER_LEADS_SECONDS": "86400,7200",
+    "REMINDER_LOOKAHEAD_SECONDS": 3600,
+    "REMINDER_REFRESH_SECONDS": 300,
+    "REMINDER_LOAD_BATCH": 1000,
+}
+
+
+def parse(value, default):
+    """``value`` from the environment, converted to the type of ``default``,
+    or ``default`` when unset or empty."""
+    if value is None or value == "":
+        return default
+    if isinstance(default, bool):
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    if isinstance(default, str):
+        return value
+    return int(value)
+
+
+def setting(name, environ=None):
+    environ = os.environ if environ is None else environ
+    return parse(environ.get(name), DEFAULTS[name])
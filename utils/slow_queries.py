@@ -0,0 +1,165 @@
+import logging
+import re
+import threading
+import time
+from logging.handlers import RotatingFileHandler
+
+from utils.settings import setting
+
+logger = logging.getLogger(__name__)
+
+# Re-explain a statement shape at most this often; plans rarely change
+EXPLAIN_INTERVAL = 300
+_EXPLAINABLE = ("select", "with", "insert", "update", "delete")
+_SAVEPOINT = "slow_query_explain"
+# Constants Postgres prints in plan conditions, e.g. (parent_id = 1234)
+_PLAN_STRING = re.compile(r"'(?:[^']|'')*'")
+_PLAN_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?![\w.])")
+
+
+def redact(parameters):
+    """Bound parameters with every value replaced by its type, so the log
+    never holds patient data."""
+    if isinstance(parameters, dict):
+        return {key: redact(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [redact(value) for value in parameters]
+    if parameters is None:
+        return None
+    return f"<{type(parameters).__name__}>"
+
+
+def _redact_plan(plan):
+    lines = []
+    for line in plan.splitlines():
+        if "Cond:" in line or "Filter:" in line:
+            line = _PLAN_NUMBER.sub("N", _PLAN_STRING.sub("'?'", line))
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def explain(cursor, statement, parameters, dialect):
+    """The plan for ``statement`` from the DBAPI connection that just ran
+    it, without running it again."""
+    if not statement.lstrip().lower().startswith(_EXPLAINABLE):
+        return None
+    if dialect == "postgresql":
+        prefix = "EXPLAIN (ANALYZE off) "
+    elif dialect == "sqlite":
+        prefix = "EXPLAIN QUERY PLAN "
+    else:
+        return None
+
+    connection = cursor.connection
+    # A failed statement aborts a Postgres transaction, so keep the EXPLAIN
+    # in a savepoint the request's own work can't lose
+    savepoint = dialect == "postgresql" and not getattr(connection, "autocommit", True)
+    explain_cursor = connection.cursor()
+    try:
+        if savepoint:
+            explain_cursor.execute(f"SAVEPOINT {_SAVEPOINT}")
+        try:
+            explain_cursor.execute(prefix + statement, parameters or ())
+            rows = explain_cursor.fetchall()
+        except Exception as e:
+            if savepoint:
+                explain_cursor.execute(f"ROLLBACK TO SAVEPOINT {_SAVEPOINT}")
+            return f"EXPLAIN failed: {e}"
+        if savepoint:
+            explain_cursor.execute(f"RELEASE SAVEPOINT {_SAVEPOINT}")
+    finally:
+        explain_cursor.close()
+    if dialect == "sqlite":
+        # (id, parent, notused, detail)
+        return "\n".join(row[-1] for row in rows)
+    return _redact_plan("\n".join(row[0] for row in rows))
+
+
+class SlowQueryLog:
+    """Statements slower than DB_SLOW_QUERY_MS, written with their plan to
+    a rotating log file and totalled by statement shape since startup."""
+
+    def __init__(self):
+        self.threshold = None
+        self._lock = threading.Lock()
+        self.offenders = {}
+
+    def configure(self, threshold_ms, path, max_bytes, backups):
+        self.threshold = threshold_ms / 1000 if threshold_ms else None
+        if self.threshold is None:
+            return
+        if not any(
+            getattr(handler, "baseFilename", None) for handler in logger.handlers
+        ):
+            handler = RotatingFileHandler(
+                path, maxBytes=max_bytes, backupCount=backups, delay=True
+            )
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+
+    def observe(self, cursor, statement, parameters, context, route, shape, elapsed):
+        now = time.monotonic()
+        with self._lock:
+            offender = self.offenders.get(shape)
+            if offender is None:
+                offender = self.offenders[shape] = {
+                    "statement": shape,
+                    "calls": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "routes": {},
+                    "plan": None,
+                    "explained_at": None,
+                }
+            offender["calls"] += 1
+            offender["total_ms"] += elapsed * 1000
+            offender["max_ms"] = max(offender["max_ms"], elapsed * 1000)
+            offender["routes"][route] = offender["routes"].get(route, 0) + 1
+            stale = (
+                offender["explained_at"] is None
+                or now - offender["explained_at"] > EXPLAIN_INTERVAL
+            )
+            if stale:
+                offender["explained_at"] = now
+
+        plan = None
+        if stale and context is not None and not context.executemany:
+            plan = explain(cursor, statement, parameters, context.dialect.name)
+            with self._lock:
+                offender["plan"] = plan
+        logger.info(
+            "slow query %.1fms in %s\n%s\nparameters: %s%s",
+            elapsed * 1000,
+            route,
+            statement,
+            redact(parameters),
+            f"\nplan:\n{plan}" if plan else "",
+        )
+
+    def top(self, limit=None):
+        with self._lock:
+            offenders = [
+                dict(offender, routes=dict(offender["routes"]))
+                for offender in self.offenders.values()
+            ]
+        for offender in offenders:
+            del offender["explained_at"]
+            offender["total_ms"] = round(offender["total_ms"], 3)
+            offender["max_ms"] = round(offender["max_ms"], 3)
+            offender["mean_ms"] = round(offender["total_ms"] / offender["calls"], 3)
+        offenders.sort(key=lambda offender: offender["total_ms"], reverse=True)
+        return offenders[:limit]
+
+
+slow_log = SlowQueryLog()
+
+
+def init_app(app):
+    slow_log.configure(
+        setting("DB_SLOW_QUERY_MS"),
+        setting("DB_SLOW_QUERY_LOG"),
+        setting("DB_SLOW_QUERY_LOG_BYTES"),
+        setting("DB_SLOW_QUERY_LOG_BACKUPS"),
+    )
@@ -0,0 +1,173 @@
+import logging
+import re
+import threading
+import time
+from collections import Counter
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from utils.settings import setting
+from utils.slow_queries import slow_log
+
+logger = logging.getLogger(__name__)
+
+# Bound parameters in any paramstyle, and the lists an expanding IN renders
+_PARAM = r"(?:\?|%s|%\(\w+\)s|:\w+|\$\d+)"
+_PARAM_LIST = re.compile(rf"\(\s*{_PARAM}(?:\s*,\s*{_PARAM})*\s*\)")
+_NUMBER = re.compile(r"\b\d+\b")
+_SPACE = re.compile(r"\s+")
+
+
+def fingerprint(statement):
+    """The statement's shape: the same query with different ids, IN list
+    lengths or LIMITs maps to the same string."""
+    shape = _PARAM_LIST.sub("(?)", statement)
+    shape = _NUMBER.sub("N", shape)
+    return _SPACE.sub(" ", shape).strip()
+
+
+class RequestStats:
+    __slots__ = ("statements", "seconds", "shapes")
+
+    def __init__(self):
+        self.statements = 0
+        self.seconds = 0.0
+        self.shapes = Counter()
+
+    def record(self, statement, seconds):
+        self.statements += 1
+        self.seconds += seconds
+        self.shapes[fingerprint(statement)] += 1
+
+
+class SQLMetrics:
+    """Statement counts and database time per route since startup."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.routes = {}
+
+    def record(self, route, stats):
+        shape, repeats = (stats.shapes.most_common(1) or [(None, 0)])[0]
+        with self._lock:
+            totals = self.routes.get(route)
+            if totals is None:
+                totals = self.routes[route] = {
+                    "requests": 0,
+                    "statements": 0,
+                    "statements_max": 0,
+                    "db_seconds": 0.0,
+                    "max_repeats": 0,
+                    "repeated_statement": None,
+                }
+            totals["requests"] += 1
+            totals["statements"] += stats.statements
+            totals["statements_max"] = max(totals["statements_max"], stats.statements)
+            totals["db_seconds"] += stats.seconds
+            if repeats > totals["max_repeats"]:
+                totals["max_repeats"] = repeats
+                if repeats > 1:
+                    totals["repeated_statement"] = shape
+
+    def snapshot(self, limit=None):
+        with self._lock:
+            routes = [
+                dict(totals, route=route) for route, totals in self.routes.items()
+            ]
+        routes.sort(key=lambda totals: totals["db_seconds"], reverse=True)
+        for totals in routes:
+            requests = totals["requests"]
+            totals["db_ms"] = round(totals.pop("db_seconds") * 1000, 3)
+            totals["db_ms_mean"] = round(totals["db_ms"] / requests, 3)
+            totals["statements_mean"] = round(totals["statements"] / requests, 2)
+        return routes[:limit]
+
+
+metrics = SQLMetrics()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("sql_metrics_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _stop_timer(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("sql_metrics_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    in_request = has_request_context()
+    if in_request:
+        stats = g.get("sql_stats")
+        if stats is not None:
+            stats.record(statement, elapsed)
+    if slow_log.threshold is not None and elapsed >= slow_log.threshold:
+        slow_log.observe(
+            cursor,
+            statement,
+            parameters,
+            context,
+            _route() if in_request else "<no request>",
+            fingerprint(statement),
+            elapsed,
+        )
+
+
+@event.listens_for(Engine, "handle_error")
+def _drop_timer(exception_context):
+    # after_cursor_execute doesn't run for a failed statement
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("sql_metrics_start"):
+        connection.info["sql_metrics_start"].pop()
+
+
+def _route():
+    rule = request.url_rule.rule if request.url_rule else "<unmatched>"
+    return f"{request.method} {rule}"
+
+
+def init_app(app):
+    """Counts the statements each request runs and reports them in the
+    X-DB-Queries and Server-Timing headers and in ``metrics``.
+
+    With DB_N_PLUS_ONE_WARN set (10 by default in debug mode), a request
+    that runs one statement shape more often than that logs a warning: the
+    signature of a lazy load inside a loop. Statements run while streaming
+    a response body happen after the headers are sent, so they're counted
+    in neither.
+    """
+    configured = setting("DB_N_PLUS_ONE_WARN")
+
+    @app.before_request
+    def start_request_stats():
+        g.sql_stats = RequestStats()
+
+    @app.after_request
+    def report_request_stats(response):
+        stats = g.pop("sql_stats", None)
+        if stats is None:
+            return response
+        route = _route()
+        metrics.record(route, stats)
+        response.headers["X-DB-Queries"] = str(stats.statements)
+        response.headers.add(
+            "Server-Timing",
+            f'db;dur={stats.seconds * 1000:.3f};desc="{stats.statements} queries"',
+        )
+        # app.debug is only known once app.run() has started
+        threshold = configured or (10 if app.debug else 0)
+        if threshold:
+            for shape, count in stats.shapes.most_common():
+                if count <= threshold:
+                    break
+                logger.warning(
+                    "Possible N+1 in %s: %d runs of %s", route, count, shape[:300]
+                )
+        return response
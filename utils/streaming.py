@@ -0,0 +1,38 @@
+from flask import Response, current_app, request, stream_with_context
+
+from utils.serializers import serializer_for
+
+STREAM_BATCH_SIZE = 500
+
+
+def wants_stream():
+    return request.args.get("stream", "").lower() in ("1", "true", "yes")
+
+
+def streamed_response(query, model, fields=None, batch_size=STREAM_BATCH_SIZE):
+    """Streams every row of ``query`` as ``{"data": [...], "next_cursor": null}``.
+
+    Rows come off a server-side cursor ``batch_size`` at a time and each
+    batch is encoded and flushed before the next one is fetched, so memory
+    use depends on the batch size rather than on the size of the table.
+    """
+    serialize = serializer_for(model, fields)
+    dumps = current_app.json.dumps
+
+    def generate():
+        yield '{"data": ['
+        separator = ""
+        batch = []
+        for row in query.yield_per(batch_size):
+            batch.append(dumps(serialize(row)))
+            if len(batch) >= batch_size:
+                yield separator + ",".join(batch)
+                separator = ","
+                batch = []
+        if batch:
+            yield separator + ",".join(batch)
+        yield '], "next_cursor": null}'
+
+    return Response(
+        stream_with_context(generate()), status=200, mimetype="application/json"
+    )
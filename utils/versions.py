@@ -0,0 +1,126 @@
+from datetime import datetime
+
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from config import db
+from models import ResourceVersion
+
+_versions = ResourceVersion.__table__
+# Tables nothing caches, written too often to count
+UNVERSIONED = {"email_outbox"}
+
+
+def updates_key(table):
+    """Counter bumped only when existing rows of ``table`` change or go.
+    Inserts show up in the count and max(timestamp) of a list's own rows,
+    so they leave it alone."""
+    return f"{table}:updates"
+
+
+def bump(connection, keys):
+    """Increments each counter in ``keys`` on ``connection``.
+
+    Counters are bumped in a fixed order so two bumps of the same counters
+    can't deadlock on their rows.
+    """
+    now = datetime.utcnow()
+    for key in sorted(keys):
+        result = connection.execute(
+            update(_versions)
+            .where(_versions.c.table_name == key)
+            .values(version=_versions.c.version + 1, updated_at=now)
+        )
+        if result.rowcount:
+            continue
+        try:
+            with connection.begin_nested():
+                connection.execute(
+                    insert(_versions).values(table_name=key, version=1, updated_at=now)
+                )
+        except IntegrityError:
+            # Another transaction created the row first
+            connection.execute(
+                update(_versions)
+                .where(_versions.c.table_name == key)
+                .values(version=_versions.c.version + 1, updated_at=now)
+            )
+
+
+def mark_written(session, tables, updated=True):
+    """Records that the session's transaction wrote ``tables``; their
+    counters are bumped as it commits. ``updated`` is false when the
+    writes were inserts only."""
+    tables = set(tables) - UNVERSIONED
+    keys = session.info.setdefault("written_versions", set())
+    keys.update(tables)
+    if updated:
+        keys.update(updates_key(table) for table in tables)
+
+
+def current_versions(keys):
+    """``{key: (version, updated_at)}`` for the counters in ``keys``;
+    counters never bumped are left out."""
+    rows = db.session.execute(
+        select(_versions.c.table_name, _versions.c.version, _versions.c.updated_at)
+        .where(_versions.c.table_name.in_(keys))
+    )
+    return {name: (version, updated_at) for name, version, updated_at in rows}
+
+
+def _table_of(obj):
+    return getattr(type(obj), "__tablename__", None)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed(session, flush_context):
+    inserted = {_table_of(obj) for obj in session.new}
+    updated = {_table_of(obj) for obj in session.deleted}
+    updated.update(
+        _table_of(obj)
+        for obj in session.dirty
+        if session.is_modified(obj, include_collections=False)
+    )
+    inserted.discard(None)
+    updated.discard(None)
+    mark_written(session, inserted, updated=False)
+    mark_written(session, updated)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk(orm_execute_state):
+    # Query.update()/delete() and ORM insert()/update()/delete() statements
+    # bypass the flush, so note their table as they are executed
+    if not (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None:
+        mark_written(
+            orm_execute_state.session,
+            {mapper.local_table.name},
+            updated=not orm_execute_state.is_insert,
+        )
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_written(session):
+    # Savepoints release into the outer transaction, which bumps for them
+    if session.in_nested_transaction():
+        return
+    # Flush what commit() would, so its writes are counted, then bump last
+    # in the same transaction: the counters commit or roll back with the
+    # writes, and the row locks are held only until the COMMIT right after
+    session.flush()
+    keys = session.info.pop("written_versions", None)
+    if keys:
+        bump(session.connection(), keys)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_rolled_back(session):
+    session.info.pop("written_versions", None)
@@ -1,5 +1,5 @@
-from models import Vaccine
-from config import db, app
+from config import app
+from utils.catalog_import import import_catalog
 
 data = [
     {
@@ -102,17 +102,8 @@ data = [
 
 
 def vaccine_generator():
-    for dataitems in data:
-        vaccine = Vaccine(
-            name=dataitems["name"],
-            composition=dataitems["composition"],
-            schedule=dataitems["schedule"],
-            indication=dataitems["indication"],
-            side_effects=dataitems["side_effects"],
-            info=dataitems["additional_information"],
-        )
-        db.session.add(vaccine)
-    db.session.commit()
+    # Upserts by name, so running this again only applies edits to data
+    print(import_catalog("vaccines", data))
 
 
 with app.app_context():